@@ -0,0 +1 @@
+"""Custom integrations."""
@@ -1,20 +1,50 @@
 """The Nidia Magic Composer integration."""
 from __future__ import annotations
 
+from collections.abc import Iterator
+from contextlib import contextmanager
+import json
 import logging
 from pathlib import Path
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
-from homeassistant.components.http import StaticPathConfig
 from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.start import async_at_started
 from homeassistant.helpers.typing import ConfigType
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DOMAIN, PANEL_NAME, PANEL_TITLE, PANEL_ICON, VERSION
-from .websocket_api import async_register_area_commands, async_register_floor_commands
+from .const import (
+    DATA_APPLY_LOCK,
+    DATA_CHANGESETS,
+    DATA_DASHBOARDS,
+    DATA_DRAFT,
+    DATA_IMPORTS,
+    DATA_INDEX,
+    DATA_METRICS,
+    DATA_PROGRESS,
+    DATA_SNAPSHOTS,
+    DOMAIN,
+    PANEL_NAME,
+    PANEL_TITLE,
+    PANEL_ICON,
+    PANEL_MANIFEST,
+    PANEL_STATIC_PATH,
+    VERSION,
+)
+from .layout import async_register_layout_commands
+from .registry_index import async_setup_registry_index
+from .services import async_register_services, async_unregister_services
+from .snapshot import async_register_snapshot_commands
+from .websocket import async_register_wizard_commands
+from .websocket_api import (
+    async_register_area_commands,
+    async_register_device_commands,
+    async_register_floor_commands,
+)
 
 if TYPE_CHECKING:
     from homeassistant.components.frontend import Panel
@@ -45,23 +75,73 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "options": entry.options,
     }
 
-    # Register WebSocket API handlers
-    async_register_area_commands(hass)
-    async_register_floor_commands(hass)
+    timings: dict[str, float] = {}
 
-    # Register custom panel
-    await _async_register_panel(hass)
+    # Index area and floor names so duplicate checks don't scan the registries
+    with _timed(timings, "index"):
+        registry_index = async_setup_registry_index(hass)
+    entry.async_on_unload(registry_index.async_stop)
+
+    # Register WebSocket API handlers; the changeset and dashboard stores load
+    # on first use, and the planner and executor are imported by the handlers
+    with _timed(timings, "commands"):
+        async_register_area_commands(hass)
+        async_register_floor_commands(hass)
+        async_register_device_commands(hass)
+        async_register_wizard_commands(hass)
+        async_register_layout_commands(hass)
+        async_register_snapshot_commands(hass)
+
+    # Wizard and area services for automations and scripts
+    with _timed(timings, "services"):
+        async_register_services(hass)
+    entry.async_on_unload(lambda: async_unregister_services(hass))
+
+    # Nobody opens the panel during boot; expose it once Home Assistant is up
+    entry.async_on_unload(async_at_started(hass, _async_deferred_setup))
 
-    # TODO: Register services for wizard operations
     # TODO: Set up platforms if needed
 
     # Forward setup to platforms (if any)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     _LOGGER.info("Nidia Magic Composer integration setup complete")
+    _log_timings("Setup", timings)
     return True
 
 
+async def _async_deferred_setup(hass: HomeAssistant) -> None:
+    """Register the panel and its static assets after startup."""
+    timings: dict[str, float] = {}
+    try:
+        await _async_register_panel(hass, timings)
+    except Exception:  # pylint: disable=broad-except
+        # Already logged; the WebSocket API keeps working without the panel
+        return
+    _log_timings("Deferred setup", timings)
+
+
+@contextmanager
+def _timed(timings: dict[str, float], phase: str) -> Iterator[None]:
+    """Record the wall time of a setup phase in milliseconds."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[phase] = (time.perf_counter() - started) * 1000
+
+
+def _log_timings(label: str, timings: dict[str, float]) -> None:
+    """Log a breakdown of setup phase timings."""
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        _LOGGER.debug(
+            "%s took %.1f ms (%s)",
+            label,
+            sum(timings.values()),
+            ", ".join(f"{phase} {ms:.1f} ms" for phase, ms in timings.items()),
+        )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     _LOGGER.info("Unloading Nidia Magic Composer integration")
@@ -71,18 +151,31 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
+        hass.data[DOMAIN].pop(DATA_INDEX, None)
+        hass.data[DOMAIN].pop(DATA_APPLY_LOCK, None)
+        hass.data[DOMAIN].pop(DATA_PROGRESS, None)
+        hass.data[DOMAIN].pop(DATA_METRICS, None)
+        hass.data[DOMAIN].pop(DATA_CHANGESETS, None)
+        hass.data[DOMAIN].pop(DATA_DASHBOARDS, None)
+        hass.data[DOMAIN].pop(DATA_DRAFT, None)
+        hass.data[DOMAIN].pop(DATA_IMPORTS, None)
+        hass.data[DOMAIN].pop(DATA_SNAPSHOTS, None)
 
     return unload_ok
 
 
-async def _async_register_panel(hass: HomeAssistant) -> None:
+async def _async_register_panel(
+    hass: HomeAssistant, timings: dict[str, float]
+) -> None:
     """Register the custom panel for the integration."""
     try:
-        # Register the panel using the frontend component
-        from homeassistant.components.frontend import (
-            async_register_built_in_panel,
-            async_remove_panel,
-        )
+        # Imported here so they stay off the boot path
+        with _timed(timings, "imports"):
+            from homeassistant.components.frontend import (
+                async_register_built_in_panel,
+                async_remove_panel,
+            )
+            from homeassistant.components.http import StaticPathConfig
 
         # Remove any previously registered panel with the same name to prevent duplicates.
         async_remove_panel(hass, PANEL_NAME, warn_if_unknown=False)
@@ -94,24 +187,38 @@ async def _async_register_panel(hass: HomeAssistant) -> None:
                 "Reinstall the integration or rebuild the frontend (npm run build)."
             )
 
+        # Hashed builds name their entry in a manifest and can be cached
+        # indefinitely; older unhashed builds fall back to a versioned path.
+        with _timed(timings, "manifest"):
+            manifest = await hass.async_add_executor_job(
+                _read_panel_manifest, panel_assets
+            )
+        if manifest is not None:
+            static_url_path = PANEL_STATIC_PATH
+            module_url = f"{static_url_path}/{manifest['entry']}"
+        else:
+            static_url_path = f"/{PANEL_NAME}-{VERSION}"
+            module_url = f"{static_url_path}/index.js?v={VERSION}"
+
         domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
         static_paths: set[str] = domain_data.setdefault("static_paths", set())
-        static_url_path = f"/{PANEL_NAME}-{VERSION}"
 
         if static_url_path not in static_paths:
-            try:
-                await hass.http.async_register_static_paths(
-                    [
-                        StaticPathConfig(
-                            url_path=static_url_path,
-                            path=str(panel_assets),
-                        )
-                    ]
-                )
-            except OSError as err:
-                raise HomeAssistantError(
-                    f"Failed to expose panel assets at {static_url_path}: {err}"
-                ) from err
+            with _timed(timings, "static_paths"):
+                try:
+                    await hass.http.async_register_static_paths(
+                        [
+                            StaticPathConfig(
+                                url_path=static_url_path,
+                                path=str(panel_assets),
+                                cache_headers=manifest is not None,
+                            )
+                        ]
+                    )
+                except OSError as err:
+                    raise HomeAssistantError(
+                        f"Failed to expose panel assets at {static_url_path}: {err}"
+                    ) from err
 
             static_paths.add(static_url_path)
 
@@ -126,8 +233,8 @@ async def _async_register_panel(hass: HomeAssistant) -> None:
                     "name": PANEL_NAME,
                     "embed_iframe": True,
                     "trust_external": False,
-                    "module_url": f"{static_url_path}/index.js?v={VERSION}",
-                    "js_url": f"{static_url_path}/index.js?v={VERSION}",
+                    "module_url": module_url,
+                    "js_url": module_url,
                 }
             },
             require_admin=True,
@@ -136,3 +243,18 @@ async def _async_register_panel(hass: HomeAssistant) -> None:
     except Exception as err:
         _LOGGER.error("Failed to register custom panel: %s", err)
         raise
+
+
+def _read_panel_manifest(panel_assets: Path) -> dict[str, Any] | None:
+    """Return the build manifest of the panel, if the build has one."""
+    try:
+        manifest = json.loads((panel_assets / PANEL_MANIFEST).read_text("utf-8"))
+    except FileNotFoundError:
+        return None
+    except ValueError as err:
+        _LOGGER.warning("Ignoring invalid panel manifest: %s", err)
+        return None
+    if not (panel_assets / manifest.get("entry", "")).is_file():
+        _LOGGER.warning("Panel manifest entry %s is missing", manifest.get("entry"))
+        return None
+    return manifest
@@ -0,0 +1,134 @@
+"""Bulk assignment of devices and entities to areas.
+
+Assignments are validated in one pass against the registries' own indexed
+lookups (device id, entity id, area id), then applied in a second pass.
+Registry updates only schedule a delayed save, so a batch of thousands of
+assignments is written to disk once per registry.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+KIND_DEVICE = "device"
+KIND_ENTITY = "entity"
+
+# Hand control back to the event loop after this many registry updates
+YIELD_EVERY = 200
+
+ASSIGNMENT_SCHEMA = vol.Schema(
+    {
+        vol.Required("kind"): vol.In((KIND_DEVICE, KIND_ENTITY)),
+        vol.Required("id"): str,
+        vol.Required("area_id"): vol.Any(str, None),
+    }
+)
+
+
+def assignment_error(index: int, code: str, message: str) -> dict[str, Any]:
+    """Build a failed per-item assignment result."""
+    return {"index": index, "success": False, "error": {"code": code, "message": message}}
+
+
+def plan_assignments(
+    hass: HomeAssistant, assignments: list[dict[str, Any]]
+) -> tuple[list[dict[str, Any]], dict[int, dict[str, Any]]]:
+    """Validate assignments and return the changes to make and the failures.
+
+    Items already in their target area are reported as unchanged and are not
+    planned. Each planned change carries the previous area so it can be undone.
+    """
+    area_registry = ar.async_get(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    planned: list[dict[str, Any]] = []
+    results: dict[int, dict[str, Any]] = {}
+    seen: set[tuple[str, str]] = set()
+
+    for index, assignment in enumerate(assignments):
+        kind, item_id, area_id = (
+            assignment["kind"],
+            assignment["id"],
+            assignment["area_id"],
+        )
+
+        if (kind, item_id) in seen:
+            results[index] = assignment_error(
+                index, "duplicate", f"The {kind} '{item_id}' is assigned twice"
+            )
+            continue
+        seen.add((kind, item_id))
+
+        if area_id is not None and area_registry.async_get_area(area_id) is None:
+            results[index] = assignment_error(
+                index, "area_not_found", f"Area '{area_id}' not found"
+            )
+            continue
+
+        if kind == KIND_DEVICE:
+            device = device_registry.async_get(item_id)
+            current = device.area_id if device else None
+            found = device is not None
+        else:
+            entity = entity_registry.async_get(item_id)
+            current = entity.area_id if entity else None
+            found = entity is not None
+            if entity is not None:
+                item_id = entity.entity_id
+
+        if not found:
+            results[index] = assignment_error(
+                index, "not_found", f"The {kind} '{item_id}' was not found"
+            )
+            continue
+
+        if current == area_id:
+            results[index] = {"index": index, "success": True, "changed": False}
+            continue
+
+        planned.append(
+            {
+                "index": index,
+                "kind": kind,
+                "id": item_id,
+                "area_id": area_id,
+                "previous_area_id": current,
+            }
+        )
+
+    return planned, results
+
+
+async def async_apply_assignments(
+    hass: HomeAssistant, planned: list[dict[str, Any]]
+) -> dict[int, dict[str, Any]]:
+    """Apply planned assignments and return their results by index."""
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+    results: dict[int, dict[str, Any]] = {}
+
+    for done, change in enumerate(planned, start=1):
+        if change["kind"] == KIND_DEVICE:
+            device_registry.async_update_device(change["id"], area_id=change["area_id"])
+        else:
+            entity_registry.async_update_entity(change["id"], area_id=change["area_id"])
+        results[change["index"]] = {
+            "index": change["index"],
+            "success": True,
+            "changed": True,
+            "previous_area_id": change["previous_area_id"],
+        }
+        if done % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+
+    return results
@@ -0,0 +1,182 @@
+"""Changeset generation for the composer wizard.
+
+A changeset is the minimal set of operations that brings the Home Assistant
+registries in line with a wizard profile. It is computed in one linear pass
+over the profile using hashed registry lookups, and identified by a hash of its
+operations so the same profile against the same registries always yields the
+same ``changeset_id``.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.json import json_dumps_sorted
+from homeassistant.util import dt as dt_util, slugify
+
+from .const import FRONTEND_PANELS_KEY
+from .dashboard_generator import (
+    async_get_dashboard_store,
+    async_plan_dashboard,
+    dashboard_is_current,
+)
+from .helper_engine import CLAIM_TAKEN, async_plan_helpers
+from .registry_index import async_get_registry_index, name_key
+
+# Apply order: later steps may reference what earlier steps create
+STEP_FLOORS = "floors"
+STEP_AREAS = "areas"
+STEP_HELPERS = "helpers"
+STEP_ENTITIES = "entities"
+STEP_DASHBOARDS = "dashboards"
+STEPS = (STEP_FLOORS, STEP_AREAS, STEP_HELPERS, STEP_ENTITIES, STEP_DASHBOARDS)
+
+
+def dashboard_url_path(target: str) -> str:
+    """Return a valid Lovelace url path (it must contain a dash)."""
+    url_path = slugify(target).replace("_", "-")
+    return url_path if "-" in url_path else f"{url_path}-dashboard"
+
+
+def compute_changeset_id(operations: dict[str, list[dict[str, Any]]]) -> str:
+    """Return the content address of a set of operations."""
+    digest = hashlib.sha256(json_dumps_sorted(operations).encode()).hexdigest()
+    return f"changeset_{digest[:16]}"
+
+
+async def async_build_changeset(
+    hass: HomeAssistant, profile: dict[str, Any]
+) -> dict[str, Any]:
+    """Diff a validated wizard profile against the live registries."""
+    # Loaded up front so the registries are read without yielding in between
+    dashboard_store = await async_get_dashboard_store(hass)
+    index = async_get_registry_index(hass)
+    area_registry = ar.async_get(hass)
+    device_registry = dr.async_get(hass)
+    entity_registry = er.async_get(hass)
+
+    operations: dict[str, list[dict[str, Any]]] = {step: [] for step in STEPS}
+
+    # Device names are the only lookup the registries don't index for us
+    devices_by_name: dict[str, dr.DeviceEntry] = {}
+    for device in device_registry.devices.values():
+        for device_name in (device.name_by_user, device.name):
+            if device_name:
+                devices_by_name.setdefault(name_key(device_name), device)
+
+    planned_floors: set[str] = set()
+    planned_rooms: set[str] = set()
+
+    for room in profile["rooms"]:
+        room_name = room["name"].strip()
+        room_key = name_key(room_name)
+        if not room_key or room_key in planned_rooms:
+            continue
+        planned_rooms.add(room_key)
+
+        floor_name = (room.get("floor") or "").strip()
+        floor_key = name_key(floor_name)
+        floor_id = index.floor_names.get(floor_key) if floor_key else None
+        if floor_key and floor_id is None and floor_key not in planned_floors:
+            planned_floors.add(floor_key)
+            operations[STEP_FLOORS].append(
+                {"op": "create", "name": floor_name, "level": len(planned_floors) - 1}
+            )
+
+        area_id = index.area_names.get(room_key)
+        if area_id is None:
+            operations[STEP_AREAS].append(
+                {"op": "create", "name": room_name, "floor": floor_name or None}
+            )
+        elif floor_key and (
+            floor_id is None
+            or (area := area_registry.async_get_area(area_id)) is None
+            or area.floor_id != floor_id
+        ):
+            operations[STEP_AREAS].append(
+                {"op": "update", "area_id": area_id, "name": room_name, "floor": floor_name}
+            )
+
+        for reference in room["devices"]:
+            reference = reference.strip()
+            if (entity := entity_registry.async_get(reference)) is not None:
+                current_area = entity.area_id
+                if current_area is None and entity.device_id:
+                    device = device_registry.async_get(entity.device_id)
+                    current_area = device.area_id if device else None
+                kind, item_id, current = "entity", entity.entity_id, current_area
+            elif (device := devices_by_name.get(name_key(reference))) is not None:
+                kind, item_id, current = "device", device.id, device.area_id
+            else:
+                # Free-form device categories ("Lights") have nothing to move
+                continue
+            if area_id is None or current != area_id:
+                operations[STEP_ENTITIES].append(
+                    {
+                        "op": "assign",
+                        "kind": kind,
+                        "id": item_id,
+                        "name": reference,
+                        "area": room_name,
+                        "area_id": area_id,
+                    }
+                )
+
+    operations[STEP_HELPERS], helper_conflicts = async_plan_helpers(
+        hass, profile["helpers"], [room["name"].strip() for room in profile["rooms"]]
+    )
+
+    dashboard_conflicts: list[dict[str, Any]] = []
+    if (dashboards := profile.get("dashboards")) and dashboards.get("publishTarget"):
+        url_path = dashboard_url_path(dashboards["publishTarget"])
+        title = profile["profile"].get("name") or dashboards["publishTarget"]
+        exists = url_path in hass.data.get(FRONTEND_PANELS_KEY, {})
+        if exists and url_path not in dashboard_store:
+            # A dashboard or panel the composer did not publish; never overwrite it
+            dashboard_conflicts.append(
+                {"url_path": url_path, "title": title, "reason": CLAIM_TAKEN}
+            )
+        else:
+            published = dashboard_store.get(url_path) if exists else {}
+            plan = async_plan_dashboard(hass, profile, url_path, title, published)
+            if not exists:
+                operations[STEP_DASHBOARDS].append({"op": "create", **plan})
+            elif not dashboard_is_current(plan, published):
+                operations[STEP_DASHBOARDS].append({"op": "update", **plan})
+
+    return {
+        "changeset_id": compute_changeset_id(operations),
+        "created_at": dt_util.utcnow().isoformat(),
+        "operations": operations,
+        "helper_conflicts": helper_conflicts,
+        "dashboard_conflicts": dashboard_conflicts,
+        "summary": {step: len(ops) for step, ops in operations.items()},
+    }
+
+
+def changeset_preview(changeset: dict[str, Any]) -> dict[str, Any]:
+    """Shape a changeset as the preview returned to the panel."""
+    operations = changeset["operations"]
+    return {
+        "changeset_id": changeset["changeset_id"],
+        "floors_to_create": operations[STEP_FLOORS],
+        "areas_to_create": [op for op in operations[STEP_AREAS] if op["op"] == "create"],
+        "areas_to_update": [op for op in operations[STEP_AREAS] if op["op"] == "update"],
+        "helpers_to_create": operations[STEP_HELPERS],
+        "helper_conflicts": changeset.get("helper_conflicts", []),
+        "entities_to_assign": operations[STEP_ENTITIES],
+        "dashboards_to_create": [
+            op for op in operations[STEP_DASHBOARDS] if op["op"] == "create"
+        ],
+        "dashboards_to_update": [
+            op for op in operations[STEP_DASHBOARDS] if op["op"] == "update"
+        ],
+        "dashboard_conflicts": changeset.get("dashboard_conflicts", []),
+        "summary": changeset["summary"],
+    }
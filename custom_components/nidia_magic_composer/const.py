@@ -13,19 +13,114 @@ VERSION = "0.4.0"
 PANEL_NAME = "nidia-magic-composer"
 PANEL_TITLE = "Magic Composer"
 PANEL_ICON = "mdi:auto-fix"
+# Hashed builds are served from here; the panel's own URL is /PANEL_NAME, so
+# the assets need a path the static route cannot shadow
+PANEL_STATIC_PATH = f"/{PANEL_NAME}-static"
+# Written by the frontend build; names the content-hashed entry bundle
+PANEL_MANIFEST = "manifest.json"
+
+# Domain data keys
+DATA_INDEX = "index"
+DATA_CHANGESETS = "changesets"
+DATA_APPLY_LOCK = "apply_lock"
+DATA_PROGRESS = "progress"
+DATA_METRICS = "metrics"
+DATA_DASHBOARDS = "dashboards"
+DATA_DRAFT = "draft"
+DATA_IMPORTS = "imports"
+DATA_SNAPSHOTS = "snapshots"
+
+# Dispatcher signals
+SIGNAL_APPLY_PROGRESS = f"{DOMAIN}_apply_progress"
+
+# Minimum seconds between two progress events of the same step
+PROGRESS_INTERVAL = 0.5
+
+# Samples kept per command and outcome for the metrics histograms
+METRICS_WINDOW = 500
+
+# Storage
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 10
+MAX_STORED_CHANGESETS = 100
+MAX_CACHED_CHANGESETS = 20
+
+# Panels registered with the frontend (homeassistant.components.frontend.DATA_PANELS)
+FRONTEND_PANELS_KEY = "frontend_panels"
+
+# Wizard-generated helpers
+HELPER_DOMAIN = "input_boolean"
+HELPER_OBJECT_ID_PREFIX = "magic_composer_"
+
+# Helper and dashboard storage collections are driven through their own
+# WebSocket commands, run in-process; seconds to wait for a command to answer
+COLLECTION_COMMAND_TIMEOUT = 30
+# Releases the fallback lookup through the list handler is known to work on
+COLLECTION_LOOKUP_MIN_VERSION = "2024.4.0"
+COLLECTION_LOOKUP_TESTED_VERSION = "2025.10.0"
 
 # WebSocket command types
 WS_TYPE_AREAS_LIST = f"{DOMAIN}/areas/list"
 WS_TYPE_AREAS_CREATE = f"{DOMAIN}/areas/create"
 WS_TYPE_AREAS_UPDATE = f"{DOMAIN}/areas/update"
 WS_TYPE_AREAS_DELETE = f"{DOMAIN}/areas/delete"
+WS_TYPE_AREAS_BATCH = f"{DOMAIN}/areas/batch"
+WS_TYPE_AREAS_SUBSCRIBE = f"{DOMAIN}/areas/subscribe"
+WS_TYPE_AREAS_MATCH = f"{DOMAIN}/areas/match"
 WS_TYPE_FLOORS_LIST = f"{DOMAIN}/floors/list"
 WS_TYPE_FLOORS_CREATE = f"{DOMAIN}/floors/create"
 WS_TYPE_FLOORS_UPDATE = f"{DOMAIN}/floors/update"
 WS_TYPE_FLOORS_DELETE = f"{DOMAIN}/floors/delete"
+WS_TYPE_FLOORS_SUBSCRIBE = f"{DOMAIN}/floors/subscribe"
+WS_TYPE_TOPOLOGY_GET = f"{DOMAIN}/topology/get"
+WS_TYPE_CACHE_STATS = f"{DOMAIN}/cache/stats"
+WS_TYPE_METRICS = f"{DOMAIN}/metrics"
+WS_TYPE_DEVICES_ASSIGN_BULK = f"{DOMAIN}/devices/assign_bulk"
+WS_TYPE_SUGGEST_AREAS = f"{DOMAIN}/suggest/areas"
 WS_TYPE_WIZARD_PREVIEW = f"{DOMAIN}/wizard/preview"
 WS_TYPE_WIZARD_APPLY = f"{DOMAIN}/wizard/apply"
 WS_TYPE_WIZARD_STATUS = f"{DOMAIN}/wizard/status"
+WS_TYPE_WIZARD_ROLLBACK = f"{DOMAIN}/wizard/rollback"
+WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS = f"{DOMAIN}/wizard/subscribe_progress"
+WS_TYPE_DRAFT_GET = f"{DOMAIN}/draft/get"
+WS_TYPE_DRAFT_PATCH = f"{DOMAIN}/draft/patch"
+WS_TYPE_LAYOUT_EXPORT = f"{DOMAIN}/layout/export"
+WS_TYPE_LAYOUT_IMPORT = f"{DOMAIN}/layout/import"
+WS_TYPE_SNAPSHOT_CREATE = f"{DOMAIN}/snapshot/create"
+WS_TYPE_SNAPSHOT_LIST = f"{DOMAIN}/snapshot/list"
+WS_TYPE_SNAPSHOT_DIFF = f"{DOMAIN}/snapshot/diff"
+WS_TYPE_SNAPSHOT_DELETE = f"{DOMAIN}/snapshot/delete"
+
+# Batch operation limits
+MAX_BATCH_OPERATIONS = 500
+
+# Area list paging
+MAX_PAGE_SIZE = 1000
+AREA_FIELDS = ("name", "icon", "floor_id", "labels", "aliases")
+AREA_SORTS = ("name", "-name", "floor")
+
+# Fuzzy room-to-area matching
+MAX_MATCH_ROOMS = 500
+MAX_MATCH_CANDIDATES = 10
+
+# Device/entity mappings accepted by one devices/assign_bulk call
+MAX_ASSIGNMENTS = 10000
+
+# Operations accepted in one draft/patch call
+MAX_DRAFT_PATCH_OPERATIONS = 1000
+
+# Layout export/import: NDJSON lines per exported chunk, characters accepted
+# per imported chunk and per imported line (a line may span chunks), errors
+# reported per import and idle seconds before an unfinished import is dropped
+LAYOUT_CHUNK_RECORDS = 500
+MAX_LAYOUT_CHUNK_SIZE = 1_000_000
+MAX_LAYOUT_LINE_SIZE = 1_000_000
+MAX_IMPORT_ERRORS = 100
+IMPORT_SESSION_TIMEOUT = 300
+
+# Registry snapshots kept on disk and in memory
+MAX_STORED_SNAPSHOTS = 20
+MAX_CACHED_SNAPSHOTS = 3
 
 # Service names
 SERVICE_WIZARD_PREVIEW = "wizard_preview"
@@ -0,0 +1,327 @@
+"""Incremental Lovelace dashboard generation.
+
+A generated dashboard is one overview view plus one view per room. Every view
+is rendered from a small input dict (the room name, its area, the entities
+referenced by the room and the widgets that affect it) and the hash of each
+published view's input is remembered per dashboard. A re-publish renders only
+the views whose hash changed, splices them into the stored config in place of
+their previous version and saves nothing at all when no hash changed. Room
+views are keyed by the wizard's room id, so renaming a room replaces its one
+view; views added by hand in the Lovelace editor are kept as they are.
+"""
+from __future__ import annotations
+
+import hashlib
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.json import json_dumps_sorted
+from homeassistant.helpers.storage import Store
+from homeassistant.util import slugify
+
+from .const import DATA_DASHBOARDS, DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from .registry_index import async_get_registry_index, name_key
+
+STORAGE_KEY = f"{DOMAIN}.dashboards"
+
+OVERVIEW_KEY = "overview"
+OVERVIEW_PATH = "home"
+
+# Widgets rendered on the room views; the others only shape the overview
+ROOM_WIDGETS = ("comfort", "rooms")
+
+_RUNNING_AUTOMATIONS = (
+    "{% for automation in states.automation"
+    " | selectattr('attributes.current', 'defined')"
+    " | selectattr('attributes.current', 'gt', 0) %}"
+    "- {{ automation.name }}\n"
+    "{% else %}Nothing running.{% endfor %}"
+)
+_COMFORT_SUMMARY = (
+    "{% for sensor in states.sensor"
+    " | selectattr('attributes.device_class', 'defined')"
+    " | selectattr('attributes.device_class', 'in', ['temperature', 'humidity'])"
+    " | sort(attribute='name') %}"
+    "- {{ sensor.name }}: {{ sensor.state }} {{ sensor.attributes.unit_of_measurement }}\n"
+    "{% endfor %}"
+)
+
+# Overview cards per enabled widget
+OVERVIEW_WIDGET_CARDS: dict[str, list[dict[str, Any]]] = {
+    "energy": [{"type": "energy-distribution", "link_dashboard": True}],
+    "comfort": [{"type": "markdown", "title": "Comfort", "content": _COMFORT_SUMMARY}],
+    "automation": [
+        {"type": "markdown", "title": "Running automations", "content": _RUNNING_AUTOMATIONS}
+    ],
+}
+
+# Overview cards contributed by the template, placed before the widget cards
+TEMPLATE_OVERVIEW_CARDS: dict[str, list[dict[str, Any]]] = {
+    "starter": [],
+    "energy-first": [
+        {"type": "energy-date-selection"},
+        {"type": "energy-usage-graph"},
+        {"type": "energy-solar-graph"},
+    ],
+    "wellness": [
+        {"type": "markdown", "title": "Air and climate", "content": _COMFORT_SUMMARY}
+    ],
+}
+
+
+def input_hash(inputs: dict[str, Any]) -> str:
+    """Return the content hash of a view's inputs."""
+    return hashlib.sha256(json_dumps_sorted(inputs).encode()).hexdigest()[:16]
+
+
+def render_overview(inputs: dict[str, Any]) -> dict[str, Any]:
+    """Render the overview view."""
+    cards = [dict(card) for card in TEMPLATE_OVERVIEW_CARDS.get(inputs["template"], ())]
+    for widget in inputs["widgets"]:
+        cards.extend(dict(card) for card in OVERVIEW_WIDGET_CARDS.get(widget, ()))
+    return {
+        "title": inputs["title"],
+        "path": OVERVIEW_PATH,
+        "icon": "mdi:home",
+        "cards": cards,
+    }
+
+
+def render_room(inputs: dict[str, Any]) -> dict[str, Any]:
+    """Render the view of one room."""
+    cards: list[dict[str, Any]] = []
+    if inputs["area_id"]:
+        cards.append({"type": "area", "area": inputs["area_id"], "show_camera": True})
+    climate = [entity for entity in inputs["entities"] if entity.startswith("climate.")]
+    others = [entity for entity in inputs["entities"] if entity not in climate]
+    if "comfort" in inputs["widgets"]:
+        cards.extend({"type": "thermostat", "entity": entity} for entity in climate)
+    if "rooms" in inputs["widgets"] and others:
+        cards.append({"type": "entities", "title": "Quick actions", "entities": others})
+    return {"title": inputs["name"], "path": inputs["path"], "cards": cards}
+
+
+def render_view(key: str, inputs: dict[str, Any]) -> dict[str, Any]:
+    """Render one view from its inputs."""
+    return render_overview(inputs) if key == OVERVIEW_KEY else render_room(inputs)
+
+
+@callback
+def async_view_inputs(
+    hass: HomeAssistant, profile: dict[str, Any], title: str
+) -> dict[str, dict[str, Any]]:
+    """Return the inputs of every view of a profile's dashboard, in view order."""
+    index = async_get_registry_index(hass)
+    entity_registry = er.async_get(hass)
+    dashboards = profile["dashboards"]
+    widgets = sorted(
+        widget["id"]
+        for widget in dashboards["widgets"]
+        if widget.get("enabled") and "id" in widget
+    )
+    room_widgets = [widget for widget in widgets if widget in ROOM_WIDGETS]
+
+    views: dict[str, dict[str, Any]] = {
+        OVERVIEW_KEY: {
+            "title": title,
+            "template": dashboards.get("selectedTemplate"),
+            "widgets": widgets,
+        }
+    }
+    seen: set[str] = set()
+    paths = {OVERVIEW_PATH}
+    for room in profile["rooms"]:
+        name = room["name"].strip()
+        room_key = name_key(name)
+        if not room_key or room_key in seen:
+            continue
+        seen.add(room_key)
+
+        path = base = slugify(name)
+        suffix = 2
+        while path in paths:
+            path = f"{base}_{suffix}"
+            suffix += 1
+        paths.add(path)
+
+        entities = sorted(
+            {
+                entity.entity_id
+                for reference in room["devices"]
+                if (entity := entity_registry.async_get(reference.strip())) is not None
+            }
+        )
+        views[f"room:{room.get('id') or room_key}"] = {
+            "name": name,
+            "path": path,
+            "area_id": index.area_names.get(room_key),
+            "entities": entities,
+            "widgets": room_widgets,
+        }
+    return views
+
+
+@callback
+def async_plan_dashboard(
+    hass: HomeAssistant,
+    profile: dict[str, Any],
+    url_path: str,
+    title: str,
+    published: dict[str, dict[str, str]],
+) -> dict[str, Any]:
+    """Return the views to render and remove to bring a dashboard up to date.
+
+    Only views whose inputs changed since the last publish carry their inputs;
+    the others are listed by key and hash to fix the view order.
+    """
+    views = []
+    render: dict[str, dict[str, Any]] = {}
+    for key, inputs in async_view_inputs(hass, profile, title).items():
+        digest = input_hash(inputs)
+        views.append({"key": key, "hash": digest})
+        if published.get(key, {}).get("hash") != digest:
+            render[key] = inputs
+    keys = {view["key"] for view in views}
+    return {
+        "url_path": url_path,
+        "title": title,
+        "views": views,
+        "render": render,
+        "remove": [key for key in published if key not in keys],
+    }
+
+
+def dashboard_is_current(plan: dict[str, Any], published: dict[str, Any]) -> bool:
+    """Return whether a plan would leave a published dashboard unchanged."""
+    return (
+        not plan["render"]
+        and not plan["remove"]
+        and [view["key"] for view in plan["views"]] == list(published)
+    )
+
+
+@callback
+def async_render_plan(
+    hass: HomeAssistant, plan: dict[str, Any], published: dict[str, dict[str, str]]
+) -> tuple[dict[str, dict[str, Any]], dict[str, dict[str, str]]]:
+    """Render the changed views of a plan and return them with the new state.
+
+    Rooms whose area was created after the plan was made are resolved now, and
+    the hash recorded for them is that of the inputs actually rendered.
+    """
+    index = async_get_registry_index(hass)
+    rendered: dict[str, dict[str, Any]] = {}
+    state: dict[str, dict[str, str]] = {}
+    for view in plan["views"]:
+        key = view["key"]
+        if (inputs := plan["render"].get(key)) is None:
+            state[key] = published[key]
+            continue
+        if key != OVERVIEW_KEY and inputs["area_id"] is None:
+            inputs = {**inputs, "area_id": index.area_names.get(name_key(inputs["name"]))}
+        rendered[key] = render_view(key, inputs)
+        state[key] = {"hash": input_hash(inputs), "path": rendered[key]["path"]}
+    return rendered, state
+
+
+def splice_views(
+    config_views: list[dict[str, Any]],
+    plan: dict[str, Any],
+    published: dict[str, dict[str, str]],
+    rendered: dict[str, dict[str, Any]],
+) -> tuple[list[dict[str, Any]], dict[str, dict[str, Any]]]:
+    """Merge rendered views into a dashboard's views.
+
+    Generated views come first, in plan order; unchanged ones keep their stored
+    config (including any edits made in the Lovelace editor). Views the
+    generator does not manage follow in their original order. Also returns the
+    previous version of every view that was replaced or removed, by path.
+    """
+    managed_paths = {entry["path"] for entry in published.values()}
+    by_path = {view.get("path"): view for view in config_views if view.get("path")}
+
+    views: list[dict[str, Any]] = []
+    for view in plan["views"]:
+        key = view["key"]
+        if key in rendered:
+            views.append(rendered[key])
+        elif (entry := published.get(key)) and entry["path"] in by_path:
+            views.append(by_path[entry["path"]])
+
+    replaced = {
+        path: by_path[path]
+        for key, entry in published.items()
+        if (key in rendered or key in plan["remove"])
+        and (path := entry["path"]) in by_path
+    }
+    views.extend(view for view in config_views if view.get("path") not in managed_paths)
+    return views, replaced
+
+
+def restore_views(
+    config_views: list[dict[str, Any]],
+    previous: dict[str, dict[str, str]],
+    current: dict[str, dict[str, str]],
+    replaced: dict[str, dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Undo a splice: put back the previous generated views and their order."""
+    by_path = {view.get("path"): view for view in config_views if view.get("path")}
+    views = [
+        view
+        for entry in previous.values()
+        if (view := replaced.get(entry["path"], by_path.get(entry["path"])))
+    ]
+    managed_paths = {entry["path"] for entry in (*previous.values(), *current.values())}
+    views.extend(view for view in config_views if view.get("path") not in managed_paths)
+    return views
+
+
+class DashboardStore:
+    """Hashes of the views last published to each generated dashboard."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._dashboards: dict[str, dict[str, dict[str, str]]] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the published view hashes unless they are already loaded."""
+        if self._loaded:
+            return
+        data = await self._store.async_load()
+        # Concurrent callers share the load; only the first one applies it
+        if self._loaded:
+            return
+        self._loaded = True
+        if data:
+            self._dashboards = data["dashboards"]
+
+    def __contains__(self, url_path: str) -> bool:
+        """Return whether the composer published a dashboard."""
+        return url_path in self._dashboards
+
+    def get(self, url_path: str) -> dict[str, dict[str, str]]:
+        """Return the published views of a dashboard, by key in view order."""
+        return self._dashboards.get(url_path, {})
+
+    @callback
+    def async_set(self, url_path: str, views: dict[str, dict[str, str]] | None) -> None:
+        """Record the views of a dashboard, or forget the dashboard."""
+        if views is None:
+            self._dashboards.pop(url_path, None)
+        else:
+            self._dashboards[url_path] = views
+        self._store.async_delay_save(
+            lambda: {"dashboards": self._dashboards}, STORAGE_SAVE_DELAY
+        )
+
+
+async def async_get_dashboard_store(hass: HomeAssistant) -> DashboardStore:
+    """Return the dashboard store, loading it on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_DASHBOARDS)) is None:
+        store = domain_data[DATA_DASHBOARDS] = DashboardStore(hass)
+    await store.async_load()
+    return store
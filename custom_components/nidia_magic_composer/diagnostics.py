@@ -0,0 +1,61 @@
+"""Diagnostics support for Nidia Magic Composer."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from .const import DATA_CHANGESETS, DATA_INDEX, DATA_METRICS, DOMAIN
+from .metrics import CommandMetrics
+from .progress import async_get_progress
+from .registry_index import RegistryIndex
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry.
+
+    Only reads the state that already exists, so downloading diagnostics never
+    builds the index or starts collecting metrics.
+    """
+    domain_data: dict[str, Any] = hass.data.get(DOMAIN, {})
+    index: RegistryIndex | None = domain_data.get(DATA_INDEX)
+    metrics: CommandMetrics | None = domain_data.get(DATA_METRICS)
+    changesets = domain_data.get(DATA_CHANGESETS)
+    progress = async_get_progress(hass)
+    return {
+        "metrics": metrics.as_dict() if metrics else None,
+        "registries": {
+            "areas": len(ar.async_get(hass).areas),
+            "floors": len(fr.async_get(hass).floors),
+        },
+        "index": (
+            {
+                "area_revision": index.area_revision,
+                "floor_revision": index.floor_revision,
+            }
+            if index
+            else None
+        ),
+        "caches": (
+            {
+                "areas": index.area_payload.as_dict(),
+                "floors": index.floor_payload.as_dict(),
+                "topology": index.topology_payload.as_dict(),
+            }
+            if index
+            else None
+        ),
+        "changesets": (
+            {
+                "pending": len(changesets.pending()),
+                "applied": len(changesets.applied()),
+            }
+            if changesets
+            else None
+        ),
+        "last_apply": progress.as_dict() if progress else None,
+    }
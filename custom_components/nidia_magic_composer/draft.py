@@ -0,0 +1,84 @@
+"""Server-side storage of the wizard draft.
+
+The panel keeps the wizard state in memory and mirrors it here so progress
+survives a reload. After the first save it only sends JSON-patch deltas, each
+against the revision it last saw: a patch for an older revision is rejected
+instead of silently overwriting another tab's edits. The draft is written to
+``.storage`` with a delayed save, so a burst of autosaves costs one write.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_DRAFT, DOMAIN, STORAGE_SAVE_DELAY, STORAGE_VERSION
+from .json_patch import JsonPatchError, apply_patch
+
+STORAGE_KEY = f"{DOMAIN}.draft"
+
+
+class DraftConflictError(HomeAssistantError):
+    """Raised when a patch was made against an outdated draft revision."""
+
+
+class DraftStore:
+    """The wizard draft with its revision, loaded on first use."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._loaded = False
+        self.draft: dict[str, Any] | None = None
+        self.revision = 0
+        self.updated_at: str | None = None
+
+    async def async_load(self) -> None:
+        """Load the draft unless it is already loaded."""
+        if self._loaded:
+            return
+        data = await self._store.async_load()
+        # Concurrent callers share the load; only the first one applies it
+        if self._loaded:
+            return
+        if data:
+            self.draft = data["draft"]
+            self.revision = data["revision"]
+            self.updated_at = data["updated_at"]
+        self._loaded = True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the draft with its revision."""
+        return {
+            "draft": self.draft,
+            "revision": self.revision,
+            "updated_at": self.updated_at,
+        }
+
+    @callback
+    def async_patch(self, revision: int, patch: list[dict[str, Any]]) -> int:
+        """Apply a patch made against a revision and return the new revision."""
+        if revision != self.revision:
+            raise DraftConflictError(
+                f"Draft is at revision {self.revision}, not {revision}"
+            )
+        draft = apply_patch(self.draft, patch)
+        if draft is not None and not isinstance(draft, dict):
+            raise JsonPatchError("The draft must be an object")
+        self.draft = draft
+        self.revision += 1
+        self.updated_at = dt_util.utcnow().isoformat()
+        self._store.async_delay_save(self.as_dict, STORAGE_SAVE_DELAY)
+        return self.revision
+
+
+async def async_get_draft_store(hass: HomeAssistant) -> DraftStore:
+    """Return the loaded draft store."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_DRAFT)) is None:
+        store = domain_data[DATA_DRAFT] = DraftStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,372 @@
+"""Apply wizard changesets and roll them back.
+
+Operations run step by step in dependency order (floors, areas, helpers,
+entity assignment, dashboards). Every successful operation appends its inverse
+to a compact rollback journal; if an operation fails, the journal is replayed
+in reverse so the apply is all-or-nothing.
+
+Registry and storage-collection mutations only schedule delayed saves, so a
+whole apply is written to disk in one coalesced save per store rather than one
+per item.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+)
+from homeassistant.util import dt as dt_util
+
+from .assignments import async_apply_assignments, plan_assignments
+from .changeset import (
+    STEP_AREAS,
+    STEP_DASHBOARDS,
+    STEP_ENTITIES,
+    STEP_FLOORS,
+    STEP_HELPERS,
+    STEPS,
+)
+from .const import DATA_APPLY_LOCK, DOMAIN
+from .dashboard_generator import (
+    async_get_dashboard_store,
+    async_render_plan,
+    restore_views,
+    splice_views,
+)
+from .helper_engine import async_create_helper
+from .progress import ApplyProgress, async_start_progress
+from .registry_index import async_get_registry_index, name_key
+from .storage_collections import (
+    LOVELACE_DASHBOARDS_PREFIX,
+    async_create_collection_item,
+    async_delete_collection_item,
+    async_get_lovelace_dashboards,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Hand control back to the event loop after this many operations
+YIELD_EVERY = 50
+
+# Journal entry kinds
+UNDO_FLOOR_CREATE = "floor_create"
+UNDO_AREA_CREATE = "area_create"
+UNDO_AREA_UPDATE = "area_update"
+UNDO_HELPER_CREATE = "helper_create"
+UNDO_ASSIGN = "assign"
+UNDO_DASHBOARD_CREATE = "dashboard_create"
+UNDO_DASHBOARD_UPDATE = "dashboard_update"
+
+
+class ChangesetApplyError(HomeAssistantError):
+    """Raised when a changeset operation cannot be applied."""
+
+
+class ChangesetRollbackError(HomeAssistantError):
+    """Raised when some operations of an applied changeset cannot be undone."""
+
+
+def _describe(step: str, operation: dict[str, Any]) -> str:
+    """Return a short description of an operation for progress reports."""
+    target = operation.get("name") or operation.get("url_path") or operation.get("id")
+    return f"{operation['op']} {step}: {target}"
+
+
+def async_get_apply_lock(hass: HomeAssistant) -> asyncio.Lock:
+    """Return the lock that serializes applies and rollbacks."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (lock := domain_data.get(DATA_APPLY_LOCK)) is None:
+        lock = domain_data[DATA_APPLY_LOCK] = asyncio.Lock()
+    return lock
+
+
+def rollback_id_for(changeset_id: str) -> str:
+    """Return the rollback id of a changeset."""
+    return changeset_id.replace("changeset_", "rollback_", 1)
+
+
+class ChangesetExecutor:
+    """Apply the operations of one changeset."""
+
+    def __init__(self, hass: HomeAssistant, changeset: dict[str, Any]) -> None:
+        """Initialize the executor."""
+        self.hass = hass
+        self.changeset = changeset
+        self.journal: list[list[Any]] = []
+        self._index = async_get_registry_index(hass)
+        self.progress: ApplyProgress = async_start_progress(
+            hass,
+            changeset["changeset_id"],
+            sum(len(ops) for ops in changeset["operations"].values()),
+        )
+
+    async def async_apply(self) -> None:
+        """Apply every operation, rolling back everything on failure."""
+        progress = self.progress
+        try:
+            for step in STEPS:
+                operations = self.changeset["operations"][step]
+                if step == STEP_ENTITIES and operations:
+                    # Assignments are validated and applied as one batch
+                    progress.async_start_operation(
+                        step, f"assign {len(operations)} device(s) and entities"
+                    )
+                    await self._async_assign(operations)
+                    progress.async_finish_operation(len(operations))
+                    continue
+                for operation in operations:
+                    progress.async_start_operation(step, _describe(step, operation))
+                    await self._async_apply_operation(step, operation)
+                    progress.async_finish_operation()
+                    if progress.done % YIELD_EVERY == 0:
+                        await asyncio.sleep(0)
+        except Exception as err:
+            _LOGGER.error(
+                "Applying %s failed after %d operation(s), rolling back: %s",
+                self.changeset["changeset_id"],
+                progress.done,
+                err,
+            )
+            progress.async_error(f"{progress.current}: {err}")
+            await async_rollback_journal(self.hass, self.journal)
+            self.journal = []
+            progress.async_finish("rolled_back")
+            raise ChangesetApplyError(str(err)) from err
+
+        progress.async_finish("applied")
+
+    async def _async_apply_operation(self, step: str, operation: dict[str, Any]) -> None:
+        """Apply one operation and journal its inverse."""
+        if step == STEP_FLOORS:
+            floor = fr.async_get(self.hass).async_create(
+                name=operation["name"], level=operation.get("level")
+            )
+            self.journal.append([UNDO_FLOOR_CREATE, floor.floor_id])
+
+        elif step == STEP_AREAS:
+            area_registry = ar.async_get(self.hass)
+            floor_id = self._resolve_floor(operation.get("floor"))
+            if operation["op"] == "create":
+                area = area_registry.async_create(
+                    name=operation["name"], floor_id=floor_id
+                )
+                self.journal.append([UNDO_AREA_CREATE, area.id])
+            else:
+                area = area_registry.async_get_area(operation["area_id"])
+                if area is None:
+                    raise ChangesetApplyError(f"Area '{operation['area_id']}' not found")
+                area_registry.async_update(area.id, floor_id=floor_id)
+                self.journal.append([UNDO_AREA_UPDATE, area.id, area.floor_id])
+
+        elif step == STEP_HELPERS:
+            item_id = await async_create_helper(self.hass, operation)
+            self.journal.append([UNDO_HELPER_CREATE, operation["domain"], item_id])
+
+        elif step == STEP_DASHBOARDS:
+            await self._async_publish_dashboard(operation)
+
+    async def _async_assign(self, operations: list[dict[str, Any]]) -> None:
+        """Move devices and entities into their rooms in one batched pass."""
+        # A device listed under two rooms ends up in the last one
+        assignments: dict[tuple[str, str], dict[str, Any]] = {}
+        for operation in operations:
+            area_id = operation["area_id"] or self._index.area_names.get(
+                name_key(operation["area"])
+            )
+            if area_id is None:
+                raise ChangesetApplyError(f"Area '{operation['area']}' not found")
+            assignments[(operation["kind"], operation["id"])] = {
+                "kind": operation["kind"],
+                "id": operation["id"],
+                "area_id": area_id,
+            }
+
+        planned, results = plan_assignments(self.hass, list(assignments.values()))
+        for result in results.values():
+            if not result["success"]:
+                raise ChangesetApplyError(result["error"]["message"])
+
+        # Journal first so a failure part way through still undoes every item
+        self.journal.extend(
+            [UNDO_ASSIGN, change["kind"], change["id"], change["previous_area_id"]]
+            for change in planned
+        )
+        await async_apply_assignments(self.hass, planned)
+
+    def _resolve_floor(self, floor_name: str | None) -> str | None:
+        """Return the id of a floor referenced by name."""
+        if not floor_name:
+            return None
+        floor_id = self._index.floor_names.get(name_key(floor_name))
+        if floor_id is None:
+            raise ChangesetApplyError(f"Floor '{floor_name}' not found")
+        return floor_id
+
+    async def _async_publish_dashboard(self, operation: dict[str, Any]) -> None:
+        """Create or update a generated dashboard, rewriting only changed views."""
+        store = await async_get_dashboard_store(self.hass)
+        url_path = operation["url_path"]
+        if operation["op"] == "create":
+            item = await async_create_collection_item(
+                self.hass,
+                LOVELACE_DASHBOARDS_PREFIX,
+                {
+                    "url_path": url_path,
+                    "title": operation["title"],
+                    "icon": "mdi:auto-fix",
+                    "show_in_sidebar": True,
+                    "require_admin": False,
+                    "mode": "storage",
+                },
+            )
+            self.journal.append([UNDO_DASHBOARD_CREATE, item["id"], url_path])
+            published = {}
+        else:
+            published = store.get(url_path)
+
+        dashboard = async_get_lovelace_dashboards(self.hass).get(url_path)
+        if dashboard is None:
+            raise ChangesetApplyError(f"Dashboard '{url_path}' not found")
+        try:
+            config = await dashboard.async_load(False)
+        except HomeAssistantError:
+            # Nothing saved yet: the dashboard is still auto-generated
+            config = {}
+
+        rendered, state = async_render_plan(self.hass, operation, published)
+        views, replaced = splice_views(
+            config.get("views", []), operation, published, rendered
+        )
+        if operation["op"] == "update":
+            self.journal.append(
+                [
+                    UNDO_DASHBOARD_UPDATE,
+                    url_path,
+                    config.get("title"),
+                    published,
+                    state,
+                    replaced,
+                ]
+            )
+        await dashboard.async_save({**config, "title": operation["title"], "views": views})
+        store.async_set(url_path, state)
+
+
+async def _async_restore_dashboard(
+    hass: HomeAssistant,
+    url_path: str,
+    title: str | None,
+    previous: dict[str, dict[str, str]],
+    current: dict[str, dict[str, str]],
+    replaced: dict[str, dict[str, Any]],
+) -> None:
+    """Put back the generated views a dashboard update replaced."""
+    if (dashboard := async_get_lovelace_dashboards(hass).get(url_path)) is None:
+        return
+    config = await dashboard.async_load(False)
+    views = restore_views(config.get("views", []), previous, current, replaced)
+    restored = {**config, "views": views}
+    if title is None:
+        restored.pop("title", None)
+    else:
+        restored["title"] = title
+    await dashboard.async_save(restored)
+    store = await async_get_dashboard_store(hass)
+    store.async_set(url_path, previous or None)
+
+
+async def async_rollback_journal(
+    hass: HomeAssistant, journal: list[list[Any]]
+) -> list[list[Any]]:
+    """Undo journaled operations, newest first, and return the ones that failed."""
+    area_registry = ar.async_get(hass)
+    floor_registry = fr.async_get(hass)
+    failed: list[list[Any]] = []
+
+    for done, entry in enumerate(reversed(journal), start=1):
+        kind, *args = entry
+        try:
+            if kind == UNDO_FLOOR_CREATE:
+                if floor_registry.async_get_floor(args[0]):
+                    floor_registry.async_delete(args[0])
+            elif kind == UNDO_AREA_CREATE:
+                if area_registry.async_get_area(args[0]):
+                    area_registry.async_delete(args[0])
+            elif kind == UNDO_AREA_UPDATE:
+                if area_registry.async_get_area(args[0]):
+                    area_registry.async_update(args[0], floor_id=args[1])
+            elif kind == UNDO_HELPER_CREATE:
+                await async_delete_collection_item(hass, args[0], args[1])
+            elif kind == UNDO_ASSIGN:
+                if args[0] == "entity":
+                    er.async_get(hass).async_update_entity(args[1], area_id=args[2])
+                else:
+                    dr.async_get(hass).async_update_device(args[1], area_id=args[2])
+            elif kind == UNDO_DASHBOARD_CREATE:
+                await async_delete_collection_item(
+                    hass, LOVELACE_DASHBOARDS_PREFIX, args[0]
+                )
+                if len(args) > 1:
+                    store = await async_get_dashboard_store(hass)
+                    store.async_set(args[1], None)
+            elif kind == UNDO_DASHBOARD_UPDATE:
+                await _async_restore_dashboard(hass, *args)
+        except Exception as err:  # pylint: disable=broad-except
+            # Keep undoing the rest; one missing item must not strand the others
+            _LOGGER.warning("Could not undo %s %s: %s", kind, args, err)
+            failed.append(entry)
+        if done % YIELD_EVERY == 0:
+            await asyncio.sleep(0)
+    failed.reverse()
+    return failed
+
+
+async def async_apply_changeset(
+    hass: HomeAssistant, changeset: dict[str, Any]
+) -> dict[str, Any]:
+    """Apply a changeset once; applying it again returns the first result."""
+    if changeset.get("applied_at"):
+        return {**apply_result(changeset), "already_applied": True}
+
+    executor = ChangesetExecutor(hass, changeset)
+    await executor.async_apply()
+
+    changeset["applied_at"] = dt_util.utcnow().isoformat()
+    changeset["rollback_id"] = rollback_id_for(changeset["changeset_id"])
+    changeset["journal"] = executor.journal
+    return {**apply_result(changeset), "already_applied": False}
+
+
+async def async_rollback_changeset(hass: HomeAssistant, changeset: dict[str, Any]) -> None:
+    """Revert an applied changeset and mark it as not applied.
+
+    Operations that cannot be undone stay in the journal and the changeset
+    stays applied, so the rollback can be retried.
+    """
+    failed = await async_rollback_journal(hass, changeset.get("journal", []))
+    changeset["journal"] = failed
+    if failed:
+        raise ChangesetRollbackError(
+            f"Could not undo {len(failed)} change(s); see the log for details"
+        )
+    changeset["applied_at"] = None
+    changeset["rolled_back_at"] = dt_util.utcnow().isoformat()
+
+
+def apply_result(changeset: dict[str, Any]) -> dict[str, Any]:
+    """Return the apply result of an applied changeset."""
+    return {
+        "success": True,
+        "changeset_id": changeset["changeset_id"],
+        "applied_at": changeset["applied_at"],
+        "rollback_id": changeset["rollback_id"],
+        "summary": changeset["summary"],
+    }
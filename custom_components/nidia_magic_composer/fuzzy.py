@@ -0,0 +1,101 @@
+"""Trigram similarity index for fuzzy name matching."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import heapq
+import re
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the padded word trigrams of a text.
+
+    Words are padded like PostgreSQL's ``pg_trgm`` (two spaces before, one
+    after), so short words and word starts still produce trigrams.
+    """
+    grams: set[str] = set()
+    for word in _WORD_RE.findall(text.casefold()):
+        padded = f"  {word} "
+        grams.update(padded[start : start + 3] for start in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class TrigramIndex:
+    """Inverted trigram index over the names and aliases of items.
+
+    Each item has one or more phrases (a name plus its aliases). Postings map
+    a trigram to the phrases containing it, so a query only touches phrases
+    sharing at least one trigram with it. Items are added and removed one at
+    a time, so the index can follow registry events without full rebuilds.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._phrases: dict[str, list[tuple[str, str, frozenset[str]]]] = {}
+        self._postings: dict[str, set[tuple[str, int]]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of indexed items."""
+        return len(self._phrases)
+
+    def clear(self) -> None:
+        """Remove every item."""
+        self._phrases.clear()
+        self._postings.clear()
+
+    def set(self, item_id: str, phrases: Iterable[str]) -> None:
+        """Index the phrases of an item, replacing any previous ones."""
+        self.drop(item_id)
+        indexed = [
+            (phrase, phrase.strip().casefold(), grams)
+            for phrase in dict.fromkeys(phrases)
+            if phrase and (grams := trigrams(phrase))
+        ]
+        if not indexed:
+            return
+        self._phrases[item_id] = indexed
+        for position, (_, _, grams) in enumerate(indexed):
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add((item_id, position))
+
+    def drop(self, item_id: str) -> None:
+        """Remove an item from the index."""
+        for position, (_, _, grams) in enumerate(self._phrases.pop(item_id, ())):
+            for gram in grams:
+                if (posting := self._postings.get(gram)) is not None:
+                    posting.discard((item_id, position))
+                    if not posting:
+                        del self._postings[gram]
+
+    def search(
+        self, query: str, *, limit: int, min_score: float
+    ) -> list[tuple[str, str, float]]:
+        """Return the best ``(item_id, matched phrase, score)`` candidates.
+
+        The score is the Dice coefficient of the trigram sets of the query and
+        the item's best matching phrase; an exact casefolded match scores 1.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: dict[tuple[str, int], int] = {}
+        for gram in query_grams:
+            for phrase_ref in self._postings.get(gram, ()):
+                shared[phrase_ref] = shared.get(phrase_ref, 0) + 1
+
+        query_key = query.strip().casefold()
+        best: dict[str, tuple[float, str]] = {}
+        for (item_id, position), count in shared.items():
+            phrase, key, grams = self._phrases[item_id][position]
+            score = (
+                1.0
+                if key == query_key
+                else 2 * count / (len(query_grams) + len(grams))
+            )
+            if score >= min_score and score > best.get(item_id, (0.0, ""))[0]:
+                best[item_id] = (score, phrase)
+
+        top = heapq.nlargest(limit, best.items(), key=lambda entry: entry[1][0])
+        return [(item_id, phrase, round(score, 3)) for item_id, (score, phrase) in top]
@@ -0,0 +1,197 @@
+"""Bulk generation of helper entities through their storage collections.
+
+Wizard helper definitions become ``create`` operations for input_boolean,
+input_number, input_select, timer and the other UI-managed helper domains,
+optionally one per room. Object ids are checked against an index of every
+entity id already taken (entity registry, state machine and the collections'
+own item ids) plus the ones planned earlier in the same batch. An id held by
+a helper the composer created in an earlier apply is skipped; any other
+collision is reported as a preview conflict instead of surfacing as a renamed
+``_2`` entity.
+
+Storage collections only schedule a delayed save on change, so creating
+hundreds of helpers in one apply costs one write per helper domain.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import slugify
+
+from .const import HELPER_DOMAIN, HELPER_OBJECT_ID_PREFIX
+from .storage_collections import (
+    StorageCollectionError,
+    async_create_collection_item,
+    async_get_collection_items,
+    async_update_collection_item,
+)
+
+# UI-managed helper domains backed by a storage collection
+HELPER_DOMAINS = (
+    "counter",
+    "input_boolean",
+    "input_button",
+    "input_datetime",
+    "input_number",
+    "input_select",
+    "input_text",
+    "timer",
+)
+
+# Fields a helper of these domains cannot be created without
+_REQUIRED_CONFIG = {
+    "input_datetime": (("has_date", "has_time"),),
+    "input_number": (("min",), ("max",)),
+    "input_select": (("options",),),
+}
+
+
+def _validate_helper(helper: dict[str, Any]) -> dict[str, Any]:
+    """Check that a helper carries the config its domain requires."""
+    config = helper["config"]
+    for alternatives in _REQUIRED_CONFIG.get(helper["domain"], ()):
+        if not any(config.get(key) not in (None, "", []) for key in alternatives):
+            raise vol.Invalid(
+                f"{helper['domain']} helper '{helper['id']}' needs "
+                + " or ".join(f"'{key}'" for key in alternatives)
+            )
+    return helper
+
+
+HELPER_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required("id"): str,
+            vol.Required("name"): str,
+            vol.Optional("enabled", default=True): bool,
+            vol.Optional("domain", default=HELPER_DOMAIN): vol.In(HELPER_DOMAINS),
+            vol.Optional("config", default=dict): dict,
+            vol.Optional("perRoom", default=False): bool,
+        },
+        extra=vol.ALLOW_EXTRA,
+    ),
+    _validate_helper,
+)
+
+
+def helper_object_id(helper_id: str, room: str | None = None) -> str:
+    """Return the object id of the helper generated for a helper definition."""
+    if room:
+        return f"{HELPER_OBJECT_ID_PREFIX}{slugify(room)}_{slugify(helper_id)}"
+    return f"{HELPER_OBJECT_ID_PREFIX}{slugify(helper_id)}"
+
+
+# Reasons an entity id cannot be claimed
+CLAIM_EXISTS = "exists"  # a helper the composer created earlier
+CLAIM_TAKEN = "taken"  # an entity the composer does not manage
+CLAIM_DUPLICATE = "duplicate"  # planned twice in the same batch
+
+
+class EntityIdIndex:
+    """Entity ids taken in a set of domains, plus the ones claimed since."""
+
+    def __init__(self, taken: set[str], managed: set[str]) -> None:
+        """Initialize the index."""
+        self._taken = taken
+        self._managed = managed
+        self._claimed: set[str] = set()
+
+    @classmethod
+    @callback
+    def async_build(cls, hass: HomeAssistant, domains: Iterable[str]) -> EntityIdIndex:
+        """Index the entity ids of some domains in one pass per source."""
+        domains = set(domains)
+        taken = {
+            entity_id
+            for entity_id in er.async_get(hass).entities
+            if entity_id.split(".", 1)[0] in domains
+        }
+        taken.update(hass.states.async_entity_ids(domains))
+        managed: set[str] = set()
+        for domain in domains:
+            # Item ids become object ids; a taken one would get a suffix
+            if (items := async_get_collection_items(hass, domain)) is None:
+                raise StorageCollectionError(f"The {domain} integration is not loaded")
+            taken.update(f"{domain}.{item_id}" for item_id in items)
+            managed.update(
+                f"{domain}.{item_id}"
+                for item_id in items
+                if item_id.startswith(HELPER_OBJECT_ID_PREFIX)
+            )
+        return cls(taken, managed)
+
+    def claim(self, entity_id: str) -> str | None:
+        """Reserve an entity id, or return why it cannot be reserved."""
+        if entity_id in self._claimed:
+            return CLAIM_DUPLICATE
+        if entity_id in self._managed:
+            return CLAIM_EXISTS
+        if entity_id in self._taken:
+            return CLAIM_TAKEN
+        self._claimed.add(entity_id)
+        return None
+
+
+@callback
+def async_plan_helpers(
+    hass: HomeAssistant, helpers: list[dict[str, Any]], rooms: list[str]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Return the create operations for missing helpers and the id conflicts."""
+    enabled = [helper for helper in helpers if helper["enabled"]]
+    index = EntityIdIndex.async_build(hass, {helper["domain"] for helper in enabled})
+    operations: list[dict[str, Any]] = []
+    conflicts: list[dict[str, Any]] = []
+
+    for helper in enabled:
+        if helper["perRoom"]:
+            targets = [(room, f"{room} {helper['name']}") for room in rooms]
+        else:
+            targets = [(None, helper["name"])]
+        for room, name in targets:
+            object_id = helper_object_id(helper["id"], room)
+            entity_id = f"{helper['domain']}.{object_id}"
+            if reason := index.claim(entity_id):
+                if reason != CLAIM_EXISTS:
+                    conflicts.append(
+                        {
+                            "helper_id": helper["id"],
+                            "entity_id": entity_id,
+                            "name": name,
+                            "reason": reason,
+                        }
+                    )
+                continue
+            operations.append(
+                {
+                    "op": "create",
+                    "domain": helper["domain"],
+                    "object_id": object_id,
+                    "entity_id": entity_id,
+                    "name": name,
+                    "config": helper["config"],
+                }
+            )
+
+    return operations, conflicts
+
+
+async def async_create_helper(hass: HomeAssistant, operation: dict[str, Any]) -> str:
+    """Create one planned helper and return its collection item id."""
+    domain = operation["domain"]
+    # The item id (and so the entity id) is derived from the name, so create
+    # under the object id and then give it its display name.
+    item = await async_create_collection_item(
+        hass, domain, {**operation.get("config", {}), "name": operation["object_id"]}
+    )
+    if operation["name"] != operation["object_id"]:
+        # Some domains validate updates against their full schema
+        config = {key: value for key, value in item.items() if key != "id"}
+        await async_update_collection_item(
+            hass, domain, item["id"], {**config, "name": operation["name"]}
+        )
+    return item["id"]
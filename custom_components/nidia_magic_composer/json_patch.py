@@ -0,0 +1,178 @@
+"""Apply RFC 6902 JSON patches without copying the whole document.
+
+Documents are treated as immutable: every operation copies only the containers
+on the path it changes (a shallow copy of each) and shares everything else
+with the previous version. A patch against a large draft therefore costs time
+proportional to the depth and width of the paths it touches, and a failing
+operation leaves the original document untouched.
+"""
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.exceptions import HomeAssistantError
+
+PATCH_OPERATION_SCHEMA = vol.Any(
+    vol.Schema(
+        {
+            vol.Required("op"): vol.In(("add", "replace", "test")),
+            vol.Required("path"): str,
+            vol.Required("value"): object,
+        }
+    ),
+    vol.Schema({vol.Required("op"): "remove", vol.Required("path"): str}),
+    vol.Schema(
+        {
+            vol.Required("op"): vol.In(("move", "copy")),
+            vol.Required("from"): str,
+            vol.Required("path"): str,
+        }
+    ),
+)
+
+
+class JsonPatchError(HomeAssistantError):
+    """Raised when a JSON patch cannot be applied."""
+
+
+def parse_pointer(pointer: str) -> list[str]:
+    """Split a JSON pointer into its unescaped reference tokens."""
+    if pointer == "":
+        return []
+    if not pointer.startswith("/"):
+        raise JsonPatchError(f"Invalid JSON pointer '{pointer}'")
+    return [
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    ]
+
+
+def _list_index(container: list[Any], token: str, *, append: bool = False) -> int:
+    """Return the list index a token refers to."""
+    if append and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token[0] == "0"):
+        raise JsonPatchError(f"Invalid array index '{token}'")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not append):
+        raise JsonPatchError(f"Array index {index} out of range")
+    return index
+
+
+def _child(container: Any, token: str) -> Any:
+    """Return the member of a container a token refers to."""
+    if isinstance(container, dict):
+        if token not in container:
+            raise JsonPatchError(f"Member '{token}' not found")
+        return container[token]
+    if isinstance(container, list):
+        return container[_list_index(container, token)]
+    raise JsonPatchError(f"Cannot reference '{token}' in a scalar")
+
+
+def _resolve(document: Any, tokens: list[str]) -> Any:
+    """Return the value at a path."""
+    for token in tokens:
+        document = _child(document, token)
+    return document
+
+
+def _copy(container: Any) -> Any:
+    """Return a shallow copy of a container."""
+    if isinstance(container, dict):
+        return dict(container)
+    if isinstance(container, list):
+        return list(container)
+    raise JsonPatchError("Cannot reference a member of a scalar")
+
+
+def _update(
+    document: Any, tokens: list[str], change: Callable[[Any, str], None]
+) -> Any:
+    """Copy the containers along a path and change the innermost one."""
+    root = parent = _copy(document)
+    for token in tokens[:-1]:
+        child = _copy(_child(parent, token))
+        if isinstance(parent, list):
+            parent[_list_index(parent, token)] = child
+        else:
+            parent[token] = child
+        parent = child
+    change(parent, tokens[-1])
+    return root
+
+
+def _add(document: Any, tokens: list[str], value: Any) -> Any:
+    """Return a document with a value added at a path."""
+    if not tokens:
+        return value
+
+    def _change(parent: Any, token: str) -> None:
+        if isinstance(parent, list):
+            parent.insert(_list_index(parent, token, append=True), value)
+        else:
+            parent[token] = value
+
+    return _update(document, tokens, _change)
+
+
+def _remove(document: Any, tokens: list[str]) -> Any:
+    """Return a document with the value at a path removed."""
+    if not tokens:
+        raise JsonPatchError("Cannot remove the whole document")
+
+    def _change(parent: Any, token: str) -> None:
+        if isinstance(parent, list):
+            del parent[_list_index(parent, token)]
+        elif token in parent:
+            del parent[token]
+        else:
+            raise JsonPatchError(f"Member '{token}' not found")
+
+    return _update(document, tokens, _change)
+
+
+def _replace(document: Any, tokens: list[str], value: Any) -> Any:
+    """Return a document with the existing value at a path replaced."""
+    if not tokens:
+        return value
+
+    def _change(parent: Any, token: str) -> None:
+        if isinstance(parent, list):
+            parent[_list_index(parent, token)] = value
+        elif token in parent:
+            parent[token] = value
+        else:
+            raise JsonPatchError(f"Member '{token}' not found")
+
+    return _update(document, tokens, _change)
+
+
+def apply_patch(document: Any, patch: list[dict[str, Any]]) -> Any:
+    """Return the document with a patch applied; the input is never modified."""
+    for position, operation in enumerate(patch):
+        op = operation["op"]
+        try:
+            tokens = parse_pointer(operation["path"])
+            if op == "add":
+                document = _add(document, tokens, operation["value"])
+            elif op == "remove":
+                document = _remove(document, tokens)
+            elif op == "replace":
+                document = _replace(document, tokens, operation["value"])
+            elif op == "test":
+                if _resolve(document, tokens) != operation["value"]:
+                    raise JsonPatchError(f"Test failed at '{operation['path']}'")
+            else:
+                source = parse_pointer(operation["from"])
+                value = _resolve(document, source)
+                if op == "move":
+                    if tokens[: len(source)] == source and len(tokens) > len(source):
+                        raise JsonPatchError("Cannot move a value into itself")
+                    document = _remove(document, source)
+                document = _add(document, tokens, value)
+        except JsonPatchError as err:
+            raise JsonPatchError(f"Operation {position} ({op}): {err}") from None
+    return document
@@ -0,0 +1,391 @@
+"""Streaming export and import of a home layout as NDJSON.
+
+A layout is a header record followed by one JSON record per line: floors
+first, then areas (serialized like the area commands do), then the composer
+profile (the wizard draft). ``layout/export`` streams it in chunks of
+``LAYOUT_CHUNK_RECORDS`` lines as subscription events, yielding to the event
+loop between chunks. ``layout/import`` takes the same text back chunk by
+chunk; each chunk is parsed and applied through the area batch planner
+before the next one is accepted, so neither side ever holds the whole layout
+in a single message. Floors and areas are matched by name, and exported floor
+ids are mapped to the local floors they were imported as.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from dataclasses import dataclass, field
+import logging
+import time
+from typing import Any
+import uuid
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    floor_registry as fr,
+    label_registry as lr,
+)
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DATA_IMPORTS,
+    DOMAIN,
+    IMPORT_SESSION_TIMEOUT,
+    LAYOUT_CHUNK_RECORDS,
+    MAX_BATCH_OPERATIONS,
+    MAX_IMPORT_ERRORS,
+    MAX_LAYOUT_CHUNK_SIZE,
+    MAX_LAYOUT_LINE_SIZE,
+    WS_TYPE_LAYOUT_EXPORT,
+    WS_TYPE_LAYOUT_IMPORT,
+)
+from .draft import async_get_draft_store
+from .metrics import async_register_metered_command
+from .registry_index import async_get_registry_index, name_key
+from .serialize import serialize_area, serialize_floor
+from .websocket_api import async_run_area_batch
+
+_LOGGER = logging.getLogger(__name__)
+
+LAYOUT_FORMAT = "nidia-layout"
+LAYOUT_VERSION = 1
+
+
+@callback
+def async_register_layout_commands(hass: HomeAssistant) -> None:
+    """Register the layout export and import WebSocket commands."""
+    async_register_metered_command(hass, websocket_layout_export)
+    async_register_metered_command(hass, websocket_layout_import)
+    _LOGGER.debug("Registered layout WebSocket commands")
+
+
+async def async_export_layout(
+    hass: HomeAssistant, *, include_profile: bool = True
+) -> AsyncIterator[tuple[str, int]]:
+    """Yield the layout as NDJSON chunks with their record counts."""
+    # Snapshot the entries so registry changes during the export can't
+    # break iteration; records are only serialized chunk by chunk
+    floors = list(fr.async_get(hass).async_list_floors())
+    areas = list(ar.async_get(hass).async_list_areas())
+    profile = (await async_get_draft_store(hass)).draft if include_profile else None
+
+    def _records() -> Iterator[dict[str, Any]]:
+        yield {
+            "type": "header",
+            "format": LAYOUT_FORMAT,
+            "version": LAYOUT_VERSION,
+            "exported_at": dt_util.utcnow().isoformat(),
+            "floors": len(floors),
+            "areas": len(areas),
+        }
+        for floor in floors:
+            yield {"type": "floor", **serialize_floor(floor)}
+        for area in areas:
+            yield {"type": "area", **serialize_area(area)}
+        if profile is not None:
+            yield {"type": "profile", "draft": profile}
+
+    lines: list[str] = []
+    for record in _records():
+        lines.append(json_dumps(record))
+        if len(lines) == LAYOUT_CHUNK_RECORDS:
+            yield "\n".join(lines) + "\n", len(lines)
+            lines = []
+            await asyncio.sleep(0)
+    if lines:
+        yield "\n".join(lines) + "\n", len(lines)
+
+
+def _import_error(line: int, code: str, message: str) -> dict[str, Any]:
+    """Build an import error for one line."""
+    return {"line": line, "code": code, "message": message}
+
+
+@dataclass
+class LayoutImport:
+    """State of one chunked layout import."""
+
+    import_id: str
+    next_seq: int = 0
+    line: int = 0
+    tail: str = ""
+    floor_ids: dict[str, str] = field(default_factory=dict)
+    stats: dict[str, int] = field(
+        default_factory=lambda: {
+            "records": 0,
+            "floors_created": 0,
+            "floors_updated": 0,
+            "areas_created": 0,
+            "areas_updated": 0,
+            "failed": 0,
+        }
+    )
+    errors: list[dict[str, Any]] = field(default_factory=list)
+    touched: float = field(default_factory=time.monotonic)
+
+    def error(self, line: int, code: str, message: str) -> None:
+        """Count a failed record, keeping the first few errors."""
+        self.stats["failed"] += 1
+        if len(self.errors) < MAX_IMPORT_ERRORS:
+            self.errors.append(_import_error(line, code, message))
+
+    async def async_import_chunk(
+        self, hass: HomeAssistant, data: str, *, final: bool
+    ) -> None:
+        """Parse and apply the complete lines of a chunk.
+
+        A line cut by the chunk boundary is kept and completed by the next
+        chunk; the final chunk flushes it. A line that grows past
+        ``MAX_LAYOUT_LINE_SIZE`` while it is carried over fails the import.
+        """
+        lines = (self.tail + data).split("\n")
+        self.tail = "" if final else lines.pop()
+        if len(self.tail) > MAX_LAYOUT_LINE_SIZE:
+            raise vol.Invalid(
+                f"Line {self.line + len(lines) + 1} is longer than "
+                f"{MAX_LAYOUT_LINE_SIZE} characters"
+            )
+
+        floors: list[tuple[int, dict[str, Any]]] = []
+        areas: list[tuple[int, dict[str, Any]]] = []
+        for text in lines:
+            self.line += 1
+            if not text.strip():
+                continue
+            if len(text) > MAX_LAYOUT_LINE_SIZE:
+                self.error(
+                    self.line,
+                    "line_too_long",
+                    f"Line is longer than {MAX_LAYOUT_LINE_SIZE} characters",
+                )
+                continue
+            try:
+                record = json_loads(text)
+            except ValueError as err:
+                self.error(self.line, "invalid_json", str(err))
+                continue
+            kind = record.get("type") if isinstance(record, dict) else None
+            self.stats["records"] += 1
+            if kind == "header":
+                if (
+                    record.get("format") != LAYOUT_FORMAT
+                    or record.get("version") != LAYOUT_VERSION
+                ):
+                    raise vol.Invalid(
+                        f"Unsupported layout format {record.get('format')!r} "
+                        f"version {record.get('version')!r}"
+                    )
+            elif kind == "floor" and isinstance(record.get("name"), str):
+                floors.append((self.line, record))
+            elif kind == "area" and isinstance(record.get("name"), str):
+                areas.append((self.line, record))
+            elif kind == "profile" and isinstance(record.get("draft"), dict):
+                store = await async_get_draft_store(hass)
+                store.async_patch(
+                    store.revision, [{"op": "replace", "path": "", "value": record["draft"]}]
+                )
+            else:
+                self.error(
+                    self.line, "invalid_record", f"Invalid {kind or 'untyped'} record"
+                )
+
+        self._apply_floors(hass, floors)
+        for start in range(0, len(areas), MAX_BATCH_OPERATIONS):
+            self._apply_areas(hass, areas[start : start + MAX_BATCH_OPERATIONS])
+            await asyncio.sleep(0)
+
+    @callback
+    def _apply_floors(
+        self, hass: HomeAssistant, floors: list[tuple[int, dict[str, Any]]]
+    ) -> None:
+        """Create or update floors matched by name."""
+        floor_registry = fr.async_get(hass)
+        index = async_get_registry_index(hass)
+        for line, record in floors:
+            if not (name := record["name"].strip()):
+                self.error(line, "invalid_name", "Floor name cannot be empty")
+                continue
+            updates = {
+                "icon": record.get("icon"),
+                "level": record.get("level"),
+                "aliases": set(record.get("aliases") or ()),
+            }
+            try:
+                if (floor_id := index.floor_names.get(name_key(name))) is None:
+                    floor = floor_registry.async_create(name=name, **updates)
+                    self.stats["floors_created"] += 1
+                else:
+                    floor = floor_registry.async_update(floor_id, **updates)
+                    self.stats["floors_updated"] += 1
+            except (ValueError, TypeError) as err:
+                self.error(line, "floor_failed", str(err))
+                continue
+            if record.get("floor_id"):
+                self.floor_ids[record["floor_id"]] = floor.floor_id
+
+    @callback
+    def _apply_areas(
+        self, hass: HomeAssistant, areas: list[tuple[int, dict[str, Any]]]
+    ) -> None:
+        """Create or update a slice of areas through the area batch planner."""
+        index = async_get_registry_index(hass)
+        label_registry = lr.async_get(hass)
+        operations: list[dict[str, Any]] = []
+        for _, record in areas:
+            operation: dict[str, Any] = {
+                "name": record["name"],
+                "icon": record.get("icon"),
+                # Labels are not part of a layout; keep those that exist here
+                "labels": [
+                    label_id
+                    for label_id in record.get("labels") or ()
+                    if label_registry.async_get_label(label_id)
+                ],
+                "aliases": list(record.get("aliases") or ()),
+            }
+            # A floor that was not imported leaves the area's floor as it is
+            if not record.get("floor_id"):
+                operation["floor_id"] = None
+            elif (floor_id := self.floor_ids.get(record["floor_id"])) is not None:
+                operation["floor_id"] = floor_id
+            if (area_id := index.area_names.get(name_key(record["name"]))) is None:
+                operations.append({"action": "create", **operation})
+            else:
+                operations.append({"action": "update", "area_id": area_id, **operation})
+
+        results = async_run_area_batch(hass, operations, False)["results"]
+        for (line, _), operation, result in zip(areas, operations, results):
+            if result["success"]:
+                self.stats[f"areas_{operation['action']}d"] += 1
+            else:
+                self.error(line, result["error"]["code"], result["error"]["message"])
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress of the import."""
+        return {
+            "import_id": self.import_id,
+            "next_seq": self.next_seq,
+            **self.stats,
+            "errors": self.errors,
+        }
+
+
+@callback
+def _async_import_sessions(hass: HomeAssistant) -> dict[str, LayoutImport]:
+    """Return the open imports, dropping the ones left idle too long."""
+    sessions: dict[str, LayoutImport] = hass.data.setdefault(DOMAIN, {}).setdefault(
+        DATA_IMPORTS, {}
+    )
+    expired = time.monotonic() - IMPORT_SESSION_TIMEOUT
+    for import_id in [key for key, value in sessions.items() if value.touched < expired]:
+        del sessions[import_id]
+    return sessions
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_LAYOUT_EXPORT,
+        vol.Optional("include_profile", default=True): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_layout_export(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream the layout as NDJSON chunk events, then a final done event."""
+    cancelled = False
+
+    @callback
+    def _async_cancel() -> None:
+        nonlocal cancelled
+        cancelled = True
+
+    connection.subscriptions[msg["id"]] = _async_cancel
+    connection.send_result(msg["id"])
+
+    seq = records = 0
+    async for chunk, count in async_export_layout(
+        hass, include_profile=msg["include_profile"]
+    ):
+        if cancelled:
+            return
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"seq": seq, "data": chunk})
+        )
+        seq += 1
+        records += count
+
+    # Nothing follows the done event; drop the subscription before sending it
+    connection.subscriptions.pop(msg["id"], None)
+    connection.send_message(
+        websocket_api.event_message(
+            msg["id"], {"done": True, "chunks": seq, "records": records}
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_LAYOUT_IMPORT,
+        vol.Optional("import_id"): str,
+        vol.Required("seq"): vol.All(int, vol.Range(min=0)),
+        vol.Required("data"): vol.All(str, vol.Length(max=MAX_LAYOUT_CHUNK_SIZE)),
+        vol.Optional("final", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_layout_import(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Apply one chunk of an NDJSON layout.
+
+    The first chunk (``seq`` 0, no ``import_id``) opens an import; later chunks
+    pass the returned ``import_id`` and must arrive in order. The result of
+    every chunk carries the running totals, and the final one closes the import.
+    """
+    sessions = _async_import_sessions(hass)
+    if "import_id" not in msg:
+        if msg["seq"] != 0:
+            connection.send_error(
+                msg["id"], "invalid_format", "A new import must start at seq 0"
+            )
+            return
+        session = LayoutImport(uuid.uuid4().hex)
+        sessions[session.import_id] = session
+    elif (session := sessions.get(msg["import_id"])) is None:
+        connection.send_error(
+            msg["id"], "not_found", f"Import '{msg['import_id']}' not found"
+        )
+        return
+
+    if msg["seq"] != session.next_seq:
+        connection.send_error(
+            msg["id"],
+            "out_of_order",
+            f"Expected chunk {session.next_seq}, got {msg['seq']}",
+        )
+        return
+
+    # Claim the sequence number before yielding so a resent chunk is refused
+    session.next_seq += 1
+    try:
+        await session.async_import_chunk(hass, msg["data"], final=msg["final"])
+    except vol.Invalid as err:
+        sessions.pop(session.import_id, None)
+        connection.send_error(msg["id"], "invalid_format", str(err))
+        return
+
+    session.touched = time.monotonic()
+    if msg["final"]:
+        sessions.pop(session.import_id, None)
+    connection.send_result(msg["id"], {**session.as_dict(), "done": msg["final"]})
@@ -0,0 +1,198 @@
+"""Latency and payload-size metrics for the composer WebSocket commands.
+
+Commands are registered through ``async_register_metered_command``, which
+hands the handler a thin connection proxy. The proxy notes when the command's
+result or error is sent, so the timing covers the whole command, including
+``async_response`` handlers that finish in a background task. Recording is an
+append to a bounded window per command and outcome; histograms and percentiles
+are only computed when metrics are read, and nothing runs while idle.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Callable
+from functools import wraps
+import time
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.components.websocket_api.messages import (
+    error_message,
+    message_to_json_bytes,
+    result_message,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DATA_METRICS, DOMAIN, METRICS_WINDOW
+
+# Upper bounds of the histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+OUTCOME_SUCCESS = "success"
+
+
+def _histogram(values: list[float], bounds: tuple[int, ...]) -> dict[str, int]:
+    """Count values into buckets labelled by their upper bound."""
+    counts = [0] * (len(bounds) + 1)
+    for value in values:
+        counts[bisect_left(bounds, value)] += 1
+    labels = [f"le_{bound}" for bound in bounds] + [f"gt_{bounds[-1]}"]
+    return dict(zip(labels, counts))
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    """Return the median and tail of a window of values."""
+    ordered = sorted(values)
+    last = len(ordered) - 1
+    return {
+        f"p{percent}": round(ordered[min(last, len(ordered) * percent // 100)], 3)
+        for percent in (50, 95, 99)
+    } | {"max": round(ordered[-1], 3)}
+
+
+class OutcomeStats:
+    """Rolling window of latency and size samples for one outcome."""
+
+    __slots__ = ("count", "samples")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.count = 0
+        self.samples: deque[tuple[float, int]] = deque(maxlen=METRICS_WINDOW)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histograms of the current window."""
+        latencies = [latency for latency, _ in self.samples]
+        sizes = [size for _, size in self.samples]
+        return {
+            "count": self.count,
+            "window": len(self.samples),
+            "latency_ms": _percentiles(latencies)
+            | {"histogram": _histogram(latencies, LATENCY_BUCKETS_MS)},
+            "bytes": _percentiles(sizes) | {"histogram": _histogram(sizes, BYTES_BUCKETS)},
+        }
+
+
+class CommandMetrics:
+    """Per-command, per-outcome metrics of the composer commands."""
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.commands: dict[str, dict[str, OutcomeStats]] = {}
+        self.started = time.time()
+
+    @callback
+    def async_record(self, command: str, outcome: str, latency: float, size: int) -> None:
+        """Record one finished command."""
+        outcomes = self.commands.setdefault(command, {})
+        if (stats := outcomes.get(outcome)) is None:
+            stats = outcomes[outcome] = OutcomeStats()
+        stats.count += 1
+        stats.samples.append((latency * 1000, size))
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return all metrics."""
+        return {
+            "since": self.started,
+            "window": METRICS_WINDOW,
+            "commands": {
+                command: {outcome: stats.as_dict() for outcome, stats in outcomes.items()}
+                for command, outcomes in sorted(self.commands.items())
+            },
+        }
+
+
+class _MeteredConnection:
+    """Connection proxy that records the first reply to one command."""
+
+    __slots__ = ("_connection", "_metrics", "_command", "_started", "_pending")
+
+    def __init__(
+        self,
+        connection: websocket_api.ActiveConnection,
+        metrics: CommandMetrics,
+        command: str,
+    ) -> None:
+        """Initialize the proxy."""
+        self._connection = connection
+        self._metrics = metrics
+        self._command = command
+        self._started = time.perf_counter()
+        self._pending = True
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the real connection."""
+        return getattr(self._connection, name)
+
+    def record(self, outcome: str, size: int) -> None:
+        """Record the command's reply unless it was already recorded."""
+        if self._pending:
+            self._pending = False
+            self._metrics.async_record(
+                self._command, outcome, time.perf_counter() - self._started, size
+            )
+
+    def _send(self, message: bytes | str | dict[str, Any], outcome: str) -> None:
+        """Send a message, recording it if it is the command's reply."""
+        if self._pending:
+            # The writer would encode the dict anyway; do it once, here
+            if isinstance(message, dict):
+                message = message_to_json_bytes(message)
+            self.record(outcome, len(message))
+        self._connection.send_message(message)
+
+    def send_message(self, message: bytes | str | dict[str, Any]) -> None:
+        """Send a message."""
+        self._send(message, OUTCOME_SUCCESS)
+
+    def send_result(self, msg_id: int, result: Any | None = None) -> None:
+        """Send a result message."""
+        self._send(result_message(msg_id, result), OUTCOME_SUCCESS)
+
+    def send_error(self, msg_id: int, code: str, message: str, **kwargs: Any) -> None:
+        """Send an error message."""
+        self._send(error_message(msg_id, code, message, **kwargs), code)
+
+    def async_handle_exception(self, msg: dict[str, Any], err: Exception) -> None:
+        """Record an exception raised by an async handler, then report it."""
+        self.record(type(err).__name__, 0)
+        self._connection.async_handle_exception(msg, err)
+
+
+@callback
+def async_get_metrics(hass: HomeAssistant) -> CommandMetrics:
+    """Return the command metrics, creating them on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (metrics := domain_data.get(DATA_METRICS)) is None:
+        metrics = domain_data[DATA_METRICS] = CommandMetrics()
+    return metrics
+
+
+def metered(handler: websocket_api.WebSocketCommandHandler) -> Callable[..., None]:
+    """Wrap a WebSocket command handler so its replies are measured."""
+    command: str = handler._ws_command  # noqa: SLF001
+
+    @wraps(handler)
+    def metered_handler(
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg: dict[str, Any],
+    ) -> None:
+        proxy = _MeteredConnection(connection, async_get_metrics(hass), command)
+        try:
+            handler(hass, proxy, msg)  # type: ignore[arg-type]
+        except Exception as err:
+            proxy.record(type(err).__name__, 0)
+            raise
+
+    return metered_handler
+
+
+@callback
+def async_register_metered_command(
+    hass: HomeAssistant, handler: websocket_api.WebSocketCommandHandler
+) -> None:
+    """Register a WebSocket command with latency and size metrics."""
+    websocket_api.async_register_command(hass, metered(handler))
@@ -0,0 +1,38 @@
+"""Schemas of the wizard profile.
+
+Kept apart from the changeset planner so the wizard commands and services can
+validate profiles without importing the planner and the apply machinery.
+"""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from .helper_engine import HELPER_SCHEMA
+
+ROOM_SCHEMA = vol.Schema(
+    {
+        vol.Required("name"): str,
+        vol.Optional("floor"): vol.Any(str, None),
+        vol.Optional("devices", default=list): [str],
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+DASHBOARDS_SCHEMA = vol.Schema(
+    {
+        vol.Optional("selectedTemplate"): vol.Any(str, None),
+        vol.Optional("publishTarget"): vol.Any(str, None),
+        vol.Optional("widgets", default=list): [dict],
+    },
+    extra=vol.ALLOW_EXTRA,
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional("profile", default=dict): dict,
+        vol.Optional("rooms", default=list): [ROOM_SCHEMA],
+        vol.Optional("helpers", default=list): [HELPER_SCHEMA],
+        vol.Optional("dashboards"): DASHBOARDS_SCHEMA,
+    },
+    extra=vol.ALLOW_EXTRA,
+)
@@ -0,0 +1,102 @@
+"""Throttled progress reporting for long-running wizard applies."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DATA_PROGRESS, DOMAIN, PROGRESS_INTERVAL, SIGNAL_APPLY_PROGRESS
+
+
+class ApplyProgress:
+    """Progress of one apply, published at most once per interval.
+
+    Step changes and the final state are always published, so subscribers see
+    every phase; per-item updates in between are coalesced. A 5,000-operation
+    apply therefore sends a handful of messages, not one per operation.
+    """
+
+    def __init__(self, hass: HomeAssistant, changeset_id: str, total: int) -> None:
+        """Initialize the progress of an apply."""
+        self.hass = hass
+        self.changeset_id = changeset_id
+        self.total = total
+        self.done = 0
+        self.step: str | None = None
+        self.current: str | None = None
+        self.errors: list[str] = []
+        self.state = "running"
+        self._started = time.monotonic()
+        self._last_sent = 0.0
+
+    @callback
+    def async_start_operation(self, step: str, description: str) -> None:
+        """Record the operation about to run."""
+        step_changed = step != self.step
+        self.step = step
+        self.current = description
+        self._async_publish(force=step_changed)
+
+    @callback
+    def async_finish_operation(self, count: int = 1) -> None:
+        """Record completed operations."""
+        self.done += count
+        self._async_publish()
+
+    @callback
+    def async_error(self, message: str) -> None:
+        """Record an error and publish it right away."""
+        self.errors.append(message)
+        self._async_publish(force=True)
+
+    @callback
+    def async_finish(self, state: str) -> None:
+        """Publish the final state of the apply."""
+        self.state = state
+        self.current = None
+        self._async_publish(force=True)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the progress event payload."""
+        elapsed = time.monotonic() - self._started
+        eta: float | None = None
+        if self.state == "running" and self.done:
+            eta = round(elapsed / self.done * (self.total - self.done), 1)
+        return {
+            "changeset_id": self.changeset_id,
+            "state": self.state,
+            "step": self.step,
+            "done": self.done,
+            "total": self.total,
+            "current": self.current,
+            "errors": self.errors,
+            "elapsed": round(elapsed, 1),
+            "eta": eta,
+        }
+
+    @callback
+    def _async_publish(self, *, force: bool = False) -> None:
+        """Send the progress to subscribers unless it was sent too recently."""
+        now = time.monotonic()
+        if not force and now - self._last_sent < PROGRESS_INTERVAL:
+            return
+        self._last_sent = now
+        async_dispatcher_send(self.hass, SIGNAL_APPLY_PROGRESS, self.as_dict())
+
+
+@callback
+def async_start_progress(
+    hass: HomeAssistant, changeset_id: str, total: int
+) -> ApplyProgress:
+    """Create the progress of a new apply and make it the current one."""
+    progress = ApplyProgress(hass, changeset_id, total)
+    hass.data.setdefault(DOMAIN, {})[DATA_PROGRESS] = progress
+    return progress
+
+
+@callback
+def async_get_progress(hass: HomeAssistant) -> ApplyProgress | None:
+    """Return the progress of the current or last apply."""
+    return hass.data.get(DOMAIN, {}).get(DATA_PROGRESS)
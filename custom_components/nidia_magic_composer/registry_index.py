@@ -0,0 +1,275 @@
+"""In-memory lookup indexes over the area and floor registries."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Callable
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+from homeassistant.helpers.json import json_bytes
+
+from .const import DATA_INDEX, DOMAIN
+from .fuzzy import TrigramIndex
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def name_key(name: str) -> str:
+    """Return the key used to compare names case-insensitively."""
+    return name.strip().casefold()
+
+
+def _discard_member(groups: dict[Any, set[str]], group: Any, member: str) -> None:
+    """Remove a member from a grouped index, dropping the group once empty."""
+    if (members := groups.get(group)) is not None:
+        members.discard(member)
+        if not members:
+            del groups[group]
+
+
+class PayloadCache:
+    """Encoded JSON payload that is rebuilt only when its revision changes."""
+
+    def __init__(self) -> None:
+        """Initialize an empty cache."""
+        self.revision: int | None = None
+        self.payload = b""
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, revision: int, build: Callable[[], Any]) -> bytes:
+        """Return the payload for a revision, encoding it on the first request."""
+        if self.revision == revision:
+            self.hits += 1
+            return self.payload
+        self.misses += 1
+        self.payload = json_bytes(build())
+        self.revision = revision
+        return self.payload
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the cache counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "revision": self.revision,
+            "bytes": len(self.payload),
+        }
+
+
+class RegistryIndex:
+    """Casefolded name, trigram, floor and label indexes for areas and floors.
+
+    The index is built once from the registries and then kept current from the
+    registry update events, so it also follows changes made outside the panel.
+    Each registry also carries a revision that is bumped on every change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize an empty index."""
+        self.hass = hass
+        self.area_names: dict[str, str] = {}
+        self.floor_names: dict[str, str] = {}
+        self._area_keys: dict[str, str] = {}
+        self._floor_keys: dict[str, str] = {}
+        # Area ids per floor (None holds unassigned areas) and per label
+        self.areas_by_floor: dict[str | None, set[str]] = {}
+        self.areas_by_label: dict[str, set[str]] = {}
+        self._area_floors: dict[str, str | None] = {}
+        self._area_labels: dict[str, frozenset[str]] = {}
+        # Trigrams of area names and aliases for fuzzy matching
+        self.area_trigrams = TrigramIndex()
+        # Name-sorted area order, rebuilt lazily once per area revision
+        self._order_revision: int | None = None
+        self._order_keys: list[tuple[str, str]] = []
+        self._unsubs: list[Callable[[], None]] = []
+        # Seed revisions from the clock so they keep increasing across restarts
+        # and a client can never mistake a stale revision for a current one.
+        seed = int(time.time() * 1000)
+        self.area_revision = seed
+        self.floor_revision = seed
+        # Encoded list payloads shared by every connection until the next change
+        self.area_payload = PayloadCache()
+        self.floor_payload = PayloadCache()
+        self.topology_payload = PayloadCache()
+
+    @callback
+    def async_rebuild(self) -> None:
+        """Rebuild every index from the registries."""
+        self.area_names.clear()
+        self._area_keys.clear()
+        self.areas_by_floor.clear()
+        self.areas_by_label.clear()
+        self._area_floors.clear()
+        self._area_labels.clear()
+        self.area_trigrams.clear()
+        for area in ar.async_get(self.hass).areas.values():
+            self._set_area(area)
+
+        self.floor_names.clear()
+        self._floor_keys.clear()
+        for floor in fr.async_get(self.hass).floors.values():
+            self._set_floor(floor)
+
+        self.area_revision += 1
+        self.floor_revision += 1
+        _LOGGER.debug(
+            "Indexed %d areas and %d floors", len(self._area_keys), len(self._floor_keys)
+        )
+
+    @callback
+    def async_start(self) -> None:
+        """Build the index and start following registry updates."""
+        self.async_rebuild()
+        self._unsubs.append(
+            self.hass.bus.async_listen(
+                ar.EVENT_AREA_REGISTRY_UPDATED, self._async_area_updated
+            )
+        )
+        self._unsubs.append(
+            self.hass.bus.async_listen(
+                fr.EVENT_FLOOR_REGISTRY_UPDATED, self._async_floor_updated
+            )
+        )
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following registry updates."""
+        while self._unsubs:
+            self._unsubs.pop()()
+
+    def area_key(self, area_id: str) -> str | None:
+        """Return the indexed name key of an area."""
+        return self._area_keys.get(area_id)
+
+    def area_name_taken(self, name: str, *, skip_area_id: str | None = None) -> bool:
+        """Check whether an area name is used by another area."""
+        owner = self.area_names.get(name_key(name))
+        return owner is not None and owner != skip_area_id
+
+    @property
+    def topology_revision(self) -> int:
+        """Return a revision that changes whenever areas or floors change."""
+        return self.area_revision + self.floor_revision
+
+    def area_sort_key(self, area_id: str) -> tuple[str, str]:
+        """Return the name-then-id sort key of an area."""
+        return (self._area_keys.get(area_id, ""), area_id)
+
+    def areas_by_name(self, prefix: str | None = None) -> list[str]:
+        """Return area ids sorted by name, optionally limited to a name prefix."""
+        if self._order_revision != self.area_revision:
+            self._order_keys = sorted(map(self.area_sort_key, self._area_floors))
+            self._order_revision = self.area_revision
+
+        if not prefix:
+            return [area_id for _, area_id in self._order_keys]
+
+        prefix_key = name_key(prefix)
+        start = bisect_left(self._order_keys, (prefix_key, ""))
+        matches: list[str] = []
+        for key, area_id in self._order_keys[start:]:
+            if not key.startswith(prefix_key):
+                break
+            matches.append(area_id)
+        return matches
+
+    def floor_name_taken(self, name: str, *, skip_floor_id: str | None = None) -> bool:
+        """Check whether a floor name is used by another floor."""
+        owner = self.floor_names.get(name_key(name))
+        return owner is not None and owner != skip_floor_id
+
+    def _set_area(self, area: ar.AreaEntry) -> None:
+        """Index an area, replacing any previous entry for it."""
+        self._drop_area(area.id)
+        if area.name:
+            key = name_key(area.name)
+            self.area_names[key] = area.id
+            self._area_keys[area.id] = key
+
+        self._area_floors[area.id] = area.floor_id
+        self.areas_by_floor.setdefault(area.floor_id, set()).add(area.id)
+        labels = frozenset(area.labels or ())
+        self._area_labels[area.id] = labels
+        for label in labels:
+            self.areas_by_label.setdefault(label, set()).add(area.id)
+        self.area_trigrams.set(area.id, (area.name, *(area.aliases or ())))
+
+    def _drop_area(self, area_id: str) -> None:
+        """Remove an area from the index."""
+        key = self._area_keys.pop(area_id, None)
+        if key is not None and self.area_names.get(key) == area_id:
+            del self.area_names[key]
+
+        if area_id in self._area_floors:
+            _discard_member(self.areas_by_floor, self._area_floors.pop(area_id), area_id)
+        for label in self._area_labels.pop(area_id, ()):
+            _discard_member(self.areas_by_label, label, area_id)
+        self.area_trigrams.drop(area_id)
+
+    def _set_floor(self, floor: fr.FloorEntry) -> None:
+        """Index a floor, replacing any previous entry for it."""
+        self._drop_floor(floor.floor_id)
+        if floor.name:
+            key = name_key(floor.name)
+            self.floor_names[key] = floor.floor_id
+            self._floor_keys[floor.floor_id] = key
+
+    def _drop_floor(self, floor_id: str) -> None:
+        """Remove a floor from the index."""
+        key = self._floor_keys.pop(floor_id, None)
+        if key is not None and self.floor_names.get(key) == floor_id:
+            del self.floor_names[key]
+
+    @callback
+    def _async_area_updated(self, event: Event[ar.EventAreaRegistryUpdatedData]) -> None:
+        """Keep the area index in sync with the registry."""
+        self.area_revision += 1
+        # A reorder carries no area id and changes no indexed entry; the
+        # revision bump is enough to rebuild the order-sensitive payloads
+        if event.data["action"] == "reorder" or (
+            area_id := event.data.get("area_id")
+        ) is None:
+            return
+        area = ar.async_get(self.hass).async_get_area(area_id)
+        if event.data["action"] == "remove" or area is None:
+            self._drop_area(area_id)
+        else:
+            self._set_area(area)
+
+    @callback
+    def _async_floor_updated(
+        self, event: Event[fr.EventFloorRegistryUpdatedData]
+    ) -> None:
+        """Keep the floor index in sync with the registry."""
+        self.floor_revision += 1
+        if event.data["action"] == "reorder" or (
+            floor_id := event.data.get("floor_id")
+        ) is None:
+            return
+        floor = fr.async_get(self.hass).async_get_floor(floor_id)
+        if event.data["action"] == "remove" or floor is None:
+            self._drop_floor(floor_id)
+        else:
+            self._set_floor(floor)
+
+
+@callback
+def async_setup_registry_index(hass: HomeAssistant) -> RegistryIndex:
+    """Create the registry index and store it in the domain data."""
+    index = RegistryIndex(hass)
+    index.async_start()
+    hass.data.setdefault(DOMAIN, {})[DATA_INDEX] = index
+    return index
+
+
+@callback
+def async_get_registry_index(hass: HomeAssistant) -> RegistryIndex:
+    """Return the registry index, creating it if setup has not run yet."""
+    index: RegistryIndex | None = hass.data.get(DOMAIN, {}).get(DATA_INDEX)
+    if index is None:
+        index = async_setup_registry_index(hass)
+    return index
@@ -0,0 +1,29 @@
+"""Serialization of registry entries for the WebSocket API."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+
+def serialize_area(area: ar.AreaEntry) -> dict[str, Any]:
+    """Serialize an area entry for the frontend."""
+    return {
+        "id": area.id,
+        "name": area.name,
+        "icon": area.icon,
+        "floor_id": area.floor_id,
+        "labels": list(area.labels) if area.labels else [],
+        "aliases": list(area.aliases) if area.aliases else [],
+    }
+
+
+def serialize_floor(floor: fr.FloorEntry) -> dict[str, Any]:
+    """Serialize a floor entry for the frontend."""
+    return {
+        "floor_id": floor.floor_id,
+        "name": floor.name,
+        "icon": floor.icon,
+        "level": floor.level,
+        "aliases": list(floor.aliases) if floor.aliases else [],
+    }
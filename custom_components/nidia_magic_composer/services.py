@@ -0,0 +1,164 @@
+"""Services for Nidia Magic Composer.
+
+The services mirror the wizard and area WebSocket commands for automations
+and scripts: they validate with the same schemas, build changesets through
+the same store and plan areas through the same batch engine, so a service
+call and the panel see identical duplicate-name checks and results. Every
+service can return its result as response data.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .const import (
+    DOMAIN,
+    MAX_BATCH_OPERATIONS,
+    SERVICE_CREATE_AREA,
+    SERVICE_WIZARD_APPLY,
+    SERVICE_WIZARD_PREVIEW,
+)
+from .profile import PROFILE_SCHEMA
+from .websocket import (
+    ChangesetNotFoundError,
+    async_apply_stored_changeset,
+    async_preview_profile,
+)
+from .websocket_api import async_run_area_batch
+
+_LOGGER = logging.getLogger(__name__)
+
+_AREA_FIELDS = {
+    vol.Optional("picture"): vol.Any(cv.string, None),
+    vol.Optional("icon"): vol.Any(cv.icon, None),
+    vol.Optional("floor_id"): vol.Any(cv.string, None),
+    vol.Optional("labels"): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("aliases"): vol.All(cv.ensure_list, [cv.string]),
+}
+
+WIZARD_PREVIEW_SCHEMA = vol.Schema({vol.Required("profile"): PROFILE_SCHEMA})
+
+WIZARD_APPLY_SCHEMA = vol.Schema({vol.Required("changeset_id"): cv.string})
+
+# A listed area is either just its name or a mapping with its own fields
+_AREA_ITEM_SCHEMA = vol.Any(
+    vol.All(cv.string, lambda name: {"name": name}),
+    vol.Schema({vol.Required("name"): cv.string, **_AREA_FIELDS}),
+)
+
+CREATE_AREA_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Exclusive("name", "areas"): cv.string,
+            vol.Exclusive("areas", "areas"): vol.All(
+                cv.ensure_list,
+                [_AREA_ITEM_SCHEMA],
+                vol.Length(min=1, max=MAX_BATCH_OPERATIONS),
+            ),
+            vol.Optional("atomic", default=False): cv.boolean,
+            **_AREA_FIELDS,
+        }
+    ),
+    cv.has_at_least_one_key("name", "areas"),
+)
+
+_SERVICES = (SERVICE_WIZARD_PREVIEW, SERVICE_WIZARD_APPLY, SERVICE_CREATE_AREA)
+
+
+@callback
+def async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WIZARD_PREVIEW,
+        _async_wizard_preview,
+        schema=WIZARD_PREVIEW_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_WIZARD_APPLY,
+        _async_wizard_apply,
+        schema=WIZARD_APPLY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_CREATE_AREA,
+        _async_create_area,
+        schema=CREATE_AREA_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    _LOGGER.debug("Registered services")
+
+
+@callback
+def async_unregister_services(hass: HomeAssistant) -> None:
+    """Remove the integration services."""
+    for service in _SERVICES:
+        hass.services.async_remove(DOMAIN, service)
+
+
+async def _async_wizard_preview(call: ServiceCall) -> ServiceResponse:
+    """Build and store a changeset for a profile and return its preview."""
+    preview = await async_preview_profile(call.hass, call.data["profile"])
+    return {"preview": preview}
+
+
+async def _async_wizard_apply(call: ServiceCall) -> ServiceResponse:
+    """Apply a previewed changeset."""
+    from .executor import ChangesetApplyError
+
+    try:
+        result = await async_apply_stored_changeset(call.hass, call.data["changeset_id"])
+    except ChangesetNotFoundError as err:
+        raise ServiceValidationError(str(err)) from err
+    except ChangesetApplyError as err:
+        raise HomeAssistantError(f"Failed to apply changeset: {err}") from err
+    return result if call.return_response else None
+
+
+async def _async_create_area(call: ServiceCall) -> ServiceResponse:
+    """Create one area, or every area of a list in a single batch.
+
+    Fields given next to ``areas`` apply to every listed area that does not
+    set them itself, so a list of names can share a floor or labels. Areas
+    that fail are logged, and the call fails listing them unless the caller
+    asked for response data, which reports them per item.
+    """
+    defaults = {
+        key: value
+        for key, value in call.data.items()
+        if key not in ("name", "areas", "atomic")
+    }
+    areas: list[dict[str, Any]] = call.data.get("areas") or [{"name": call.data["name"]}]
+    operations = [{"action": "create", **defaults, **area} for area in areas]
+
+    result = async_run_area_batch(call.hass, operations, call.data["atomic"])
+    failed = [
+        (operations[item["index"]]["name"], item["error"]["message"])
+        for item in result["results"]
+        if not item["success"] and item["error"]["code"] != "not_applied"
+    ]
+    for name, message in failed:
+        _LOGGER.warning("Area '%s' was not created: %s", name, message)
+    # Without response data a partly applied batch would fail silently
+    if failed and (not result["applied"] or not call.return_response):
+        created = sum(item["success"] for item in result["results"])
+        raise ServiceValidationError(
+            f"Created {created} of {len(operations)} area(s); "
+            + "; ".join(f"'{name}': {message}" for name, message in failed)
+        )
+    return result if call.return_response else None
@@ -0,0 +1,553 @@
+"""Registry snapshots compared through Merkle hashes.
+
+A snapshot hashes every floor, area and composer-managed helper (a "leaf")
+and arranges the hashes in a small Merkle tree: each floor node hashes the
+floor's own leaf together with the leaves of its areas, the helpers node
+hashes all helper leaves, and the root hashes the floor nodes and the helpers
+node. Two trees with the same root are identical, and a diff only descends
+into the floor nodes whose hashes differ, so an unchanged floor with
+thousands of areas costs a single comparison.
+
+The live tree is cached per registry index revision and reuses the leaf
+hash of every registry entry that was not replaced since the last build.
+Snapshots are kept in ``.storage`` as a small index plus one file per
+snapshot, loaded on demand.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+from homeassistant.helpers.json import json_dumps_sorted
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util, ulid as ulid_util
+
+from .const import (
+    DATA_SNAPSHOTS,
+    DOMAIN,
+    HELPER_OBJECT_ID_PREFIX,
+    MAX_CACHED_SNAPSHOTS,
+    MAX_STORED_SNAPSHOTS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    WS_TYPE_SNAPSHOT_CREATE,
+    WS_TYPE_SNAPSHOT_DELETE,
+    WS_TYPE_SNAPSHOT_DIFF,
+    WS_TYPE_SNAPSHOT_LIST,
+)
+from .helper_engine import HELPER_DOMAINS
+from .metrics import async_register_metered_command
+from .registry_index import async_get_registry_index
+from .serialize import serialize_area, serialize_floor
+from .storage_collections import StorageCollectionError, async_get_collection_items
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY_INDEX = f"{DOMAIN}.snapshots"
+STORAGE_KEY_SNAPSHOT = f"{DOMAIN}.snapshot.{{}}"
+
+# Floor node holding the areas without a floor
+NO_FLOOR = ""
+
+# Kinds of leaves, as reported in diffs
+KIND_FLOOR = "floor"
+KIND_AREA = "area"
+KIND_HELPER = "helper"
+
+
+@callback
+def async_register_snapshot_commands(hass: HomeAssistant) -> None:
+    """Register the snapshot WebSocket commands."""
+    async_register_metered_command(hass, websocket_snapshot_create)
+    async_register_metered_command(hass, websocket_snapshot_list)
+    async_register_metered_command(hass, websocket_snapshot_diff)
+    async_register_metered_command(hass, websocket_snapshot_delete)
+    _LOGGER.debug("Registered snapshot WebSocket commands")
+
+
+def _digest(parts: list[str]) -> str:
+    """Hash a list of strings."""
+    return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:16]
+
+
+def record_hash(record: dict[str, Any]) -> str:
+    """Return the leaf hash of a serialized record."""
+    return hashlib.sha256(json_dumps_sorted(record).encode()).hexdigest()[:16]
+
+
+def _node_hash(own: str, children: dict[str, str]) -> str:
+    """Hash a node from its own leaf and its children's hashes."""
+    return _digest([own, *(f"{key}={value}" for key, value in sorted(children.items()))])
+
+
+def build_floor_nodes(
+    floor_leaves: dict[str, str], area_leaves: dict[str, tuple[str | None, str]]
+) -> dict[str, dict[str, Any]]:
+    """Group area leaves under their floor and hash every floor node."""
+    nodes: dict[str, dict[str, Any]] = {
+        floor_id: {"floor": leaf, "areas": {}} for floor_id, leaf in floor_leaves.items()
+    }
+    for area_id, (floor_id, leaf) in area_leaves.items():
+        key = floor_id if floor_id in nodes else NO_FLOOR
+        nodes.setdefault(key, {"floor": "", "areas": {}})["areas"][area_id] = leaf
+    for node in nodes.values():
+        node["hash"] = _node_hash(node["floor"], node["areas"])
+    return nodes
+
+
+def build_tree(
+    floors: dict[str, dict[str, Any]], helper_leaves: dict[str, str]
+) -> dict[str, Any]:
+    """Assemble a tree from its floor nodes and helper leaves."""
+    helpers = {"items": helper_leaves, "hash": _node_hash("", helper_leaves)}
+    children = {f"floor:{key}": node["hash"] for key, node in floors.items()}
+    children["helpers"] = helpers["hash"]
+    return {"root": _node_hash("", children), "floors": floors, "helpers": helpers}
+
+
+def _diff_leaves(
+    kind: str,
+    old: dict[str, str],
+    new: dict[str, str],
+    changes: dict[tuple[str, str], str],
+) -> None:
+    """Record the added, removed and modified leaves of two leaf maps."""
+    for key, leaf in new.items():
+        if key not in old:
+            changes[(kind, key)] = "added"
+        elif old[key] != leaf:
+            changes[(kind, key)] = "modified"
+    for key in old.keys() - new.keys():
+        changes[(kind, key)] = "removed"
+
+
+def diff_trees(
+    old: dict[str, Any], new: dict[str, Any]
+) -> tuple[dict[tuple[str, str], str], int]:
+    """Return the changed leaves of two trees and the number of nodes compared."""
+    changes: dict[tuple[str, str], str] = {}
+    compared = 1
+    if old["root"] == new["root"]:
+        return changes, compared
+
+    old_floors, new_floors = old["floors"], new["floors"]
+    empty: dict[str, Any] = {"floor": "", "areas": {}, "hash": None}
+    # Areas of every changed floor node, diffed in one pass so an area that
+    # moved between two changed floors reads as modified, not removed+added
+    old_areas: dict[str, str] = {}
+    new_areas: dict[str, str] = {}
+    for key in old_floors.keys() | new_floors.keys():
+        compared += 1
+        old_node = old_floors.get(key, empty)
+        new_node = new_floors.get(key, empty)
+        if old_node["hash"] == new_node["hash"]:
+            continue
+        if key != NO_FLOOR and old_node["floor"] != new_node["floor"]:
+            _diff_leaves(
+                KIND_FLOOR,
+                {key: old_node["floor"]} if old_node["floor"] else {},
+                {key: new_node["floor"]} if new_node["floor"] else {},
+                changes,
+            )
+        old_areas.update(old_node["areas"])
+        new_areas.update(new_node["areas"])
+    compared += len(old_areas) + len(new_areas)
+    _diff_leaves(KIND_AREA, old_areas, new_areas, changes)
+
+    compared += 1
+    if old["helpers"]["hash"] != new["helpers"]["hash"]:
+        compared += len(old["helpers"]["items"]) + len(new["helpers"]["items"])
+        _diff_leaves(KIND_HELPER, old["helpers"]["items"], new["helpers"]["items"], changes)
+
+    return changes, compared
+
+
+@callback
+def _async_helper_records(hass: HomeAssistant) -> dict[str, dict[str, Any]]:
+    """Return the helpers created by the composer, keyed by entity id."""
+    records: dict[str, dict[str, Any]] = {}
+    for domain in HELPER_DOMAINS:
+        if (items := async_get_collection_items(hass, domain)) is None:
+            continue
+        for item_id, item in items.items():
+            if item_id.startswith(HELPER_OBJECT_ID_PREFIX):
+                records[f"{domain}.{item_id}"] = dict(item)
+    return records
+
+
+class LiveTree:
+    """The Merkle tree of the live registries, rebuilt only after changes."""
+
+    def __init__(self) -> None:
+        """Initialize the cache."""
+        self._revision: int | None = None
+        self._floors: dict[str, dict[str, Any]] = {}
+        self._floor_leaves: dict[str, tuple[fr.FloorEntry, str]] = {}
+        self._area_leaves: dict[str, tuple[ar.AreaEntry, str]] = {}
+
+    @callback
+    def async_get(self, hass: HomeAssistant) -> dict[str, Any]:
+        """Return the live tree."""
+        revision = async_get_registry_index(hass).topology_revision
+        if revision != self._revision:
+            self._floor_leaves = {
+                floor.floor_id: self._leaf(
+                    self._floor_leaves, floor.floor_id, floor, serialize_floor
+                )
+                for floor in fr.async_get(hass).async_list_floors()
+            }
+            self._area_leaves = {
+                area.id: self._leaf(self._area_leaves, area.id, area, serialize_area)
+                for area in ar.async_get(hass).async_list_areas()
+            }
+            self._floors = build_floor_nodes(
+                {key: leaf for key, (_, leaf) in self._floor_leaves.items()},
+                {
+                    key: (area.floor_id, leaf)
+                    for key, (area, leaf) in self._area_leaves.items()
+                },
+            )
+            self._revision = revision
+
+        helpers = {
+            key: record_hash(record)
+            for key, record in _async_helper_records(hass).items()
+        }
+        return build_tree(self._floors, helpers)
+
+    @staticmethod
+    def _leaf(
+        cache: dict[str, tuple[Any, str]],
+        key: str,
+        entry: Any,
+        serialize: Callable[[Any], dict[str, Any]],
+    ) -> tuple[Any, str]:
+        """Return an entry with its leaf hash, reusing it if the entry is unchanged."""
+        # Registry entries are immutable; an update replaces the object
+        if (cached := cache.get(key)) is not None and cached[0] is entry:
+            return cached
+        return entry, record_hash(serialize(entry))
+
+
+@callback
+def async_live_records(hass: HomeAssistant) -> Callable[[str, str], dict[str, Any] | None]:
+    """Return a lookup of live records by kind and key."""
+    area_registry = ar.async_get(hass)
+    floor_registry = fr.async_get(hass)
+    helpers: dict[str, dict[str, Any]] | None = None
+
+    def _lookup(kind: str, key: str) -> dict[str, Any] | None:
+        nonlocal helpers
+        if kind == KIND_AREA:
+            area = area_registry.async_get_area(key)
+            return serialize_area(area) if area else None
+        if kind == KIND_FLOOR:
+            floor = floor_registry.async_get_floor(key)
+            return serialize_floor(floor) if floor else None
+        if helpers is None:
+            helpers = _async_helper_records(hass)
+        return helpers.get(key)
+
+    return _lookup
+
+
+def describe_changes(
+    changes: dict[tuple[str, str], str],
+    old_records: Callable[[str, str], dict[str, Any] | None],
+    new_records: Callable[[str, str], dict[str, Any] | None],
+) -> dict[str, list[dict[str, Any]]]:
+    """Attach the before and after records to a set of changed leaves."""
+    described: dict[str, list[dict[str, Any]]] = {
+        f"{kind}s": [] for kind in (KIND_FLOOR, KIND_AREA, KIND_HELPER)
+    }
+    for (kind, key), change in sorted(changes.items()):
+        described[f"{kind}s"].append(
+            {
+                "id": key,
+                "change": change,
+                "before": old_records(kind, key) if change != "added" else None,
+                "after": new_records(kind, key) if change != "removed" else None,
+            }
+        )
+    return described
+
+
+def _snapshot_records(
+    snapshot: dict[str, Any],
+) -> Callable[[str, str], dict[str, Any] | None]:
+    """Return a lookup of the records stored in a snapshot."""
+    records = snapshot["records"]
+    return lambda kind, key: records[f"{kind}s"].get(key)
+
+
+def _meta(snapshot: dict[str, Any]) -> dict[str, Any]:
+    """Return the index entry of a snapshot."""
+    tree = snapshot["tree"]
+    return {
+        "snapshot_id": snapshot["snapshot_id"],
+        "created_at": snapshot["created_at"],
+        "label": snapshot["label"],
+        "changeset_id": snapshot["changeset_id"],
+        "root": tree["root"],
+        "floors": len(snapshot["records"]["floors"]),
+        "areas": len(snapshot["records"]["areas"]),
+        "helpers": len(tree["helpers"]["items"]),
+    }
+
+
+class SnapshotStore:
+    """Registry snapshots backed by ``.storage``, loaded on first use."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self.live = LiveTree()
+        self._index_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_INDEX
+        )
+        self._loaded = False
+        self._meta: dict[str, dict[str, Any]] = {}
+        self._recent: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._stores: dict[str, Store[dict[str, Any]]] = {}
+
+    async def async_load(self) -> None:
+        """Load the snapshot index unless it is already loaded."""
+        if self._loaded:
+            return
+        data = await self._index_store.async_load()
+        if self._loaded:
+            return
+        if data:
+            self._meta = {meta["snapshot_id"]: meta for meta in data["snapshots"]}
+        self._loaded = True
+
+    def _store_for(self, snapshot_id: str) -> Store[dict[str, Any]]:
+        """Return the store holding one snapshot."""
+        if (store := self._stores.get(snapshot_id)) is None:
+            store = self._stores[snapshot_id] = Store(
+                self.hass, STORAGE_VERSION, STORAGE_KEY_SNAPSHOT.format(snapshot_id)
+            )
+        return store
+
+    @callback
+    def _remember(self, snapshot: dict[str, Any]) -> None:
+        """Put a snapshot at the front of the LRU, evicting the oldest."""
+        self._recent[snapshot["snapshot_id"]] = snapshot
+        self._recent.move_to_end(snapshot["snapshot_id"])
+        while len(self._recent) > MAX_CACHED_SNAPSHOTS:
+            self._recent.popitem(last=False)
+
+    def snapshots(self) -> list[dict[str, Any]]:
+        """Return the snapshot index, newest first."""
+        return sorted(self._meta.values(), key=lambda meta: meta["created_at"], reverse=True)
+
+    def latest(self, *, applied: bool = False) -> str | None:
+        """Return the id of the newest snapshot, optionally one taken at an apply."""
+        return next(
+            (
+                meta["snapshot_id"]
+                for meta in self.snapshots()
+                if not applied or meta["changeset_id"]
+            ),
+            None,
+        )
+
+    async def async_get(self, snapshot_id: str) -> dict[str, Any] | None:
+        """Return a snapshot, loading it from disk if it is not cached."""
+        if (snapshot := self._recent.get(snapshot_id)) is not None:
+            self._recent.move_to_end(snapshot_id)
+            return snapshot
+        if snapshot_id not in self._meta:
+            return None
+        if (snapshot := await self._store_for(snapshot_id).async_load()) is None:
+            return None
+        self._remember(snapshot)
+        return snapshot
+
+    async def async_create(
+        self, *, label: str | None = None, changeset_id: str | None = None
+    ) -> dict[str, Any]:
+        """Capture the live registries and return the snapshot's index entry."""
+        lookup = async_live_records(self.hass)
+        tree = self.live.async_get(self.hass)
+        snapshot = {
+            "snapshot_id": ulid_util.ulid_now(),
+            "created_at": dt_util.utcnow().isoformat(),
+            "label": label,
+            "changeset_id": changeset_id,
+            "tree": tree,
+            "records": {
+                "floors": {
+                    key: lookup(KIND_FLOOR, key) for key in tree["floors"] if key != NO_FLOOR
+                },
+                "areas": {
+                    key: lookup(KIND_AREA, key)
+                    for node in tree["floors"].values()
+                    for key in node["areas"]
+                },
+                "helpers": _async_helper_records(self.hass),
+            },
+        }
+        snapshot_id = snapshot["snapshot_id"]
+        self._meta[snapshot_id] = _meta(snapshot)
+        self._remember(snapshot)
+        self._store_for(snapshot_id).async_delay_save(lambda: snapshot, STORAGE_SAVE_DELAY)
+        await self._async_prune()
+        self._index_store.async_delay_save(self._index_data, STORAGE_SAVE_DELAY)
+        _LOGGER.debug("Captured snapshot %s with root %s", snapshot_id, tree["root"])
+        return self._meta[snapshot_id]
+
+    async def async_delete(self, snapshot_id: str) -> bool:
+        """Delete a snapshot."""
+        if self._meta.pop(snapshot_id, None) is None:
+            return False
+        self._recent.pop(snapshot_id, None)
+        await self._store_for(snapshot_id).async_remove()
+        self._stores.pop(snapshot_id, None)
+        self._index_store.async_delay_save(self._index_data, STORAGE_SAVE_DELAY)
+        return True
+
+    async def _async_prune(self) -> None:
+        """Drop the oldest snapshots beyond the storage limit."""
+        for meta in self.snapshots()[MAX_STORED_SNAPSHOTS:]:
+            await self.async_delete(meta["snapshot_id"])
+
+    @callback
+    def _index_data(self) -> dict[str, Any]:
+        """Return the index data to write."""
+        return {"snapshots": list(self._meta.values())}
+
+    async def async_diff(
+        self, from_id: str, to_id: str | None = None
+    ) -> dict[str, Any] | None:
+        """Diff two snapshots, or a snapshot against the live registries."""
+        if (old := await self.async_get(from_id)) is None:
+            return None
+        if to_id is None:
+            new_tree = self.live.async_get(self.hass)
+            new_records = async_live_records(self.hass)
+        elif (new := await self.async_get(to_id)) is None:
+            return None
+        else:
+            new_tree, new_records = new["tree"], _snapshot_records(new)
+
+        changes, compared = diff_trees(old["tree"], new_tree)
+        return {
+            "from": from_id,
+            "to": to_id,
+            "changed": bool(changes),
+            "compared": compared,
+            **describe_changes(changes, _snapshot_records(old), new_records),
+        }
+
+
+async def async_get_snapshot_store(hass: HomeAssistant) -> SnapshotStore:
+    """Return the loaded snapshot store."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_SNAPSHOTS)) is None:
+        store = domain_data[DATA_SNAPSHOTS] = SnapshotStore(hass)
+    await store.async_load()
+    return store
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SNAPSHOT_CREATE,
+        vol.Optional("label"): vol.Any(str, None),
+    }
+)
+@websocket_api.async_response
+async def websocket_snapshot_create(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Capture a snapshot of the area, floor and helper registries."""
+    store = await async_get_snapshot_store(hass)
+    try:
+        meta = await store.async_create(label=msg.get("label"))
+    except StorageCollectionError as err:
+        connection.send_error(msg["id"], "collection_unavailable", str(err))
+        return
+    connection.send_result(msg["id"], {"snapshot": meta})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SNAPSHOT_LIST,
+    }
+)
+@websocket_api.async_response
+async def websocket_snapshot_list(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """List the stored snapshots, newest first."""
+    store = await async_get_snapshot_store(hass)
+    connection.send_result(msg["id"], {"snapshots": store.snapshots()})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SNAPSHOT_DIFF,
+        vol.Optional("from_snapshot_id"): str,
+        vol.Optional("to_snapshot_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_snapshot_diff(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Diff two snapshots, or a snapshot against the live registries.
+
+    Without ``from_snapshot_id`` the snapshot taken at the last wizard apply is
+    used; without ``to_snapshot_id`` the comparison is against live state.
+    """
+    store = await async_get_snapshot_store(hass)
+    from_id = msg.get("from_snapshot_id") or store.latest(applied=True)
+    if from_id is None:
+        connection.send_error(msg["id"], "not_found", "No snapshot to compare with")
+        return
+
+    try:
+        diff = await store.async_diff(from_id, msg.get("to_snapshot_id"))
+    except StorageCollectionError as err:
+        connection.send_error(msg["id"], "collection_unavailable", str(err))
+        return
+    if diff is None:
+        connection.send_error(msg["id"], "not_found", "Snapshot not found")
+        return
+    connection.send_result(msg["id"], diff)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SNAPSHOT_DELETE,
+        vol.Required("snapshot_id"): str,
+    }
+)
+@websocket_api.async_response
+async def websocket_snapshot_delete(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Delete a snapshot."""
+    store = await async_get_snapshot_store(hass)
+    if not await store.async_delete(msg["snapshot_id"]):
+        connection.send_error(
+            msg["id"], "not_found", f"Snapshot '{msg['snapshot_id']}' not found"
+        )
+        return
+    connection.send_result(msg["id"], {"success": True})
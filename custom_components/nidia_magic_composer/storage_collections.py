@@ -0,0 +1,230 @@
+"""Access to the storage collections of other integrations.
+
+Integrations such as ``input_boolean`` keep their storage collection local to
+setup and offer no public API to create items from Python. Their
+``<prefix>/list``, ``<prefix>/create`` and ``<prefix>/delete`` WebSocket
+commands are the interface the frontend itself relies on, so items are listed
+and changed by running those commands in-process. When a command can no longer
+be run that way, the collection is reached instead through its ``/list``
+handler, a bound method of the collection's ``StorageCollectionWebsocket``
+wrapper. That is a Home Assistant implementation detail, so when it fails too
+``StorageCollectionError`` is raised rather than acting as if the integration
+were not loaded.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+import logging
+from types import SimpleNamespace
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.websocket_api import DOMAIN as WEBSOCKET_DOMAIN
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.collection import StorageCollection
+
+from .const import (
+    COLLECTION_COMMAND_TIMEOUT,
+    COLLECTION_LOOKUP_MIN_VERSION,
+    COLLECTION_LOOKUP_TESTED_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+LOVELACE_DOMAIN = "lovelace"
+LOVELACE_DASHBOARDS_PREFIX = "lovelace/dashboards"
+
+# Item id field of the update and delete commands, "<model>_id"
+_ITEM_ID_KEYS = {LOVELACE_DASHBOARDS_PREFIX: "dashboard_id"}
+
+
+class StorageCollectionError(HomeAssistantError):
+    """Raised when a loaded integration's storage collection cannot be reached."""
+
+
+class _CommandUnusable(Exception):
+    """Raised when a collection command cannot be run in-process."""
+
+
+class _CommandConnection:
+    """Stand-in connection that captures the reply to one command."""
+
+    # The create, update and delete commands require an admin
+    user = SimpleNamespace(is_admin=True)
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the connection."""
+        self.reply: asyncio.Future[Any] = hass.loop.create_future()
+
+    @callback
+    def send_result(self, msg_id: int, result: Any | None = None) -> None:
+        """Capture a result."""
+        if not self.reply.done():
+            self.reply.set_result(result)
+
+    @callback
+    def send_error(
+        self, msg_id: int, code: str, message: str, *args: Any, **kwargs: Any
+    ) -> None:
+        """Capture an error reported by the command."""
+        if not self.reply.done():
+            self.reply.set_exception(HomeAssistantError(f"{message} ({code})"))
+
+    @callback
+    def async_handle_exception(self, msg: dict[str, Any], err: Exception) -> None:
+        """Capture an exception raised by an async command."""
+        if not self.reply.done():
+            self.reply.set_exception(err)
+
+
+@callback
+def _async_start_command(
+    hass: HomeAssistant, command: str, data: dict[str, Any]
+) -> _CommandConnection | None:
+    """Run a WebSocket command in-process; None when it is not registered."""
+    handlers: dict[str, tuple[Callable[..., Any], Any]] = hass.data.get(
+        WEBSOCKET_DOMAIN, {}
+    )
+    if (registered := handlers.get(command)) is None:
+        return None
+    handler, schema = registered
+    msg = {**data, "id": 1, "type": command}
+    try:
+        if schema is not False:
+            msg = schema(msg)
+    except vol.Invalid as err:
+        raise HomeAssistantError(f"Invalid {command} message: {err}") from err
+    connection = _CommandConnection(hass)
+    try:
+        handler(hass, connection, msg)
+    except Exception as err:  # pylint: disable=broad-except
+        raise _CommandUnusable(f"{command} failed to run: {err}") from err
+    return connection
+
+
+async def _async_run_command(
+    hass: HomeAssistant, api_prefix: str, action: str, data: dict[str, Any]
+) -> Any:
+    """Run a collection command and return its result.
+
+    Falls back to the collection lookup when the command cannot be run.
+    """
+    command = f"{api_prefix}/{action}"
+    try:
+        connection = _async_start_command(hass, command, data)
+    except _CommandUnusable as err:
+        _LOGGER.debug("Falling back to the collection lookup: %s", err)
+        return await _async_run_on_collection(hass, api_prefix, action, data)
+    if connection is None:
+        raise StorageCollectionError(f"The {api_prefix} integration is not loaded")
+    try:
+        async with asyncio.timeout(COLLECTION_COMMAND_TIMEOUT):
+            return await connection.reply
+    except TimeoutError as err:
+        # It may still complete, so it is not retried through the lookup
+        raise StorageCollectionError(f"{command} did not answer") from err
+
+
+async def _async_run_on_collection(
+    hass: HomeAssistant, api_prefix: str, action: str, data: dict[str, Any]
+) -> Any:
+    """Apply a collection command directly to the collection."""
+    collection = async_get_storage_collection(hass, api_prefix)
+    if collection is None:
+        raise StorageCollectionError(f"The {api_prefix} integration is not loaded")
+    if action == "create":
+        return await collection.async_create_item(data)
+    item_id = data.pop(_ITEM_ID_KEYS.get(api_prefix, f"{api_prefix}_id"))
+    if action == "update":
+        return await collection.async_update_item(item_id, data)
+    await collection.async_delete_item(item_id)
+    return None
+
+
+@callback
+def async_get_collection_items(
+    hass: HomeAssistant, api_prefix: str
+) -> dict[str, dict[str, Any]] | None:
+    """Return the items of a storage collection keyed by id.
+
+    Returns None when the integration is not loaded, and raises
+    ``StorageCollectionError`` when it is but its items are out of reach.
+    """
+    try:
+        connection = _async_start_command(hass, f"{api_prefix}/list", {})
+    except (_CommandUnusable, HomeAssistantError) as err:
+        _LOGGER.debug("Falling back to the collection lookup: %s", err)
+        connection = None
+    else:
+        if connection is None:
+            return None
+        # The list command answers synchronously
+        if connection.reply.done() and connection.reply.exception() is None:
+            return {item["id"]: item for item in connection.reply.result()}
+        connection.reply.cancel()
+    if (collection := async_get_storage_collection(hass, api_prefix)) is None:
+        return None
+    return collection.data
+
+
+async def async_create_collection_item(
+    hass: HomeAssistant, api_prefix: str, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Create an item in a storage collection and return it."""
+    return await _async_run_command(hass, api_prefix, "create", data)
+
+
+async def async_update_collection_item(
+    hass: HomeAssistant, api_prefix: str, item_id: str, data: dict[str, Any]
+) -> dict[str, Any]:
+    """Update an item of a storage collection and return it."""
+    item_id_key = _ITEM_ID_KEYS.get(api_prefix, f"{api_prefix}_id")
+    return await _async_run_command(
+        hass, api_prefix, "update", {**data, item_id_key: item_id}
+    )
+
+
+async def async_delete_collection_item(
+    hass: HomeAssistant, api_prefix: str, item_id: str
+) -> None:
+    """Delete an item from a storage collection."""
+    item_id_key = _ITEM_ID_KEYS.get(api_prefix, f"{api_prefix}_id")
+    await _async_run_command(hass, api_prefix, "delete", {item_id_key: item_id})
+
+
+@callback
+def async_get_storage_collection(
+    hass: HomeAssistant, api_prefix: str
+) -> StorageCollection | None:
+    """Return the storage collection behind a collection's WebSocket API.
+
+    Returns None when the integration is not loaded, and raises
+    ``StorageCollectionError`` when it is but its collection is out of reach.
+    """
+    handlers: dict[str, tuple[Any, Any]] = hass.data.get(WEBSOCKET_DOMAIN, {})
+    if (registered := handlers.get(f"{api_prefix}/list")) is None:
+        return None
+    wrapper = getattr(registered[0], "__self__", None)
+    collection = getattr(wrapper, "storage_collection", None)
+    if not isinstance(collection, StorageCollection):
+        raise StorageCollectionError(
+            f"Cannot reach the {api_prefix} storage collection on Home Assistant "
+            f"{HA_VERSION} (known to work on {COLLECTION_LOOKUP_MIN_VERSION} to "
+            f"{COLLECTION_LOOKUP_TESTED_VERSION})"
+        )
+    return collection
+
+
+@callback
+def async_get_lovelace_dashboards(hass: HomeAssistant) -> dict[str, Any]:
+    """Return the Lovelace dashboard configs keyed by url path."""
+    lovelace = hass.data.get(LOVELACE_DOMAIN)
+    if lovelace is None:
+        return {}
+    if isinstance(lovelace, dict):
+        return lovelace.get("dashboards", {})
+    return getattr(lovelace, "dashboards", {})
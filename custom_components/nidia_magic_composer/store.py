@@ -0,0 +1,203 @@
+"""Persistent storage for wizard changesets.
+
+Changesets are kept under ``.storage`` as one small index file with the
+metadata of every changeset, plus one file per changeset with its operations
+and rollback journal. Only the index and a bounded LRU of recently used
+changesets live in memory; older changesets are loaded from disk on demand.
+All writes are delayed so bursts of previews and applies are debounced.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DATA_CHANGESETS,
+    DOMAIN,
+    MAX_CACHED_CHANGESETS,
+    MAX_STORED_CHANGESETS,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_KEY_INDEX = f"{DOMAIN}.changesets"
+STORAGE_KEY_CHANGESET = f"{DOMAIN}.changeset.{{}}"
+
+# Fields persisted per changeset; everything else is derived
+_CHANGESET_FIELDS = (
+    "changeset_id",
+    "created_at",
+    "operations",
+    "helper_conflicts",
+    "dashboard_conflicts",
+    "summary",
+    "applied_at",
+    "rollback_id",
+    "rolled_back_at",
+    "journal",
+)
+# Fields kept in the always-loaded index
+_META_FIELDS = ("changeset_id", "created_at", "summary", "applied_at", "rollback_id")
+
+
+def _successor_id(changeset_id: str) -> str:
+    """Return the id for a changeset that repeats an applied one's operations."""
+    digest = hashlib.sha256(f"{changeset_id}:next".encode()).hexdigest()
+    return f"changeset_{digest[:16]}"
+
+
+def _meta(changeset: dict[str, Any]) -> dict[str, Any]:
+    """Return the index entry of a changeset."""
+    return {field: changeset.get(field) for field in _META_FIELDS}
+
+
+class ChangesetStore:
+    """Bounded in-memory cache of changesets backed by ``.storage``."""
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the store."""
+        self.hass = hass
+        self._index_store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, STORAGE_KEY_INDEX
+        )
+        self._meta: dict[str, dict[str, Any]] = {}
+        self._recent: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._stores: dict[str, Store[dict[str, Any]]] = {}
+        self._loaded = False
+
+    async def async_load(self) -> None:
+        """Load the changeset index unless it is already loaded."""
+        if self._loaded:
+            return
+        data = await self._index_store.async_load()
+        # Concurrent callers share the load; only the first one applies it
+        if self._loaded:
+            return
+        self._loaded = True
+        if data:
+            self._meta = {meta["changeset_id"]: meta for meta in data["changesets"]}
+        _LOGGER.debug("Loaded index of %d changesets", len(self._meta))
+
+    def _store_for(self, changeset_id: str) -> Store[dict[str, Any]]:
+        """Return the store holding one changeset."""
+        if (store := self._stores.get(changeset_id)) is None:
+            store = self._stores[changeset_id] = Store(
+                self.hass, STORAGE_VERSION, STORAGE_KEY_CHANGESET.format(changeset_id)
+            )
+        return store
+
+    @callback
+    def _remember(self, changeset: dict[str, Any]) -> None:
+        """Put a changeset at the front of the LRU, evicting the oldest."""
+        changeset_id = changeset["changeset_id"]
+        self._recent[changeset_id] = changeset
+        self._recent.move_to_end(changeset_id)
+        while len(self._recent) > MAX_CACHED_CHANGESETS:
+            self._recent.popitem(last=False)
+
+    async def async_get(self, changeset_id: str) -> dict[str, Any] | None:
+        """Return a changeset, loading it from disk if it is not cached."""
+        if (changeset := self._recent.get(changeset_id)) is not None:
+            self._recent.move_to_end(changeset_id)
+            return changeset
+        if changeset_id not in self._meta:
+            return None
+        if (changeset := await self._store_for(changeset_id).async_load()) is None:
+            return None
+        self._remember(changeset)
+        return changeset
+
+    async def async_add(self, changeset: dict[str, Any]) -> dict[str, Any]:
+        """Store a new changeset; a pending one with the same id wins.
+
+        The id is the hash of the operations, so a profile whose applied
+        changes were later undone outside the panel plans the same operations
+        again. Applied changesets keep their id and journal, and the new one
+        moves on to a successor id so it can be applied once more.
+        """
+        while (existing := await self.async_get(changeset["changeset_id"])) is not None:
+            if not existing.get("applied_at"):
+                return existing
+            changeset["changeset_id"] = _successor_id(existing["changeset_id"])
+        self._remember(changeset)
+        self.async_changed(changeset)
+        await self._async_prune()
+        return changeset
+
+    @callback
+    def async_changed(self, changeset: dict[str, Any]) -> None:
+        """Schedule a write of a changeset and the index."""
+        changeset_id = changeset["changeset_id"]
+        self._meta[changeset_id] = _meta(changeset)
+        self._remember(changeset)
+        self._store_for(changeset_id).async_delay_save(
+            lambda: {field: changeset.get(field) for field in _CHANGESET_FIELDS},
+            STORAGE_SAVE_DELAY,
+        )
+        self._index_store.async_delay_save(self._index_data, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _index_data(self) -> dict[str, Any]:
+        """Return the index data to write."""
+        return {"changesets": list(self._meta.values())}
+
+    async def _async_prune(self) -> None:
+        """Drop the oldest changesets beyond the storage limit."""
+        excess = len(self._meta) - MAX_STORED_CHANGESETS
+        if excess <= 0:
+            return
+        # Pending changesets go first; applied ones carry rollback journals
+        oldest = sorted(
+            self._meta.values(),
+            key=lambda meta: (meta["applied_at"] is not None, meta["created_at"]),
+        )[:excess]
+        for meta in oldest:
+            changeset_id = meta["changeset_id"]
+            del self._meta[changeset_id]
+            self._recent.pop(changeset_id, None)
+            await self._store_for(changeset_id).async_remove()
+            self._stores.pop(changeset_id, None)
+        self._index_store.async_delay_save(self._index_data, STORAGE_SAVE_DELAY)
+
+    def find_by_rollback_id(self, rollback_id: str) -> str | None:
+        """Return the id of the applied changeset with this rollback id."""
+        return next(
+            (
+                changeset_id
+                for changeset_id, meta in self._meta.items()
+                if meta["rollback_id"] == rollback_id and meta["applied_at"]
+            ),
+            None,
+        )
+
+    def pending(self) -> list[dict[str, Any]]:
+        """Return the metadata of changesets not applied, newest first."""
+        return sorted(
+            (meta for meta in self._meta.values() if not meta["applied_at"]),
+            key=lambda meta: meta["created_at"],
+            reverse=True,
+        )
+
+    def applied(self) -> list[dict[str, Any]]:
+        """Return the metadata of applied changesets, most recent first."""
+        return sorted(
+            (meta for meta in self._meta.values() if meta["applied_at"]),
+            key=lambda meta: meta["applied_at"],
+            reverse=True,
+        )
+
+
+async def async_get_changeset_store(hass: HomeAssistant) -> ChangesetStore:
+    """Return the changeset store, loading its index on first use."""
+    domain_data: dict[str, Any] = hass.data.setdefault(DOMAIN, {})
+    if (store := domain_data.get(DATA_CHANGESETS)) is None:
+        store = domain_data[DATA_CHANGESETS] = ChangesetStore(hass)
+    await store.async_load()
+    return store
@@ -0,0 +1,221 @@
+"""Room suggestions from device and entity names.
+
+A cheap snapshot of the registries is taken on the event loop; tokenizing,
+indexing and clustering then run in the executor. Names are split into
+casefolded tokens and an inverted index maps every token to the items whose
+name contains it. Each known room phrase (existing area names and aliases,
+plus a small vocabulary of common room words) is looked up through the index
+instead of scanning every name, and each item joins the cluster of the most
+specific phrase it contains. A device's ``suggested_area`` wins over its name.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from .registry_index import name_key
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Common room words (English and Italian) used when no area matches
+ROOM_WORDS = (
+    "attic",
+    "basement",
+    "bathroom",
+    "bedroom",
+    "cellar",
+    "closet",
+    "dining room",
+    "entrance",
+    "garage",
+    "garden",
+    "guest room",
+    "gym",
+    "hallway",
+    "kitchen",
+    "laundry",
+    "library",
+    "living room",
+    "lounge",
+    "nursery",
+    "office",
+    "patio",
+    "porch",
+    "stairs",
+    "study",
+    "terrace",
+    "toilet",
+    "balcone",
+    "bagno",
+    "cameretta",
+    "cantina",
+    "corridoio",
+    "cucina",
+    "giardino",
+    "ingresso",
+    "lavanderia",
+    "salotto",
+    "soggiorno",
+    "studio",
+    "taverna",
+    "terrazzo",
+)
+
+
+def tokenize(name: str) -> tuple[str, ...]:
+    """Split a name into casefolded word tokens."""
+    return tuple(_TOKEN_RE.findall(name.casefold()))
+
+
+@dataclass(slots=True)
+class _Item:
+    """One device or entity to place in a room."""
+
+    kind: str
+    item_id: str
+    name: str
+    suggested_area: str | None = None
+    tokens: tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class _Cluster:
+    """Items proposed for one room."""
+
+    room: str
+    area_id: str | None
+    devices: list[str] = field(default_factory=list)
+    entities: list[str] = field(default_factory=list)
+
+
+def _contains(tokens: tuple[str, ...], phrase: tuple[str, ...]) -> bool:
+    """Return whether a token sequence contains a phrase."""
+    width = len(phrase)
+    if width == 1:
+        return phrase[0] in tokens
+    return any(
+        tokens[start : start + width] == phrase
+        for start in range(len(tokens) - width + 1)
+    )
+
+
+def cluster_rooms(
+    items: list[_Item],
+    areas: list[tuple[str, str, list[str]]],
+) -> dict[str, Any]:
+    """Cluster items into rooms and map each room to an existing area.
+
+    Runs in the executor: it only touches the plain snapshot it is given.
+    Items must already be tokenized.
+    """
+    # Phrases to look for, most specific first: areas before room words and
+    # longer phrases before shorter ones ("guest bedroom" before "bedroom")
+    phrases: dict[tuple[str, ...], tuple[str, str | None]] = {}
+    area_by_key: dict[str, tuple[str, str | None]] = {}
+    for area_id, area_name, aliases in areas:
+        for alias in (area_name, *aliases):
+            if tokens := tokenize(alias):
+                phrases.setdefault(tokens, (area_name, area_id))
+                area_by_key.setdefault(name_key(alias), (area_name, area_id))
+    for word in ROOM_WORDS:
+        phrases.setdefault(tokenize(word), (word.title(), None))
+    ordered = sorted(phrases, key=lambda phrase: (phrases[phrase][1] is None, -len(phrase)))
+
+    # Inverted index: token -> positions of the items whose name contains it
+    inverted: dict[str, set[int]] = {}
+    for position, item in enumerate(items):
+        for token in item.tokens:
+            inverted.setdefault(token, set()).add(position)
+
+    assigned: dict[int, tuple[str, str | None]] = {}
+    for position, item in enumerate(items):
+        if item.suggested_area and (key := name_key(item.suggested_area)):
+            assigned[position] = area_by_key.get(key, (item.suggested_area.strip(), None))
+
+    for phrase in ordered:
+        candidates = inverted.get(phrase[0])
+        if not candidates:
+            continue
+        for token in phrase[1:]:
+            candidates = candidates & inverted.get(token, set())
+        for position in candidates:
+            if position not in assigned and _contains(items[position].tokens, phrase):
+                assigned[position] = phrases[phrase]
+
+    clusters: dict[str, _Cluster] = {}
+    for position, (room, area_id) in assigned.items():
+        key = area_id or name_key(room)
+        if (cluster := clusters.get(key)) is None:
+            cluster = clusters[key] = _Cluster(room, area_id)
+        item = items[position]
+        (cluster.devices if item.kind == "device" else cluster.entities).append(
+            item.item_id
+        )
+
+    suggestions = sorted(
+        clusters.values(),
+        key=lambda cluster: (-(len(cluster.devices) + len(cluster.entities)), cluster.room),
+    )
+    return {
+        "suggestions": [
+            {
+                "room": cluster.room,
+                "area_id": cluster.area_id,
+                "devices": sorted(cluster.devices),
+                "entities": sorted(cluster.entities),
+            }
+            for cluster in suggestions
+        ],
+        "scanned": len(items),
+        "unmatched": len(items) - len(assigned),
+    }
+
+
+async def async_suggest_areas(
+    hass: HomeAssistant, *, include_assigned: bool = False
+) -> dict[str, Any]:
+    """Propose rooms for the devices and entities of the registries."""
+    items: list[_Item] = []
+
+    # Snapshot on the event loop: attribute reads only, no tokenizing
+    for device in dr.async_get(hass).devices.values():
+        if device.area_id and not include_assigned:
+            continue
+        name = device.name_by_user or device.name
+        if not name and not device.suggested_area:
+            continue
+        items.append(_Item("device", device.id, name or "", device.suggested_area))
+
+    for entity in er.async_get(hass).entities.values():
+        # Entities of a device follow it unless they override its area
+        if entity.device_id and not entity.area_id:
+            continue
+        if entity.area_id and not include_assigned:
+            continue
+        items.append(
+            _Item(
+                "entity",
+                entity.entity_id,
+                entity.name or entity.original_name or entity.entity_id.split(".", 1)[1],
+            )
+        )
+
+    areas = [
+        (area.id, area.name, list(area.aliases))
+        for area in ar.async_get(hass).async_list_areas()
+    ]
+
+    def _tokenize_and_cluster() -> dict[str, Any]:
+        for item in items:
+            item.tokens = tokenize(item.name)
+        return cluster_rooms(items, areas)
+
+    return await hass.async_add_executor_job(_tokenize_and_cluster)
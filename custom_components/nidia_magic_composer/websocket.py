@@ -8,245 +8,271 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.helpers import area_registry as ar
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 
 from .const import (
-    WS_TYPE_AREAS_LIST,
-    WS_TYPE_AREAS_CREATE,
-    WS_TYPE_AREAS_UPDATE,
-    WS_TYPE_AREAS_DELETE,
+    MAX_DRAFT_PATCH_OPERATIONS,
+    SIGNAL_APPLY_PROGRESS,
+    WS_TYPE_DRAFT_GET,
+    WS_TYPE_DRAFT_PATCH,
     WS_TYPE_WIZARD_PREVIEW,
     WS_TYPE_WIZARD_APPLY,
+    WS_TYPE_WIZARD_ROLLBACK,
     WS_TYPE_WIZARD_STATUS,
+    WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS,
 )
+from .draft import DraftConflictError, async_get_draft_store
+from .json_patch import PATCH_OPERATION_SCHEMA, JsonPatchError
+from .metrics import async_register_metered_command
+from .profile import PROFILE_SCHEMA
+from .progress import async_get_progress
+from .storage_collections import StorageCollectionError
+from .store import async_get_changeset_store
 
 _LOGGER = logging.getLogger(__name__)
 
 
 @callback
-def async_register_websocket_handlers(hass: HomeAssistant) -> None:
-    """Register WebSocket API handlers."""
-    websocket_api.async_register_command(hass, websocket_areas_list)
-    websocket_api.async_register_command(hass, websocket_areas_create)
-    websocket_api.async_register_command(hass, websocket_areas_update)
-    websocket_api.async_register_command(hass, websocket_areas_delete)
-    websocket_api.async_register_command(hass, websocket_wizard_preview)
-    websocket_api.async_register_command(hass, websocket_wizard_apply)
-    websocket_api.async_register_command(hass, websocket_wizard_status)
-    _LOGGER.info("WebSocket handlers registered")
+def async_register_wizard_commands(hass: HomeAssistant) -> None:
+    """Register the wizard WebSocket commands."""
+    async_register_metered_command(hass, websocket_wizard_preview)
+    async_register_metered_command(hass, websocket_wizard_apply)
+    async_register_metered_command(hass, websocket_wizard_status)
+    async_register_metered_command(hass, websocket_wizard_rollback)
+    async_register_metered_command(hass, websocket_wizard_subscribe_progress)
+    async_register_metered_command(hass, websocket_draft_get)
+    async_register_metered_command(hass, websocket_draft_patch)
+    _LOGGER.debug("Registered wizard WebSocket commands")
+
+
+class ChangesetNotFoundError(HomeAssistantError):
+    """Raised when a changeset id is not in the changeset store."""
+
+
+async def async_preview_profile(
+    hass: HomeAssistant, profile: dict[str, Any]
+) -> dict[str, Any]:
+    """Build and store the changeset for a validated profile and return its preview."""
+    # The planner and the apply machinery are imported on first use, so setup
+    # only has to import the command handlers
+    from .changeset import async_build_changeset, changeset_preview
+
+    store = await async_get_changeset_store(hass)
+    changeset = await store.async_add(await async_build_changeset(hass, profile))
+    return changeset_preview(changeset)
+
+
+async def async_apply_stored_changeset(
+    hass: HomeAssistant, changeset_id: str
+) -> dict[str, Any]:
+    """Apply a previewed changeset and snapshot the registries afterwards."""
+    from .executor import async_apply_changeset, async_get_apply_lock
+    from .snapshot import async_get_snapshot_store
+
+    store = await async_get_changeset_store(hass)
+    changeset = await store.async_get(changeset_id)
+    if changeset is None:
+        raise ChangesetNotFoundError(f"Changeset '{changeset_id}' not found")
+
+    async with async_get_apply_lock(hass):
+        result = await async_apply_changeset(hass, changeset)
+        store.async_changed(changeset)
+        if not result["already_applied"]:
+            # Baseline for "what changed since the last apply"
+            snapshots = await async_get_snapshot_store(hass)
+            try:
+                await snapshots.async_create(
+                    label=f"Applied {changeset_id}", changeset_id=changeset_id
+                )
+            except StorageCollectionError as err:
+                # The changes are applied; only the drift baseline is missing
+                _LOGGER.warning(
+                    "No snapshot taken after applying %s: %s", changeset_id, err
+                )
+    return result
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_AREAS_LIST,
+        vol.Required("type"): WS_TYPE_WIZARD_PREVIEW,
+        vol.Required("profile"): PROFILE_SCHEMA,
     }
 )
 @websocket_api.async_response
-async def websocket_areas_list(
+async def websocket_wizard_preview(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """List all areas in Home Assistant."""
-    # TODO: Add filtering/sorting options
-    area_registry = ar.async_get(hass)
-    areas = [
-        {
-            "id": area.id,
-            "name": area.name,
-            "picture": area.picture,
-            "aliases": list(area.aliases),
-        }
-        for area in area_registry.areas.values()
-    ]
-
-    connection.send_result(msg["id"], {"areas": areas})
+    """Preview wizard changes without applying them."""
+    try:
+        preview = await async_preview_profile(hass, msg["profile"])
+    except StorageCollectionError as err:
+        connection.send_error(msg["id"], "collection_unavailable", str(err))
+        return
+    connection.send_result(msg["id"], {"preview": preview})
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_AREAS_CREATE,
-        vol.Required("name"): str,
-        vol.Optional("picture"): vol.Any(str, None),
-        vol.Optional("aliases"): [str],
+        vol.Required("type"): WS_TYPE_WIZARD_APPLY,
+        vol.Required("changeset_id"): str,
     }
 )
 @websocket_api.async_response
-async def websocket_areas_create(
+async def websocket_wizard_apply(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Create a new area."""
-    # TODO: Implement idempotent changeset tracking
-    area_registry = ar.async_get(hass)
+    """Apply wizard changes from a preview changeset."""
+    from .executor import ChangesetApplyError
 
     try:
-        area = area_registry.async_create(
-            name=msg["name"],
-            picture=msg.get("picture"),
-            aliases=set(msg.get("aliases", [])),
-        )
+        result = await async_apply_stored_changeset(hass, msg["changeset_id"])
+    except ChangesetNotFoundError as err:
+        connection.send_error(msg["id"], "not_found", str(err))
+        return
+    except ChangesetApplyError as err:
+        connection.send_error(msg["id"], "apply_failed", str(err))
+        return
 
-        connection.send_result(
-            msg["id"],
-            {
-                "area": {
-                    "id": area.id,
-                    "name": area.name,
-                    "picture": area.picture,
-                    "aliases": list(area.aliases),
-                }
-            },
-        )
-    except Exception as err:
-        _LOGGER.error("Failed to create area: %s", err)
-        connection.send_error(msg["id"], "create_failed", str(err))
+    connection.send_result(msg["id"], result)
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_AREAS_UPDATE,
-        vol.Required("area_id"): str,
-        vol.Optional("name"): str,
-        vol.Optional("picture"): vol.Any(str, None),
-        vol.Optional("aliases"): [str],
+        vol.Required("type"): WS_TYPE_WIZARD_ROLLBACK,
+        vol.Required("rollback_id"): str,
     }
 )
 @websocket_api.async_response
-async def websocket_areas_update(
+async def websocket_wizard_rollback(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Update an existing area."""
-    # TODO: Implement idempotent changeset tracking
-    area_registry = ar.async_get(hass)
-
-    try:
-        updates = {}
-        if "name" in msg:
-            updates["name"] = msg["name"]
-        if "picture" in msg:
-            updates["picture"] = msg["picture"]
-        if "aliases" in msg:
-            updates["aliases"] = set(msg["aliases"])
-
-        area = area_registry.async_update(msg["area_id"], **updates)
-
-        connection.send_result(
-            msg["id"],
-            {
-                "area": {
-                    "id": area.id,
-                    "name": area.name,
-                    "picture": area.picture,
-                    "aliases": list(area.aliases),
-                }
-            },
+    """Revert an applied changeset using its rollback journal."""
+    from .executor import async_get_apply_lock, async_rollback_changeset
+
+    store = await async_get_changeset_store(hass)
+    changeset_id = store.find_by_rollback_id(msg["rollback_id"])
+    changeset = await store.async_get(changeset_id) if changeset_id else None
+    if changeset is None or not changeset.get("applied_at"):
+        connection.send_error(
+            msg["id"], "not_found", f"Rollback '{msg['rollback_id']}' not found"
         )
-    except Exception as err:
-        _LOGGER.error("Failed to update area: %s", err)
-        connection.send_error(msg["id"], "update_failed", str(err))
+        return
+
+    async with async_get_apply_lock(hass):
+        try:
+            await async_rollback_changeset(hass, changeset)
+        except HomeAssistantError as err:
+            connection.send_error(msg["id"], "rollback_failed", str(err))
+            return
+        finally:
+            # Keep whatever was undone, even when part of the rollback failed
+            store.async_changed(changeset)
+
+    connection.send_result(
+        msg["id"], {"success": True, "changeset_id": changeset["changeset_id"]}
+    )
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_AREAS_DELETE,
-        vol.Required("area_id"): str,
+        vol.Required("type"): WS_TYPE_WIZARD_STATUS,
     }
 )
 @websocket_api.async_response
-async def websocket_areas_delete(
+async def websocket_wizard_status(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Delete an area."""
-    # TODO: Implement idempotent changeset tracking
-    # TODO: Add safety checks (prevent deletion if devices/entities assigned)
-    area_registry = ar.async_get(hass)
+    """Get current wizard status and history."""
+    from .executor import async_get_apply_lock
 
-    try:
-        area_registry.async_delete(msg["area_id"])
-        connection.send_result(msg["id"], {"success": True})
-    except Exception as err:
-        _LOGGER.error("Failed to delete area: %s", err)
-        connection.send_error(msg["id"], "delete_failed", str(err))
+    store = await async_get_changeset_store(hass)
+    progress = async_get_progress(hass)
+    is_running = async_get_apply_lock(hass).locked()
+    status = {
+        "is_running": is_running,
+        "current_step": progress.step if progress and is_running else None,
+        "pending_changesets": store.pending(),
+        "applied_changesets": store.applied(),
+    }
+
+    connection.send_result(msg["id"], status)
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_WIZARD_PREVIEW,
-        vol.Required("profile"): dict,
+        vol.Required("type"): WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS,
     }
 )
-@websocket_api.async_response
-async def websocket_wizard_preview(
+@callback
+def websocket_wizard_subscribe_progress(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Preview wizard changes without applying them."""
-    # TODO: Implement changeset generation logic
-    # This will generate a diff of what will be created/modified
-
-    preview_data = {
-        "areas_to_create": [],
-        "helpers_to_create": [],
-        "dashboards_to_create": [],
-        "entities_to_assign": [],
-    }
+    """Stream throttled progress events of wizard applies."""
+
+    @callback
+    def _async_forward_progress(progress: dict[str, Any]) -> None:
+        connection.send_message(websocket_api.event_message(msg["id"], progress))
 
-    connection.send_result(msg["id"], {"preview": preview_data})
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_APPLY_PROGRESS, _async_forward_progress
+    )
+    connection.send_result(msg["id"])
+
+    # Start with the current state so late subscribers are not left blank
+    if (progress := async_get_progress(hass)) is not None:
+        _async_forward_progress(progress.as_dict())
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_WIZARD_APPLY,
-        vol.Required("changeset_id"): str,
+        vol.Required("type"): WS_TYPE_DRAFT_GET,
     }
 )
 @websocket_api.async_response
-async def websocket_wizard_apply(
+async def websocket_draft_get(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Apply wizard changes from a preview changeset."""
-    # TODO: Implement changeset application logic
-    # This will execute the changes in an idempotent way
-
-    result = {
-        "success": True,
-        "changeset_id": msg["changeset_id"],
-        "applied_at": None,  # TODO: Add timestamp
-        "rollback_id": None,  # TODO: Generate rollback changeset
-    }
-
-    connection.send_result(msg["id"], result)
+    """Return the saved wizard draft and its revision."""
+    store = await async_get_draft_store(hass)
+    connection.send_result(msg["id"], store.as_dict())
 
 
 @websocket_api.websocket_command(
     {
-        vol.Required("type"): WS_TYPE_WIZARD_STATUS,
+        vol.Required("type"): WS_TYPE_DRAFT_PATCH,
+        vol.Required("revision"): vol.All(int, vol.Range(min=0)),
+        vol.Required("patch"): vol.All(
+            [PATCH_OPERATION_SCHEMA], vol.Length(max=MAX_DRAFT_PATCH_OPERATIONS)
+        ),
     }
 )
 @websocket_api.async_response
-async def websocket_wizard_status(
+async def websocket_draft_patch(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Get current wizard status and history."""
-    # TODO: Implement status tracking
-    # This will return current wizard state, pending changes, history
-
-    status = {
-        "is_running": False,
-        "current_step": None,
-        "pending_changesets": [],
-        "applied_changesets": [],
-    }
-
-    connection.send_result(msg["id"], status)
+    """Apply a JSON patch to the wizard draft."""
+    store = await async_get_draft_store(hass)
+    try:
+        revision = store.async_patch(msg["revision"], msg["patch"])
+    except DraftConflictError as err:
+        connection.send_error(msg["id"], "revision_mismatch", str(err))
+        return
+    except JsonPatchError as err:
+        connection.send_error(msg["id"], "invalid_patch", str(err))
+        return
+    connection.send_result(msg["id"], {"revision": revision})
@@ -1,27 +1,58 @@
 """WebSocket API for room (area) management."""
 from __future__ import annotations
 
+import asyncio
+from collections.abc import Callable
 import logging
-from typing import Any, Iterable
+from typing import Any
 
 import voluptuous as vol
 
 from homeassistant.components import websocket_api
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers import area_registry as ar, floor_registry as fr
-from homeassistant.helpers.area_registry import AreaEntry
-from homeassistant.helpers.floor_registry import FloorEntry
 
 from .const import (
+    AREA_FIELDS,
+    AREA_SORTS,
+    MAX_ASSIGNMENTS,
+    MAX_BATCH_OPERATIONS,
+    MAX_MATCH_CANDIDATES,
+    MAX_MATCH_ROOMS,
+    MAX_PAGE_SIZE,
+    WS_TYPE_CACHE_STATS,
+    WS_TYPE_AREAS_BATCH,
     WS_TYPE_AREAS_CREATE,
     WS_TYPE_AREAS_DELETE,
     WS_TYPE_AREAS_LIST,
+    WS_TYPE_AREAS_MATCH,
+    WS_TYPE_AREAS_SUBSCRIBE,
     WS_TYPE_AREAS_UPDATE,
+    WS_TYPE_DEVICES_ASSIGN_BULK,
     WS_TYPE_FLOORS_CREATE,
     WS_TYPE_FLOORS_DELETE,
     WS_TYPE_FLOORS_LIST,
+    WS_TYPE_FLOORS_SUBSCRIBE,
     WS_TYPE_FLOORS_UPDATE,
+    WS_TYPE_METRICS,
+    WS_TYPE_SUGGEST_AREAS,
+    WS_TYPE_TOPOLOGY_GET,
 )
+from .assignments import (
+    ASSIGNMENT_SCHEMA,
+    assignment_error,
+    async_apply_assignments,
+    plan_assignments,
+)
+from .metrics import async_get_metrics, async_register_metered_command
+from .registry_index import (
+    PayloadCache,
+    RegistryIndex,
+    async_get_registry_index,
+    name_key,
+)
+from .serialize import serialize_area, serialize_floor
+from .suggest import async_suggest_areas
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,75 +60,311 @@ _LOGGER = logging.getLogger(__name__)
 @callback
 def async_register_area_commands(hass: HomeAssistant) -> None:
     """Register the area management WebSocket commands."""
-    websocket_api.async_register_command(hass, websocket_areas_list)
-    websocket_api.async_register_command(hass, websocket_areas_create)
-    websocket_api.async_register_command(hass, websocket_areas_update)
-    websocket_api.async_register_command(hass, websocket_areas_delete)
+    async_register_metered_command(hass, websocket_areas_list)
+    async_register_metered_command(hass, websocket_areas_create)
+    async_register_metered_command(hass, websocket_areas_update)
+    async_register_metered_command(hass, websocket_areas_delete)
+    async_register_metered_command(hass, websocket_areas_batch)
+    async_register_metered_command(hass, websocket_areas_subscribe)
+    async_register_metered_command(hass, websocket_areas_match)
+    websocket_api.async_register_command(hass, websocket_cache_stats)
+    websocket_api.async_register_command(hass, websocket_metrics)
     _LOGGER.debug("Registered area management WebSocket commands")
 
 
 @callback
 def async_register_floor_commands(hass: HomeAssistant) -> None:
     """Register the floor management WebSocket commands."""
-    websocket_api.async_register_command(hass, websocket_floors_list)
-    websocket_api.async_register_command(hass, websocket_floors_create)
-    websocket_api.async_register_command(hass, websocket_floors_update)
-    websocket_api.async_register_command(hass, websocket_floors_delete)
+    async_register_metered_command(hass, websocket_floors_list)
+    async_register_metered_command(hass, websocket_floors_create)
+    async_register_metered_command(hass, websocket_floors_update)
+    async_register_metered_command(hass, websocket_floors_delete)
+    async_register_metered_command(hass, websocket_floors_subscribe)
+    async_register_metered_command(hass, websocket_topology_get)
     _LOGGER.debug("Registered floor management WebSocket commands")
 
 
+@callback
+def async_register_device_commands(hass: HomeAssistant) -> None:
+    """Register the device assignment WebSocket commands."""
+    async_register_metered_command(hass, websocket_devices_assign_bulk)
+    async_register_metered_command(hass, websocket_suggest_areas)
+    _LOGGER.debug("Registered device assignment WebSocket commands")
+
+
 def _normalize_name(raw_name: str) -> str:
     """Trim and normalise a room name."""
     return raw_name.strip()
 
 
 def _name_exists(
-    areas: Iterable[AreaEntry], candidate: str, *, skip_area_id: str | None = None
+    index: RegistryIndex, candidate: str, *, skip_area_id: str | None = None
 ) -> bool:
     """Check whether a name already exists (case-insensitive)."""
-    candidate_key = candidate.casefold()
-    for area in areas:
-        if skip_area_id and area.id == skip_area_id:
-            continue
-        if area.name and area.name.casefold() == candidate_key:
-            return True
-    return False
+    return index.area_name_taken(candidate, skip_area_id=skip_area_id)
 
 
-def _serialize_area(area: ar.AreaEntry) -> dict[str, Any]:
-    """Serialize an area entry for the frontend."""
-    return {
-        "id": area.id,
-        "name": area.name,
-        "icon": area.icon,
-        "floor_id": area.floor_id,
-        "labels": list(area.labels) if area.labels else [],
-        "aliases": list(area.aliases) if area.aliases else [],
-    }
+def _area_list_payload(hass: HomeAssistant, index: RegistryIndex) -> bytes:
+    """Return the encoded area list, serializing only after a registry change."""
+    revision = index.area_revision
+
+    def _build() -> dict[str, Any]:
+        areas = ar.async_get(hass).areas.values()
+        return {"areas": [serialize_area(area) for area in areas], "revision": revision}
+
+    return index.area_payload.get(revision, _build)
+
+
+def _floor_list_payload(hass: HomeAssistant, index: RegistryIndex) -> bytes:
+    """Return the encoded floor list, serializing only after a registry change."""
+    revision = index.floor_revision
+
+    def _build() -> dict[str, Any]:
+        floors = fr.async_get(hass).floors.values()
+        return {
+            "floors": [serialize_floor(floor) for floor in floors],
+            "revision": revision,
+        }
+
+    return index.floor_payload.get(revision, _build)
+
+
+def _construct_event_message(msg_id: int, payload: bytes) -> bytes:
+    """Construct a subscription event message around an encoded payload."""
+    return b"".join(
+        (b'{"id":', str(msg_id).encode(), b',"type":"event","event":', payload, b"}")
+    )
+
+
+@callback
+def _async_subscribe_registry(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg_id: int,
+    *,
+    event_type: str,
+    id_key: str,
+    lookup: Callable[[str], Any],
+    serialize: Callable[[Any], dict[str, Any]],
+    revision: Callable[[], int],
+    known_revision: int | None,
+    snapshot: Callable[[], bytes],
+) -> None:
+    """Stream a registry snapshot followed by added/updated/removed deltas.
+
+    Registry events that arrive in the same event loop iteration are coalesced
+    into a single delta message, so a batch of changes is pushed at once. When
+    the client already holds ``known_revision`` the snapshot is skipped. A
+    reorder has no entry id and cannot be expressed as a delta, so it is
+    followed by a fresh snapshot instead.
+    """
+    first_actions: dict[str, str] = {}
+    flush_handle: asyncio.Handle | None = None
+    reordered = False
+
+    @callback
+    def _async_flush() -> None:
+        nonlocal flush_handle, reordered
+        flush_handle = None
+        if reordered:
+            reordered = False
+            first_actions.clear()
+            connection.send_message(_construct_event_message(msg_id, snapshot()))
+            return
+        delta: dict[str, Any] = {"added": [], "updated": [], "removed": []}
+        for entry_id, first_action in first_actions.items():
+            entry = lookup(entry_id)
+            if entry is None:
+                if first_action != "create":
+                    delta["removed"].append(entry_id)
+            elif first_action == "create":
+                delta["added"].append(serialize(entry))
+            else:
+                delta["updated"].append(serialize(entry))
+        first_actions.clear()
+        if any(delta.values()):
+            delta["revision"] = revision()
+            connection.send_message(websocket_api.event_message(msg_id, delta))
+
+    @callback
+    def _async_on_registry_updated(event: Event[Any]) -> None:
+        nonlocal flush_handle, reordered
+        if event.data["action"] == "reorder" or (
+            entry_id := event.data.get(id_key)
+        ) is None:
+            reordered = True
+        else:
+            first_actions.setdefault(entry_id, event.data["action"])
+        if flush_handle is None:
+            flush_handle = hass.loop.call_soon(_async_flush)
+
+    unsub_listener = hass.bus.async_listen(event_type, _async_on_registry_updated)
+
+    @callback
+    def _async_unsubscribe() -> None:
+        unsub_listener()
+        if flush_handle is not None:
+            flush_handle.cancel()
+
+    connection.subscriptions[msg_id] = _async_unsubscribe
+    connection.send_result(msg_id)
+    current_revision = revision()
+    if known_revision == current_revision:
+        connection.send_message(
+            websocket_api.event_message(
+                msg_id, {"not_modified": True, "revision": current_revision}
+            )
+        )
+    else:
+        connection.send_message(_construct_event_message(msg_id, snapshot()))
+
+
+_AREA_QUERY_KEYS = ("floor_id", "label", "name_prefix", "sort", "limit", "cursor", "fields")
+
+
+def _query_areas(
+    hass: HomeAssistant, index: RegistryIndex, msg: dict[str, Any]
+) -> dict[str, Any]:
+    """Filter, sort, page and project the area list using the registry index."""
+    area_registry = ar.async_get(hass)
+
+    candidates: set[str] | None = None
+    if "floor_id" in msg:
+        candidates = index.areas_by_floor.get(msg["floor_id"], set())
+    if "label" in msg:
+        labelled = index.areas_by_label.get(msg["label"], set())
+        candidates = labelled if candidates is None else candidates & labelled
+
+    prefix = msg.get("name_prefix")
+    if candidates is None:
+        # Unfiltered: walk the pre-sorted order, narrowed by bisecting the prefix
+        area_ids = index.areas_by_name(prefix)
+    else:
+        # Filtered: only the (usually small) candidate set is sorted
+        prefix_key = name_key(prefix) if prefix else ""
+        area_ids = sorted(
+            (
+                area_id
+                for area_id in candidates
+                if index.area_sort_key(area_id)[0].startswith(prefix_key)
+            ),
+            key=index.area_sort_key,
+        )
+
+    sort = msg.get("sort", "name")
+    if sort == "-name":
+        area_ids.reverse()
+    elif sort == "floor":
+        floor_registry = fr.async_get(hass)
 
+        def _floor_level(area_id: str) -> tuple[bool, int]:
+            area = area_registry.async_get_area(area_id)
+            floor = floor_registry.async_get_floor(area.floor_id) if area else None
+            level = floor.level if floor else None
+            return (level is None, level or 0)
 
-def _serialize_floor(floor: fr.FloorEntry) -> dict[str, Any]:
-    """Serialize a floor entry for the frontend."""
+        area_ids.sort(key=_floor_level)
+
+    try:
+        offset = int(msg.get("cursor") or 0)
+    except ValueError:
+        offset = 0
+    limit = msg.get("limit", MAX_PAGE_SIZE)
+    page = area_ids[offset : offset + limit]
+
+    fields = msg.get("fields")
+    areas: list[dict[str, Any]] = []
+    for area_id in page:
+        area = area_registry.async_get_area(area_id)
+        if area is None:
+            continue
+        serialized = serialize_area(area)
+        if fields is not None:
+            serialized = {
+                key: value
+                for key, value in serialized.items()
+                if key == "id" or key in fields
+            }
+        areas.append(serialized)
+
+    end = offset + len(page)
     return {
-        "floor_id": floor.floor_id,
-        "name": floor.name,
-        "icon": floor.icon,
-        "level": floor.level,
-        "aliases": list(floor.aliases) if floor.aliases else [],
+        "areas": areas,
+        "revision": index.area_revision,
+        "total": len(area_ids),
+        "next_cursor": str(end) if end < len(area_ids) else None,
     }
 
 
-@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_AREAS_LIST})
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_AREAS_LIST,
+        vol.Optional("known_revision"): int,
+        vol.Optional("floor_id"): vol.Any(str, None),
+        vol.Optional("label"): str,
+        vol.Optional("name_prefix"): str,
+        vol.Optional("sort"): vol.In(AREA_SORTS),
+        vol.Optional("limit"): vol.All(int, vol.Range(min=1, max=MAX_PAGE_SIZE)),
+        vol.Optional("cursor"): vol.Any(str, None),
+        vol.Optional("fields"): [vol.In(AREA_FIELDS)],
+    }
+)
 @websocket_api.async_response
 async def websocket_areas_list(
     hass: HomeAssistant,
     connection: websocket_api.ActiveConnection,
     msg: dict[str, Any],
 ) -> None:
-    """Return all areas in Home Assistant."""
+    """Return the areas in Home Assistant.
+
+    Without query options the full list is served from the payload cache. A
+    ``floor_id`` of ``None`` selects the areas that are not on any floor; the
+    ``cursor`` returned as ``next_cursor`` fetches the following page.
+    """
+    index = async_get_registry_index(hass)
+    revision = index.area_revision
+    if msg.get("known_revision") == revision:
+        connection.send_result(msg["id"], {"not_modified": True, "revision": revision})
+        return
+
+    if any(key in msg for key in _AREA_QUERY_KEYS):
+        connection.send_result(msg["id"], _query_areas(hass, index, msg))
+        return
+
+    connection.send_message(
+        websocket_api.messages.construct_result_message(
+            msg["id"], _area_list_payload(hass, index)
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_AREAS_SUBSCRIBE,
+        vol.Optional("known_revision"): int,
+    }
+)
+@callback
+def websocket_areas_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the area list and its incremental changes."""
     area_registry = ar.async_get(hass)
-    areas = [_serialize_area(area) for area in area_registry.areas.values()]
-    connection.send_result(msg["id"], {"areas": areas})
+    index = async_get_registry_index(hass)
+    _async_subscribe_registry(
+        hass,
+        connection,
+        msg["id"],
+        event_type=ar.EVENT_AREA_REGISTRY_UPDATED,
+        id_key="area_id",
+        lookup=area_registry.async_get_area,
+        serialize=serialize_area,
+        revision=lambda: index.area_revision,
+        known_revision=msg.get("known_revision"),
+        snapshot=lambda: _area_list_payload(hass, index),
+    )
 
 
 @websocket_api.websocket_command(
@@ -124,7 +391,7 @@ async def websocket_areas_create(
         connection.send_error(msg["id"], "invalid_name", "Area name cannot be empty")
         return
 
-    if _name_exists(area_registry.areas.values(), normalized_name):
+    if _name_exists(async_get_registry_index(hass), normalized_name):
         connection.send_error(
             msg["id"],
             "duplicate_name",
@@ -154,7 +421,7 @@ async def websocket_areas_create(
         connection.send_error(msg["id"], "create_failed", str(err))
         return
 
-    connection.send_result(msg["id"], {"area": _serialize_area(area)})
+    connection.send_result(msg["id"], {"area": serialize_area(area)})
 
 
 @websocket_api.websocket_command(
@@ -194,7 +461,7 @@ async def websocket_areas_update(
             return
 
         if _name_exists(
-            area_registry.areas.values(), normalized_name, skip_area_id=area_id
+            async_get_registry_index(hass), normalized_name, skip_area_id=area_id
         ):
             connection.send_error(
                 msg["id"],
@@ -234,7 +501,7 @@ async def websocket_areas_update(
         connection.send_error(msg["id"], "update_failed", str(err))
         return
 
-    connection.send_result(msg["id"], {"area": _serialize_area(updated_area)})
+    connection.send_result(msg["id"], {"area": serialize_area(updated_area)})
 
 
 @websocket_api.websocket_command(
@@ -267,10 +534,323 @@ async def websocket_areas_delete(
     connection.send_result(msg["id"], {"success": True, "area_id": area_id})
 
 
+_BATCH_OPERATION_SCHEMA = vol.Any(
+    vol.Schema(
+        {
+            vol.Required("action"): "create",
+            vol.Required("name"): str,
+            vol.Optional("icon"): vol.Any(str, None),
+            vol.Optional("picture"): vol.Any(str, None),
+            vol.Optional("floor_id"): vol.Any(str, None),
+            vol.Optional("labels"): [str],
+            vol.Optional("aliases"): [str],
+        }
+    ),
+    vol.Schema(
+        {
+            vol.Required("action"): "update",
+            vol.Required("area_id"): str,
+            vol.Optional("name"): str,
+            vol.Optional("icon"): vol.Any(str, None),
+            vol.Optional("picture"): vol.Any(str, None),
+            vol.Optional("floor_id"): vol.Any(str, None),
+            vol.Optional("labels"): [str],
+            vol.Optional("aliases"): [str],
+        }
+    ),
+    vol.Schema(
+        {
+            vol.Required("action"): "delete",
+            vol.Required("area_id"): str,
+        }
+    ),
+)
+
+
+def _batch_error(index: int, code: str, message: str) -> dict[str, Any]:
+    """Build a failed per-item batch result."""
+    return {"index": index, "success": False, "error": {"code": code, "message": message}}
+
+
+def _plan_area_batch(
+    hass: HomeAssistant, operations: list[dict[str, Any]]
+) -> tuple[list[tuple[int, dict[str, Any]]], dict[int, dict[str, Any]]]:
+    """Validate a batch of area operations in a single pass.
+
+    Operations are validated in order against the registry plus the effects of
+    the operations before them, so renames, deletes and creates inside the same
+    batch can free up or claim names. Returns the planned operations and the
+    per-index validation failures.
+    """
+    area_registry = ar.async_get(hass)
+    floor_registry = fr.async_get(hass)
+    name_index = async_get_registry_index(hass)
+
+    # Name changes made by earlier operations, layered over the shared index
+    claimed: dict[str, str] = {}
+    released: set[str] = set()
+    current_names: dict[str, str | None] = {}
+    deleted: set[str] = set()
+
+    def _owner(key: str) -> str | None:
+        if key in claimed:
+            return claimed[key]
+        if key in released:
+            return None
+        return name_index.area_names.get(key)
+
+    def _release(owner_id: str) -> None:
+        old_key = (
+            current_names[owner_id]
+            if owner_id in current_names
+            else name_index.area_key(owner_id)
+        )
+        if old_key is not None:
+            claimed.pop(old_key, None)
+            released.add(old_key)
+        current_names[owner_id] = None
+
+    planned: list[tuple[int, dict[str, Any]]] = []
+    failures: dict[int, dict[str, Any]] = {}
+
+    for index, operation in enumerate(operations):
+        action = operation["action"]
+
+        area_id = operation.get("area_id")
+        if action != "create" and (
+            area_id in deleted or area_registry.async_get_area(area_id) is None
+        ):
+            failures[index] = _batch_error(
+                index, "not_found", f"Area '{area_id}' not found"
+            )
+            continue
+
+        if action == "delete":
+            deleted.add(area_id)
+            _release(area_id)
+            planned.append((index, operation))
+            continue
+
+        updates: dict[str, Any] = {}
+        new_key: str | None = None
+
+        if action == "create" or "name" in operation:
+            normalized_name = _normalize_name(operation["name"])
+            if not normalized_name:
+                failures[index] = _batch_error(
+                    index, "invalid_name", "Area name cannot be empty"
+                )
+                continue
+            new_key = name_key(normalized_name)
+            owner = _owner(new_key)
+            if owner is not None and owner != area_id:
+                failures[index] = _batch_error(
+                    index,
+                    "duplicate_name",
+                    f"An area named '{normalized_name}' already exists",
+                )
+                continue
+            updates["name"] = normalized_name
+
+        if operation.get("floor_id") and not floor_registry.async_get_floor(
+            operation["floor_id"]
+        ):
+            failures[index] = _batch_error(
+                index, "invalid_floor", f"Floor '{operation['floor_id']}' not found"
+            )
+            continue
+
+        for field in ("icon", "picture", "floor_id"):
+            if field in operation:
+                updates[field] = operation[field]
+        for field in ("labels", "aliases"):
+            if field in operation:
+                updates[field] = set(operation[field])
+
+        if new_key is not None:
+            # Claim the name for the rest of the batch; creates use a
+            # placeholder owner since their id is only known after apply.
+            owner_id = area_id if action == "update" else f"__batch_{index}"
+            _release(owner_id)
+            released.discard(new_key)
+            claimed[new_key] = owner_id
+            current_names[owner_id] = new_key
+
+        planned.append((index, {"action": action, "area_id": area_id, **updates}))
+
+    return planned, failures
+
+
+@callback
+def _apply_area_operation(
+    area_registry: ar.AreaRegistry, index: int, operation: dict[str, Any]
+) -> dict[str, Any]:
+    """Apply one validated batch operation and build its result."""
+    action = operation.pop("action")
+    area_id = operation.pop("area_id")
+
+    try:
+        if action == "create":
+            area = area_registry.async_create(
+                name=operation["name"],
+                icon=operation.get("icon"),
+                picture=operation.get("picture"),
+                floor_id=operation.get("floor_id"),
+                labels=operation.get("labels", set()),
+                aliases=operation.get("aliases", set()),
+            )
+        elif action == "update":
+            area = area_registry.async_update(area_id, **operation)
+        else:
+            area_registry.async_delete(area_id)
+            return {"index": index, "success": True, "area_id": area_id}
+    except Exception as err:  # pragma: no cover - defensive logging
+        _LOGGER.error("Failed to %s area in batch: %s", action, err)
+        return _batch_error(index, f"{action}_failed", str(err))
+
+    return {"index": index, "success": True, "area": serialize_area(area)}
+
+
+@callback
+def async_run_area_batch(
+    hass: HomeAssistant, operations: list[dict[str, Any]], atomic: bool
+) -> dict[str, Any]:
+    """Validate and apply a batch of area operations with per-item results."""
+    planned, failures = _plan_area_batch(hass, operations)
+
+    if failures and atomic:
+        return {
+            "applied": False,
+            "results": [
+                failures.get(index)
+                or _batch_error(index, "not_applied", "Batch rejected")
+                for index in range(len(operations))
+            ],
+        }
+
+    area_registry = ar.async_get(hass)
+    results: dict[int, dict[str, Any]] = dict(failures)
+    for index, operation in planned:
+        results[index] = _apply_area_operation(area_registry, index, operation)
+
+    return {
+        "applied": bool(planned),
+        "results": [results[index] for index in range(len(operations))],
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_AREAS_BATCH,
+        vol.Required("operations"): vol.All(
+            [_BATCH_OPERATION_SCHEMA], vol.Length(min=1, max=MAX_BATCH_OPERATIONS)
+        ),
+        vol.Optional("atomic", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_areas_batch(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Create, update and delete many areas in one round trip.
+
+    Every operation is validated before anything is applied. With ``atomic``
+    set, a single validation failure rejects the whole batch; otherwise the
+    valid operations are applied and failures are reported per item.
+    """
+    connection.send_result(
+        msg["id"], async_run_area_batch(hass, msg["operations"], msg["atomic"])
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_AREAS_MATCH,
+        vol.Required("rooms"): vol.All([str], vol.Length(min=1, max=MAX_MATCH_ROOMS)),
+        vol.Optional("limit", default=3): vol.All(
+            int, vol.Range(min=1, max=MAX_MATCH_CANDIDATES)
+        ),
+        vol.Optional("min_score", default=0.3): vol.All(
+            vol.Coerce(float), vol.Range(min=0, max=1)
+        ),
+    }
+)
+@callback
+def websocket_areas_match(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Rank the areas most similar to each room name.
+
+    Candidates are scored by trigram similarity against area names and
+    aliases (1.0 for an exact case-insensitive match), best first.
+    """
+    index = async_get_registry_index(hass)
+    area_registry = ar.async_get(hass)
+    matches = []
+    for room in msg["rooms"]:
+        candidates = []
+        for area_id, matched, score in index.area_trigrams.search(
+            room, limit=msg["limit"], min_score=msg["min_score"]
+        ):
+            if (area := area_registry.async_get_area(area_id)) is not None:
+                candidates.append(
+                    {
+                        "area_id": area_id,
+                        "name": area.name,
+                        "matched": matched,
+                        "score": score,
+                    }
+                )
+        matches.append({"room": room, "candidates": candidates})
+
+    connection.send_result(
+        msg["id"], {"matches": matches, "revision": index.area_revision}
+    )
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_CACHE_STATS})
+@callback
+def websocket_cache_stats(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return the hit/miss counters of the list payload caches."""
+    index = async_get_registry_index(hass)
+    caches: dict[str, PayloadCache] = {
+        "areas": index.area_payload,
+        "floors": index.floor_payload,
+        "topology": index.topology_payload,
+    }
+    connection.send_result(
+        msg["id"], {name: cache.as_dict() for name, cache in caches.items()}
+    )
+
+
+@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_METRICS})
+@callback
+def websocket_metrics(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return latency and response size histograms of the composer commands."""
+    connection.send_result(msg["id"], async_get_metrics(hass).as_dict())
+
+
 # ======================== FLOOR MANAGEMENT ========================
 
 
-@websocket_api.websocket_command({vol.Required("type"): WS_TYPE_FLOORS_LIST})
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_FLOORS_LIST,
+        vol.Optional("known_revision"): int,
+    }
+)
 @websocket_api.async_response
 async def websocket_floors_list(
     hass: HomeAssistant,
@@ -278,9 +858,46 @@ async def websocket_floors_list(
     msg: dict[str, Any],
 ) -> None:
     """Return all floors in Home Assistant."""
+    index = async_get_registry_index(hass)
+    revision = index.floor_revision
+    if msg.get("known_revision") == revision:
+        connection.send_result(msg["id"], {"not_modified": True, "revision": revision})
+        return
+
+    connection.send_message(
+        websocket_api.messages.construct_result_message(
+            msg["id"], _floor_list_payload(hass, index)
+        )
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_FLOORS_SUBSCRIBE,
+        vol.Optional("known_revision"): int,
+    }
+)
+@callback
+def websocket_floors_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the floor list and its incremental changes."""
     floor_registry = fr.async_get(hass)
-    floors = [_serialize_floor(floor) for floor in floor_registry.floors.values()]
-    connection.send_result(msg["id"], {"floors": floors})
+    index = async_get_registry_index(hass)
+    _async_subscribe_registry(
+        hass,
+        connection,
+        msg["id"],
+        event_type=fr.EVENT_FLOOR_REGISTRY_UPDATED,
+        id_key="floor_id",
+        lookup=floor_registry.async_get_floor,
+        serialize=serialize_floor,
+        revision=lambda: index.floor_revision,
+        known_revision=msg.get("known_revision"),
+        snapshot=lambda: _floor_list_payload(hass, index),
+    )
 
 
 @websocket_api.websocket_command(
@@ -307,14 +924,13 @@ async def websocket_floors_create(
         return
 
     # Check for duplicate name
-    for floor in floor_registry.floors.values():
-        if floor.name.casefold() == normalized_name.casefold():
-            connection.send_error(
-                msg["id"],
-                "duplicate_name",
-                f"A floor named '{normalized_name}' already exists",
-            )
-            return
+    if async_get_registry_index(hass).floor_name_taken(normalized_name):
+        connection.send_error(
+            msg["id"],
+            "duplicate_name",
+            f"A floor named '{normalized_name}' already exists",
+        )
+        return
 
     try:
         floor = floor_registry.async_create(
@@ -328,7 +944,7 @@ async def websocket_floors_create(
         connection.send_error(msg["id"], "create_failed", str(err))
         return
 
-    connection.send_result(msg["id"], {"floor": _serialize_floor(floor)})
+    connection.send_result(msg["id"], {"floor": serialize_floor(floor)})
 
 
 @websocket_api.websocket_command(
@@ -367,14 +983,15 @@ async def websocket_floors_update(
             return
 
         # Check for duplicate name
-        for floor in floor_registry.floors.values():
-            if floor.floor_id != floor_id and floor.name.casefold() == normalized_name.casefold():
-                connection.send_error(
-                    msg["id"],
-                    "duplicate_name",
-                    f"A floor named '{normalized_name}' already exists",
-                )
-                return
+        if async_get_registry_index(hass).floor_name_taken(
+            normalized_name, skip_floor_id=floor_id
+        ):
+            connection.send_error(
+                msg["id"],
+                "duplicate_name",
+                f"A floor named '{normalized_name}' already exists",
+            )
+            return
         updates["name"] = normalized_name
 
     # Handle icon update
@@ -396,7 +1013,7 @@ async def websocket_floors_update(
         connection.send_error(msg["id"], "update_failed", str(err))
         return
 
-    connection.send_result(msg["id"], {"floor": _serialize_floor(updated_floor)})
+    connection.send_result(msg["id"], {"floor": serialize_floor(updated_floor)})
 
 
 @websocket_api.websocket_command(
@@ -420,16 +1037,12 @@ async def websocket_floors_delete(
         return
 
     # Check if any areas are assigned to this floor
-    area_registry = ar.async_get(hass)
-    areas_in_floor = [
-        area for area in area_registry.areas.values() if area.floor_id == floor_id
-    ]
-
-    if areas_in_floor:
+    area_count = len(async_get_registry_index(hass).areas_by_floor.get(floor_id, ()))
+    if area_count:
         connection.send_error(
             msg["id"],
             "floor_in_use",
-            f"Cannot delete floor: {len(areas_in_floor)} area(s) are assigned to it",
+            f"Cannot delete floor: {area_count} area(s) are assigned to it",
         )
         return
 
@@ -441,3 +1054,155 @@ async def websocket_floors_delete(
         return
 
     connection.send_result(msg["id"], {"success": True, "floor_id": floor_id})
+
+
+# ======================== DEVICE ASSIGNMENT ========================
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_DEVICES_ASSIGN_BULK,
+        vol.Required("assignments"): vol.All(
+            [ASSIGNMENT_SCHEMA], vol.Length(min=1, max=MAX_ASSIGNMENTS)
+        ),
+        vol.Optional("atomic", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_devices_assign_bulk(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Move many devices and entities into areas in one round trip.
+
+    Every mapping is validated before anything is applied. With ``atomic``
+    set, a single failure rejects the whole call; otherwise the valid
+    mappings are applied and failures are reported per item. A ``null``
+    ``area_id`` clears the area.
+    """
+    assignments: list[dict[str, Any]] = msg["assignments"]
+    planned, results = plan_assignments(hass, assignments)
+    failed = any(not result["success"] for result in results.values())
+
+    if failed and msg["atomic"]:
+        connection.send_result(
+            msg["id"],
+            {
+                "applied": 0,
+                "results": [
+                    results[index]
+                    if index in results and not results[index]["success"]
+                    else assignment_error(index, "not_applied", "Batch rejected")
+                    for index in range(len(assignments))
+                ],
+            },
+        )
+        return
+
+    results.update(await async_apply_assignments(hass, planned))
+    connection.send_result(
+        msg["id"],
+        {
+            "applied": len(planned),
+            "results": [results[index] for index in range(len(assignments))],
+        },
+    )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_SUGGEST_AREAS,
+        vol.Optional("include_assigned", default=False): bool,
+    }
+)
+@websocket_api.async_response
+async def websocket_suggest_areas(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Propose rooms for devices and entities based on their names.
+
+    Each suggestion lists the devices and entities that belong together and
+    the existing area it maps to, or ``null`` for a room that doesn't exist
+    yet. Items that already have an area are skipped unless
+    ``include_assigned`` is set.
+    """
+    connection.send_result(
+        msg["id"],
+        await async_suggest_areas(hass, include_assigned=msg["include_assigned"]),
+    )
+
+
+# ======================== TOPOLOGY ========================
+
+
+def _build_topology(hass: HomeAssistant, index: RegistryIndex) -> dict[str, Any]:
+    """Group areas under their floors, with floors sorted by level."""
+    area_registry = ar.async_get(hass)
+    floor_registry = fr.async_get(hass)
+
+    def _areas_for(floor_id: str | None) -> list[dict[str, Any]]:
+        area_ids = sorted(
+            index.areas_by_floor.get(floor_id, ()), key=index.area_sort_key
+        )
+        return [
+            serialize_area(area)
+            for area_id in area_ids
+            if (area := area_registry.async_get_area(area_id)) is not None
+        ]
+
+    floors = sorted(
+        floor_registry.floors.values(),
+        key=lambda floor: (
+            floor.level is None,
+            floor.level or 0,
+            name_key(floor.name or ""),
+        ),
+    )
+    floor_items: list[dict[str, Any]] = []
+    for floor in floors:
+        areas = _areas_for(floor.floor_id)
+        floor_items.append(
+            {**serialize_floor(floor), "areas": areas, "area_count": len(areas)}
+        )
+    unassigned = _areas_for(None)
+
+    return {
+        "floors": floor_items,
+        "unassigned": unassigned,
+        "counts": {
+            "floors": len(floor_items),
+            "areas": len(area_registry.areas),
+            "unassigned": len(unassigned),
+        },
+        "revision": index.topology_revision,
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): WS_TYPE_TOPOLOGY_GET,
+        vol.Optional("known_revision"): int,
+    }
+)
+@websocket_api.async_response
+async def websocket_topology_get(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Return floors, their areas, unassigned areas and counts in one message."""
+    index = async_get_registry_index(hass)
+    revision = index.topology_revision
+    if msg.get("known_revision") == revision:
+        connection.send_result(msg["id"], {"not_modified": True, "revision": revision})
+        return
+
+    payload = index.topology_payload.get(
+        revision, lambda: _build_topology(hass, index)
+    )
+    connection.send_message(
+        websocket_api.messages.construct_result_message(msg["id"], payload)
+    )
@@ -1,3 +1,4 @@
+import { lazy, Suspense, type ComponentType } from 'react'
 import {
   BrowserRouter as Router,
   Routes,
@@ -8,11 +9,6 @@ import {
 } from 'react-router-dom'
 import './App.css'
 import Profile from './views/Profile'
-import Rooms from './views/Rooms'
-import Map from './views/Map'
-import Helpers from './views/Helpers'
-import Dashboards from './views/Dashboards'
-import Review from './views/Review'
 import { WizardProvider, type WizardState } from './state/WizardContext'
 import { useWizard } from './hooks/useWizard'
 
@@ -20,36 +16,66 @@ const CURRENT_VERSION = '0.3.0'
 
 type StepStatus = 'done' | 'active' | 'todo'
 
-const steps = [
+type ViewModule = { default: ComponentType }
+
+// Profile is the landing step and ships with the shell; every other step is
+// its own chunk, fetched when first visited (or when its link is pointed at).
+const lazyView = (load: () => Promise<ViewModule>) => {
+  let pending: Promise<ViewModule> | undefined
+  const preload = () => (pending ??= load())
+  return { component: lazy(preload), preload }
+}
+
+const views = {
+  rooms: lazyView(() => import('./views/Rooms')),
+  map: lazyView(() => import('./views/Map')),
+  helpers: lazyView(() => import('./views/Helpers')),
+  dashboards: lazyView(() => import('./views/Dashboards')),
+  review: lazyView(() => import('./views/Review')),
+}
+
+const steps: Array<{
+  path: string
+  label: string
+  description: string
+  component: ComponentType
+  preload?: () => void
+}> = [
   {
     path: '/',
     label: 'Profile',
     description: 'Describe the home profile, time zone, and automation goals.',
+    component: Profile,
   },
   {
     path: '/rooms',
     label: 'Rooms',
     description: 'Model rooms, floors, and the devices that live in each area.',
+    ...views.rooms,
   },
   {
     path: '/map',
     label: 'Spatial map',
     description: 'Upload floor plans and map rooms to Home Assistant areas.',
+    ...views.map,
   },
   {
     path: '/helpers',
     label: 'Helpers',
     description: 'Pick the orchestrations and routines to automate daily life.',
+    ...views.helpers,
   },
   {
     path: '/dashboards',
     label: 'Dashboards',
     description: 'Curate Lovelace dashboards and quick actions for the household.',
+    ...views.dashboards,
   },
   {
     path: '/review',
     label: 'Review & publish',
     description: 'Validate the blueprint, preview changes, and publish to Home Assistant.',
+    ...views.review,
   },
 ]
 
@@ -118,6 +144,8 @@ const Sidebar = () => {
             key={step.path}
             to={step.path}
             end={step.path === '/'}
+            onPointerEnter={step.preload}
+            onFocus={step.preload}
             className={({ isActive }) =>
               classNames(
                 'nav-link',
@@ -160,14 +188,13 @@ const Sidebar = () => {
 }
 
 const AppRoutes = () => (
-  <Routes>
-    <Route path="/" element={<Profile />} />
-    <Route path="/rooms" element={<Rooms />} />
-    <Route path="/map" element={<Map />} />
-    <Route path="/helpers" element={<Helpers />} />
-    <Route path="/dashboards" element={<Dashboards />} />
-    <Route path="/review" element={<Review />} />
-  </Routes>
+  <Suspense fallback={<div className="view-loading" role="status">Loading step…</div>}>
+    <Routes>
+      {steps.map(({ path, component: View }) => (
+        <Route key={path} path={path} element={<View />} />
+      ))}
+    </Routes>
+  </Suspense>
 )
 
 const MainArea = () => {
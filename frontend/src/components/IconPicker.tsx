@@ -1,4 +1,5 @@
-import React, { useState, useMemo } from 'react'
+import React, { useEffect, useState, useMemo } from 'react'
+import type { IconOption } from './iconCatalog'
 
 interface IconPickerProps {
   value: string | null | undefined
@@ -7,29 +8,28 @@ interface IconPickerProps {
   placeholder?: string
 }
 
-// Common Home Assistant / Material Design Icons for areas and floors
-const COMMON_ICONS = [
-  { value: null, label: 'No icon', icon: '○' },
-  { value: 'mdi:home', label: 'Home', icon: '🏠' },
-  { value: 'mdi:sofa', label: 'Living Room', icon: '🛋️' },
-  { value: 'mdi:bed', label: 'Bedroom', icon: '🛏️' },
-  { value: 'mdi:silverware-fork-knife', label: 'Kitchen', icon: '🍴' },
-  { value: 'mdi:shower', label: 'Bathroom', icon: '🚿' },
-  { value: 'mdi:desk', label: 'Office', icon: '🖥️' },
-  { value: 'mdi:dumbbell', label: 'Gym', icon: '🏋️' },
-  { value: 'mdi:tools', label: 'Garage/Workshop', icon: '🔧' },
-  { value: 'mdi:warehouse', label: 'Storage', icon: '📦' },
-  { value: 'mdi:hanger', label: 'Closet', icon: '👔' },
-  { value: 'mdi:floor-plan', label: 'Floor', icon: '🗂️' },
-  { value: 'mdi:stairs', label: 'Stairs', icon: '🪜' },
-  { value: 'mdi:walk', label: 'Hallway', icon: '🚶' },
-  { value: 'mdi:pine-tree', label: 'Outdoor', icon: '🌲' },
-  { value: 'mdi:flower', label: 'Garden', icon: '🌸' },
-  { value: 'mdi:washing-machine', label: 'Laundry', icon: '🧺' },
-  { value: 'mdi:bookshelf', label: 'Library', icon: '📚' },
-  { value: 'mdi:baby-carriage', label: 'Nursery', icon: '👶' },
-  { value: 'mdi:gamepad-variant', label: 'Game Room', icon: '🎮' },
-]
+// The icon catalogue is its own chunk, fetched the first time a picker mounts
+let iconCatalog: Promise<IconOption[]> | undefined
+const loadIconCatalog = () =>
+  (iconCatalog ??= import('./iconCatalog').then((module) => module.COMMON_ICONS))
+
+const useIconCatalog = () => {
+  const [icons, setIcons] = useState<IconOption[]>([])
+
+  useEffect(() => {
+    let active = true
+    loadIconCatalog().then((loaded) => {
+      if (active) {
+        setIcons(loaded)
+      }
+    })
+    return () => {
+      active = false
+    }
+  }, [])
+
+  return icons
+}
 
 export const IconPicker: React.FC<IconPickerProps> = ({
   value,
@@ -39,18 +39,19 @@ export const IconPicker: React.FC<IconPickerProps> = ({
 }) => {
   const [isOpen, setIsOpen] = useState(false)
   const [search, setSearch] = useState('')
+  const icons = useIconCatalog()
 
   const filteredIcons = useMemo(() => {
-    if (!search) return COMMON_ICONS
+    if (!search) return icons
     const searchLower = search.toLowerCase()
-    return COMMON_ICONS.filter(
+    return icons.filter(
       (icon) =>
         icon.label.toLowerCase().includes(searchLower) ||
         (icon.value && icon.value.toLowerCase().includes(searchLower))
     )
-  }, [search])
+  }, [icons, search])
 
-  const selectedIcon = COMMON_ICONS.find((icon) => icon.value === value)
+  const selectedIcon = icons.find((icon) => icon.value === value)
 
   return (
     <div className="icon-picker">
@@ -0,0 +1,29 @@
+export interface IconOption {
+  value: string | null
+  label: string
+  icon: string
+}
+
+// Common Home Assistant / Material Design Icons for areas and floors
+export const COMMON_ICONS: IconOption[] = [
+  { value: null, label: 'No icon', icon: '○' },
+  { value: 'mdi:home', label: 'Home', icon: '🏠' },
+  { value: 'mdi:sofa', label: 'Living Room', icon: '🛋️' },
+  { value: 'mdi:bed', label: 'Bedroom', icon: '🛏️' },
+  { value: 'mdi:silverware-fork-knife', label: 'Kitchen', icon: '🍴' },
+  { value: 'mdi:shower', label: 'Bathroom', icon: '🚿' },
+  { value: 'mdi:desk', label: 'Office', icon: '🖥️' },
+  { value: 'mdi:dumbbell', label: 'Gym', icon: '🏋️' },
+  { value: 'mdi:tools', label: 'Garage/Workshop', icon: '🔧' },
+  { value: 'mdi:warehouse', label: 'Storage', icon: '📦' },
+  { value: 'mdi:hanger', label: 'Closet', icon: '👔' },
+  { value: 'mdi:floor-plan', label: 'Floor', icon: '🗂️' },
+  { value: 'mdi:stairs', label: 'Stairs', icon: '🪜' },
+  { value: 'mdi:walk', label: 'Hallway', icon: '🚶' },
+  { value: 'mdi:pine-tree', label: 'Outdoor', icon: '🌲' },
+  { value: 'mdi:flower', label: 'Garden', icon: '🌸' },
+  { value: 'mdi:washing-machine', label: 'Laundry', icon: '🧺' },
+  { value: 'mdi:bookshelf', label: 'Library', icon: '📚' },
+  { value: 'mdi:baby-carriage', label: 'Nursery', icon: '👶' },
+  { value: 'mdi:gamepad-variant', label: 'Game Room', icon: '🎮' },
+]
@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback } from 'react'
-import { useHassConnection } from './useHassConnection'
+import { useHassConnection, type RegistryDelta } from './useHassConnection'
 
 export interface Area {
   id: string
@@ -17,9 +17,40 @@ interface UseAreasReturn {
   createArea: (data: CreateAreaData) => Promise<Area>
   updateArea: (areaId: string, data: UpdateAreaData) => Promise<Area>
   deleteArea: (areaId: string) => Promise<void>
+  batchAreas: (
+    operations: AreaBatchOperation[],
+    options?: { atomic?: boolean }
+  ) => Promise<AreaBatchResult[]>
+  fetchAreaPage: (query: AreaQuery) => Promise<AreaPage>
+  matchAreas: (
+    rooms: string[],
+    options?: { limit?: number; min_score?: number }
+  ) => Promise<AreaMatch[]>
   refresh: () => Promise<void>
 }
 
+export interface AreaQuery {
+  floor_id?: string | null
+  label?: string
+  name_prefix?: string
+  sort?: 'name' | '-name' | 'floor'
+  limit?: number
+  cursor?: string | null
+  fields?: Array<'name' | 'icon' | 'floor_id' | 'labels' | 'aliases'>
+}
+
+export interface AreaPage {
+  areas: Array<Partial<Area> & { id: string }>
+  revision: number
+  total: number
+  next_cursor: string | null
+}
+
+export interface AreaMatch {
+  room: string
+  candidates: Array<{ area_id: string; name: string; matched: string; score: number }>
+}
+
 interface CreateAreaData {
   name: string
   icon?: string | null
@@ -36,12 +67,70 @@ interface UpdateAreaData {
   aliases?: string[]
 }
 
+export type AreaBatchOperation =
+  | ({ action: 'create' } & CreateAreaData)
+  | ({ action: 'update'; area_id: string } & UpdateAreaData)
+  | { action: 'delete'; area_id: string }
+
+export interface AreaBatchResult {
+  index: number
+  success: boolean
+  area?: Area
+  area_id?: string
+  error?: { code: string; message: string }
+}
+
+type AreasMessage = ({ areas: Area[] } | { not_modified: true } | RegistryDelta<Area>) & {
+  revision?: number
+}
+
+// Last list seen by any mounted view, so a remount can skip the snapshot
+let areasCache: { revision: number; areas: Area[] } | null = null
+
+const applyAreasMessage = (prev: Area[], message: AreasMessage): Area[] => {
+  if ('areas' in message) {
+    return message.areas
+  }
+  if ('not_modified' in message) {
+    return areasCache?.areas ?? prev
+  }
+
+  const removed = new Set(message.removed)
+  const changed = new Map(
+    [...message.added, ...message.updated].map((area) => [area.id, area])
+  )
+  const next = prev
+    .filter((area) => !removed.has(area.id))
+    .map((area) => {
+      const replacement = changed.get(area.id)
+      if (replacement) {
+        changed.delete(area.id)
+        return replacement
+      }
+      return area
+    })
+  return [...next, ...changed.values()]
+}
+
+const upsertArea = (prev: Area[], area: Area): Area[] =>
+  applyAreasMessage(prev, { added: [], updated: [area], removed: [] })
+
 export function useAreas(): UseAreasReturn {
   const connection = useHassConnection()
-  const [areas, setAreas] = useState<Area[]>([])
-  const [loading, setLoading] = useState(true)
+  const [areas, setAreas] = useState<Area[]>(() => areasCache?.areas ?? [])
+  const [loading, setLoading] = useState(areasCache === null)
   const [error, setError] = useState<string | null>(null)
 
+  const handleAreasMessage = useCallback((message: AreasMessage) => {
+    setAreas((prev) => {
+      const next = applyAreasMessage(prev, message)
+      if (message.revision !== undefined) {
+        areasCache = { revision: message.revision, areas: next }
+      }
+      return next
+    })
+  }, [])
+
   const loadAreas = useCallback(async () => {
     if (!connection) {
       return
@@ -51,11 +140,12 @@ export function useAreas(): UseAreasReturn {
       setLoading(true)
       setError(null)
 
-      const response = await connection.sendMessagePromise<{ areas: Area[] }>({
+      const response = await connection.sendMessagePromise<AreasMessage>({
         type: 'nidia_magic_composer/areas/list',
+        known_revision: areasCache?.revision,
       })
 
-      setAreas(response.areas)
+      handleAreasMessage(response)
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to load areas'
       setError(errorMessage)
@@ -63,11 +153,45 @@ export function useAreas(): UseAreasReturn {
     } finally {
       setLoading(false)
     }
-  }, [connection])
+  }, [connection, handleAreasMessage])
 
   useEffect(() => {
-    loadAreas()
-  }, [loadAreas])
+    if (!connection) {
+      return
+    }
+
+    let unsubscribe: (() => Promise<void>) | null = null
+    let isActive = true
+
+    // One snapshot, then only the entries that changed
+    connection
+      .subscribeMessage<AreasMessage>(
+        (message) => {
+          setLoading(false)
+          handleAreasMessage(message)
+        },
+        {
+          type: 'nidia_magic_composer/areas/subscribe',
+          known_revision: areasCache?.revision,
+        }
+      )
+      .then((unsub) => {
+        if (isActive) {
+          unsubscribe = unsub
+        } else {
+          unsub()
+        }
+      })
+      .catch((err) => {
+        console.error('Failed to subscribe to areas, falling back to a one-off list:', err)
+        loadAreas()
+      })
+
+    return () => {
+      isActive = false
+      unsubscribe?.()
+    }
+  }, [connection, loadAreas, handleAreasMessage])
 
   const createArea = useCallback(
     async (data: CreateAreaData): Promise<Area> => {
@@ -86,7 +210,7 @@ export function useAreas(): UseAreasReturn {
         })
 
         // Optimistically update the areas list
-        setAreas((prev) => [...prev, response.area])
+        setAreas((prev) => upsertArea(prev, response.area))
         return response.area
       } catch (err) {
         const errorMessage = err instanceof Error ? err.message : 'Failed to create area'
@@ -111,7 +235,7 @@ export function useAreas(): UseAreasReturn {
         })
 
         // Optimistically update the areas list
-        setAreas((prev) => prev.map((area) => (area.id === areaId ? response.area : area)))
+        setAreas((prev) => upsertArea(prev, response.area))
         return response.area
       } catch (err) {
         const errorMessage = err instanceof Error ? err.message : 'Failed to update area'
@@ -145,6 +269,90 @@ export function useAreas(): UseAreasReturn {
     [connection]
   )
 
+  const batchAreas = useCallback(
+    async (
+      operations: AreaBatchOperation[],
+      options: { atomic?: boolean } = {}
+    ): Promise<AreaBatchResult[]> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      try {
+        const response = await connection.sendMessagePromise<{
+          applied: boolean
+          results: AreaBatchResult[]
+        }>({
+          type: 'nidia_magic_composer/areas/batch',
+          operations,
+          atomic: options.atomic ?? false,
+        })
+
+        if (response.applied) {
+          // Apply every successful operation to the local list in one update
+          setAreas((prev) => {
+            const byId = new Map(prev.map((area) => [area.id, area]))
+            response.results.forEach((result, index) => {
+              if (!result.success) {
+                return
+              }
+              const operation = operations[index]
+              if (operation.action === 'delete') {
+                byId.delete(operation.area_id)
+              } else if (result.area) {
+                byId.set(result.area.id, result.area)
+              }
+            })
+            return Array.from(byId.values())
+          })
+        }
+
+        return response.results
+      } catch (err) {
+        const errorMessage = err instanceof Error ? err.message : 'Failed to apply area batch'
+        setError(errorMessage)
+        throw new Error(errorMessage)
+      }
+    },
+    [connection]
+  )
+
+  const fetchAreaPage = useCallback(
+    async (query: AreaQuery): Promise<AreaPage> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      return connection.sendMessagePromise<AreaPage>({
+        type: 'nidia_magic_composer/areas/list',
+        ...query,
+      })
+    },
+    [connection]
+  )
+
+  const matchAreas = useCallback(
+    async (
+      rooms: string[],
+      options: { limit?: number; min_score?: number } = {}
+    ): Promise<AreaMatch[]> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      const response = await connection.sendMessagePromise<{
+        matches: AreaMatch[]
+        revision: number
+      }>({
+        type: 'nidia_magic_composer/areas/match',
+        rooms,
+        ...options,
+      })
+      return response.matches
+    },
+    [connection]
+  )
+
   return {
     areas,
     loading,
@@ -152,6 +360,9 @@ export function useAreas(): UseAreasReturn {
     createArea,
     updateArea,
     deleteArea,
+    batchAreas,
+    fetchAreaPage,
+    matchAreas,
     refresh: loadAreas,
   }
 }
@@ -0,0 +1,68 @@
+import { useState, useCallback } from 'react'
+import { useHassConnection } from './useHassConnection'
+
+export interface DeviceAssignment {
+  kind: 'device' | 'entity'
+  id: string
+  area_id: string | null
+}
+
+export interface DeviceAssignmentResult {
+  index: number
+  success: boolean
+  changed?: boolean
+  previous_area_id?: string | null
+  error?: { code: string; message: string }
+}
+
+interface UseDeviceAssignmentsReturn {
+  assigning: boolean
+  error: string | null
+  assignBulk: (
+    assignments: DeviceAssignment[],
+    options?: { atomic?: boolean }
+  ) => Promise<DeviceAssignmentResult[]>
+}
+
+/**
+ * Move devices and entities into areas through devices/assign_bulk.
+ */
+export function useDeviceAssignments(): UseDeviceAssignmentsReturn {
+  const connection = useHassConnection()
+  const [assigning, setAssigning] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+
+  const assignBulk = useCallback(
+    async (
+      assignments: DeviceAssignment[],
+      options: { atomic?: boolean } = {}
+    ): Promise<DeviceAssignmentResult[]> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      setAssigning(true)
+      try {
+        const response = await connection.sendMessagePromise<{
+          applied: number
+          results: DeviceAssignmentResult[]
+        }>({
+          type: 'nidia_magic_composer/devices/assign_bulk',
+          assignments,
+          atomic: options.atomic ?? false,
+        })
+        setError(null)
+        return response.results
+      } catch (err) {
+        const errorMessage = err instanceof Error ? err.message : 'Failed to assign devices'
+        setError(errorMessage)
+        throw new Error(errorMessage)
+      } finally {
+        setAssigning(false)
+      }
+    },
+    [connection]
+  )
+
+  return { assigning, error, assignBulk }
+}
@@ -0,0 +1,115 @@
+import { useEffect, useRef, useState } from 'react'
+import { createPatch } from '../state/jsonPatch'
+import { useHassConnection } from './useHassConnection'
+
+// Autosave once edits pause for this long
+const AUTOSAVE_DELAY = 800
+
+interface DraftResponse<T> {
+  draft: T | null
+  revision: number
+  updated_at: string | null
+}
+
+interface SyncedDraft<T> {
+  revision: number
+  draft: T | null
+}
+
+const isRevisionMismatch = (err: unknown) =>
+  typeof err === 'object' && err !== null && (err as { code?: string }).code === 'revision_mismatch'
+
+/**
+ * Mirror the wizard state to the server-side draft.
+ *
+ * The saved draft is restored once on connect; after that only JSON-patch
+ * deltas against the last saved revision are sent. If another tab saved in
+ * the meantime the draft is refetched and the delta recomputed against it.
+ */
+export function useDraftSync<T>(state: T, restore: (draft: T) => void): { saving: boolean } {
+  const connection = useHassConnection()
+  const synced = useRef<SyncedDraft<T> | null>(null)
+  const queue = useRef<Promise<void>>(Promise.resolve())
+  const [ready, setReady] = useState(false)
+  const [saving, setSaving] = useState(false)
+
+  useEffect(() => {
+    if (!connection) {
+      return
+    }
+
+    let isActive = true
+    connection
+      .sendMessagePromise<DraftResponse<T>>({ type: 'nidia_magic_composer/draft/get' })
+      .then((response) => {
+        if (!isActive) {
+          return
+        }
+        synced.current = { revision: response.revision, draft: response.draft }
+        if (response.draft) {
+          restore(response.draft)
+        }
+        setReady(true)
+      })
+      .catch((err) => {
+        console.error('Failed to load the wizard draft:', err)
+      })
+
+    return () => {
+      isActive = false
+    }
+  }, [connection, restore])
+
+  useEffect(() => {
+    if (!connection || !ready) {
+      return
+    }
+
+    const sendPatch = async (base: SyncedDraft<T>) => {
+      const patch = createPatch(base.draft, state)
+      if (patch.length === 0) {
+        synced.current = base
+        return
+      }
+      const { revision } = await connection.sendMessagePromise<{ revision: number }>({
+        type: 'nidia_magic_composer/draft/patch',
+        revision: base.revision,
+        patch,
+      })
+      synced.current = { revision, draft: state }
+    }
+
+    const save = async () => {
+      if (!synced.current) {
+        return
+      }
+      setSaving(true)
+      try {
+        await sendPatch(synced.current)
+      } catch (err) {
+        if (!isRevisionMismatch(err)) {
+          throw err
+        }
+        const latest = await connection.sendMessagePromise<DraftResponse<T>>({
+          type: 'nidia_magic_composer/draft/get',
+        })
+        await sendPatch({ revision: latest.revision, draft: latest.draft })
+      } finally {
+        setSaving(false)
+      }
+    }
+
+    const timer = window.setTimeout(() => {
+      // Saves run one at a time so each patch is based on the previous result
+      queue.current = queue.current.then(save).catch((err) => {
+        console.error('Failed to save the wizard draft:', err)
+      })
+    }, AUTOSAVE_DELAY)
+
+    return () => {
+      window.clearTimeout(timer)
+    }
+  }, [connection, ready, state])
+
+  return { saving }
+}
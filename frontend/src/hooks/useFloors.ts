@@ -1,5 +1,5 @@
 import { useState, useEffect, useCallback } from 'react'
-import { useHassConnection } from './useHassConnection'
+import { useHassConnection, type RegistryDelta } from './useHassConnection'
 
 export interface Floor {
   floor_id: string
@@ -33,12 +33,57 @@ interface UpdateFloorData {
   aliases?: string[]
 }
 
+type FloorsMessage = ({ floors: Floor[] } | { not_modified: true } | RegistryDelta<Floor>) & {
+  revision?: number
+}
+
+// Last list seen by any mounted view, so a remount can skip the snapshot
+let floorsCache: { revision: number; floors: Floor[] } | null = null
+
+const applyFloorsMessage = (prev: Floor[], message: FloorsMessage): Floor[] => {
+  if ('floors' in message) {
+    return message.floors
+  }
+  if ('not_modified' in message) {
+    return floorsCache?.floors ?? prev
+  }
+
+  const removed = new Set(message.removed)
+  const changed = new Map(
+    [...message.added, ...message.updated].map((floor) => [floor.floor_id, floor])
+  )
+  const next = prev
+    .filter((floor) => !removed.has(floor.floor_id))
+    .map((floor) => {
+      const replacement = changed.get(floor.floor_id)
+      if (replacement) {
+        changed.delete(floor.floor_id)
+        return replacement
+      }
+      return floor
+    })
+  return [...next, ...changed.values()]
+}
+
+const upsertFloor = (prev: Floor[], floor: Floor): Floor[] =>
+  applyFloorsMessage(prev, { added: [], updated: [floor], removed: [] })
+
 export function useFloors(): UseFloorsReturn {
   const connection = useHassConnection()
-  const [floors, setFloors] = useState<Floor[]>([])
-  const [loading, setLoading] = useState(true)
+  const [floors, setFloors] = useState<Floor[]>(() => floorsCache?.floors ?? [])
+  const [loading, setLoading] = useState(floorsCache === null)
   const [error, setError] = useState<string | null>(null)
 
+  const handleFloorsMessage = useCallback((message: FloorsMessage) => {
+    setFloors((prev) => {
+      const next = applyFloorsMessage(prev, message)
+      if (message.revision !== undefined) {
+        floorsCache = { revision: message.revision, floors: next }
+      }
+      return next
+    })
+  }, [])
+
   const loadFloors = useCallback(async () => {
     if (!connection) {
       return
@@ -48,11 +93,12 @@ export function useFloors(): UseFloorsReturn {
       setLoading(true)
       setError(null)
 
-      const response = await connection.sendMessagePromise<{ floors: Floor[] }>({
+      const response = await connection.sendMessagePromise<FloorsMessage>({
         type: 'nidia_magic_composer/floors/list',
+        known_revision: floorsCache?.revision,
       })
 
-      setFloors(response.floors)
+      handleFloorsMessage(response)
     } catch (err) {
       const errorMessage = err instanceof Error ? err.message : 'Failed to load floors'
       setError(errorMessage)
@@ -60,11 +106,45 @@ export function useFloors(): UseFloorsReturn {
     } finally {
       setLoading(false)
     }
-  }, [connection])
+  }, [connection, handleFloorsMessage])
 
   useEffect(() => {
-    loadFloors()
-  }, [loadFloors])
+    if (!connection) {
+      return
+    }
+
+    let unsubscribe: (() => Promise<void>) | null = null
+    let isActive = true
+
+    // One snapshot, then only the entries that changed
+    connection
+      .subscribeMessage<FloorsMessage>(
+        (message) => {
+          setLoading(false)
+          handleFloorsMessage(message)
+        },
+        {
+          type: 'nidia_magic_composer/floors/subscribe',
+          known_revision: floorsCache?.revision,
+        }
+      )
+      .then((unsub) => {
+        if (isActive) {
+          unsubscribe = unsub
+        } else {
+          unsub()
+        }
+      })
+      .catch((err) => {
+        console.error('Failed to subscribe to floors, falling back to a one-off list:', err)
+        loadFloors()
+      })
+
+    return () => {
+      isActive = false
+      unsubscribe?.()
+    }
+  }, [connection, loadFloors, handleFloorsMessage])
 
   const createFloor = useCallback(
     async (data: CreateFloorData): Promise<Floor> => {
@@ -82,7 +162,7 @@ export function useFloors(): UseFloorsReturn {
         })
 
         // Optimistically update the floors list
-        setFloors((prev) => [...prev, response.floor])
+        setFloors((prev) => upsertFloor(prev, response.floor))
         return response.floor
       } catch (err) {
         const errorMessage = err instanceof Error ? err.message : 'Failed to create floor'
@@ -107,9 +187,7 @@ export function useFloors(): UseFloorsReturn {
         })
 
         // Optimistically update the floors list
-        setFloors((prev) =>
-          prev.map((floor) => (floor.floor_id === floorId ? response.floor : floor))
-        )
+        setFloors((prev) => upsertFloor(prev, response.floor))
         return response.floor
       } catch (err) {
         const errorMessage = err instanceof Error ? err.message : 'Failed to update floor'
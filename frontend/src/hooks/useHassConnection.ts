@@ -2,6 +2,16 @@ import { useEffect, useState } from 'react'
 
 export interface HassConnection {
   sendMessagePromise<T>(message: Record<string, unknown>): Promise<T>
+  subscribeMessage<T>(
+    callback: (message: T) => void,
+    message: Record<string, unknown>
+  ): Promise<() => Promise<void>>
+}
+
+export interface RegistryDelta<T> {
+  added: T[]
+  updated: T[]
+  removed: string[]
 }
 
 declare global {
@@ -0,0 +1,136 @@
+import { useState, useCallback } from 'react'
+import { useHassConnection } from './useHassConnection'
+
+// Bytes of the NDJSON file read and sent per layout/import message
+const IMPORT_CHUNK_BYTES = 256 * 1024
+
+type ExportEvent = { seq: number; data: string } | { done: true; chunks: number; records: number }
+
+export interface LayoutImportResult {
+  import_id: string
+  next_seq: number
+  records: number
+  floors_created: number
+  floors_updated: number
+  areas_created: number
+  areas_updated: number
+  failed: number
+  errors: Array<{ line: number; code: string; message: string }>
+  done: boolean
+}
+
+interface UseLayoutTransferReturn {
+  busy: boolean
+  error: string | null
+  exportLayout: (options?: { includeProfile?: boolean }) => Promise<Blob>
+  importLayout: (
+    file: Blob,
+    onProgress?: (result: LayoutImportResult, sentBytes: number) => void
+  ) => Promise<LayoutImportResult>
+}
+
+/**
+ * Export and import the home layout as NDJSON through layout/export and
+ * layout/import. Both directions move the file in chunks; an import sends
+ * the next chunk only once the previous one has been applied.
+ */
+export function useLayoutTransfer(): UseLayoutTransferReturn {
+  const connection = useHassConnection()
+  const [busy, setBusy] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+
+  const exportLayout = useCallback(
+    async (options: { includeProfile?: boolean } = {}): Promise<Blob> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      setBusy(true)
+      const parts: string[] = []
+      let finish: () => void = () => undefined
+      const finished = new Promise<void>((resolve) => {
+        finish = resolve
+      })
+      const subscription = connection.subscribeMessage<ExportEvent>(
+        (event) => {
+          if ('done' in event) {
+            finish()
+          } else {
+            parts.push(event.data)
+          }
+        },
+        {
+          type: 'nidia_magic_composer/layout/export',
+          include_profile: options.includeProfile ?? true,
+        }
+      )
+
+      try {
+        await subscription
+        await finished
+        setError(null)
+        return new Blob(parts, { type: 'application/x-ndjson' })
+      } catch (err) {
+        const errorMessage = err instanceof Error ? err.message : 'Failed to export the layout'
+        setError(errorMessage)
+        throw new Error(errorMessage)
+      } finally {
+        subscription.then((unsubscribe) => unsubscribe()).catch(() => undefined)
+        setBusy(false)
+      }
+    },
+    [connection]
+  )
+
+  const importLayout = useCallback(
+    async (
+      file: Blob,
+      onProgress?: (result: LayoutImportResult, sentBytes: number) => void
+    ): Promise<LayoutImportResult> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+
+      setBusy(true)
+      try {
+        // Streaming decode keeps multi-byte characters split across chunks intact
+        const decoder = new TextDecoder()
+        let importId: string | undefined
+        let result: LayoutImportResult | null = null
+        let seq = 0
+        let offset = 0
+
+        do {
+          const end = Math.min(offset + IMPORT_CHUNK_BYTES, file.size)
+          const final = end >= file.size
+          const buffer = await file.slice(offset, end).arrayBuffer()
+          const data = decoder.decode(buffer, { stream: !final })
+
+          result = await connection.sendMessagePromise<LayoutImportResult>({
+            type: 'nidia_magic_composer/layout/import',
+            ...(importId ? { import_id: importId } : {}),
+            seq,
+            data,
+            final,
+          })
+          importId = result.import_id
+          seq += 1
+          offset = end
+          onProgress?.(result, offset)
+        } while (offset < file.size)
+
+        setError(null)
+        return result
+      } catch (err) {
+        const errorMessage = err instanceof Error ? err.message : 'Failed to import the layout'
+        setError(errorMessage)
+        throw new Error(errorMessage)
+      } finally {
+        setBusy(false)
+      }
+    },
+    [connection]
+  )
+
+  return { busy, error, exportLayout, importLayout }
+}
@@ -0,0 +1,113 @@
+import { useState, useCallback, useEffect } from 'react'
+import { useHassConnection } from './useHassConnection'
+
+export interface SnapshotMeta {
+  snapshot_id: string
+  created_at: string
+  label: string | null
+  changeset_id: string | null
+  root: string
+  floors: number
+  areas: number
+  helpers: number
+}
+
+export interface SnapshotChange<T = Record<string, unknown>> {
+  id: string
+  change: 'added' | 'removed' | 'modified'
+  before: T | null
+  after: T | null
+}
+
+export interface SnapshotDiff {
+  from: string
+  to: string | null
+  changed: boolean
+  compared: number
+  floors: SnapshotChange[]
+  areas: SnapshotChange[]
+  helpers: SnapshotChange[]
+}
+
+interface UseSnapshotsReturn {
+  diff: SnapshotDiff | null
+  loading: boolean
+  error: string | null
+  createSnapshot: (label?: string) => Promise<SnapshotMeta>
+  listSnapshots: () => Promise<SnapshotMeta[]>
+  diffSnapshots: (fromSnapshotId?: string, toSnapshotId?: string) => Promise<SnapshotDiff | null>
+}
+
+/**
+ * Registry snapshots and their Merkle diffs. The diff of the snapshot taken at
+ * the last wizard apply against the live registries is loaded on connect.
+ */
+export function useSnapshots(): UseSnapshotsReturn {
+  const connection = useHassConnection()
+  const [diff, setDiff] = useState<SnapshotDiff | null>(null)
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+
+  const createSnapshot = useCallback(
+    async (label?: string): Promise<SnapshotMeta> => {
+      if (!connection) {
+        throw new Error('No connection to Home Assistant')
+      }
+      const response = await connection.sendMessagePromise<{ snapshot: SnapshotMeta }>({
+        type: 'nidia_magic_composer/snapshot/create',
+        label,
+      })
+      return response.snapshot
+    },
+    [connection]
+  )
+
+  const listSnapshots = useCallback(async (): Promise<SnapshotMeta[]> => {
+    if (!connection) {
+      throw new Error('No connection to Home Assistant')
+    }
+    const response = await connection.sendMessagePromise<{ snapshots: SnapshotMeta[] }>({
+      type: 'nidia_magic_composer/snapshot/list',
+    })
+    return response.snapshots
+  }, [connection])
+
+  const diffSnapshots = useCallback(
+    async (fromSnapshotId?: string, toSnapshotId?: string): Promise<SnapshotDiff | null> => {
+      if (!connection) {
+        return null
+      }
+
+      setLoading(true)
+      try {
+        const response = await connection.sendMessagePromise<SnapshotDiff>({
+          type: 'nidia_magic_composer/snapshot/diff',
+          ...(fromSnapshotId ? { from_snapshot_id: fromSnapshotId } : {}),
+          ...(toSnapshotId ? { to_snapshot_id: toSnapshotId } : {}),
+        })
+        setDiff(response)
+        setError(null)
+        return response
+      } catch (err) {
+        // Nothing applied yet: there is no baseline to compare with
+        if ((err as { code?: string }).code === 'not_found') {
+          setDiff(null)
+          setError(null)
+          return null
+        }
+        const errorMessage = err instanceof Error ? err.message : 'Failed to compare snapshots'
+        setError(errorMessage)
+        return null
+      } finally {
+        setLoading(false)
+      }
+    },
+    [connection]
+  )
+
+  useEffect(() => {
+    diffSnapshots()
+  }, [diffSnapshots])
+
+  return { diff, loading, error, createSnapshot, listSnapshots, diffSnapshots }
+}
@@ -1,4 +1,5 @@
 import { createContext, useCallback, useMemo, useState, type ReactNode } from 'react'
+import { useDraftSync } from '../hooks/useDraftSync'
 
 type EnergyMode = 'balanced' | 'eco' | 'comfort'
 
@@ -30,12 +31,27 @@ export type MapState = {
   notes: string
 }
 
+export type HelperDomain =
+  | 'counter'
+  | 'input_boolean'
+  | 'input_button'
+  | 'input_datetime'
+  | 'input_number'
+  | 'input_select'
+  | 'input_text'
+  | 'timer'
+
 export type HelperDefinition = {
   id: string
   name: string
   description: string
   category: string
   enabled: boolean
+  // Defaults to input_boolean; config holds domain fields such as min/max
+  domain?: HelperDomain
+  config?: Record<string, unknown>
+  // Create one helper per room, named "<room> <name>"
+  perRoom?: boolean
 }
 
 export type DashboardWidget = {
@@ -68,6 +84,7 @@ export type WizardState = {
 
 type WizardContextValue = {
   state: WizardState
+  draftSaving: boolean
   dashboardTemplates: DashboardTemplate[]
   updateProfile: (patch: Partial<ProfileSettings>) => void
   addRoom: (room: Omit<RoomDefinition, 'id'>) => void
@@ -217,6 +234,12 @@ type WizardProviderProps = {
 export const WizardProvider = ({ children }: WizardProviderProps) => {
   const [state, setState] = useState<WizardState>(initialState)
 
+  // Fields added since the draft was saved keep their initial values
+  const restoreDraft = useCallback((draft: WizardState) => {
+    setState({ ...initialState, ...draft })
+  }, [])
+  const { saving: draftSaving } = useDraftSync(state, restoreDraft)
+
   const updateProfile = useCallback((patch: Partial<ProfileSettings>) => {
     setState((prev) => ({
       ...prev,
@@ -319,6 +342,7 @@ export const WizardProvider = ({ children }: WizardProviderProps) => {
   const value = useMemo(
     () => ({
       state,
+      draftSaving,
       dashboardTemplates: DASHBOARD_TEMPLATES,
       updateProfile,
       addRoom,
@@ -332,6 +356,7 @@ export const WizardProvider = ({ children }: WizardProviderProps) => {
     }),
     [
       state,
+      draftSaving,
       updateProfile,
       addRoom,
       updateRoom,
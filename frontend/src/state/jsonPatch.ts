@@ -0,0 +1,84 @@
+export type JsonPatchOperation =
+  | { op: 'add' | 'replace'; path: string; value: unknown }
+  | { op: 'remove'; path: string }
+
+const escapeToken = (token: string) => token.replace(/~/g, '~0').replace(/\//g, '~1')
+
+const isPlainObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value)
+
+/**
+ * Build the RFC 6902 patch that turns `prev` into `next`.
+ *
+ * State updates are immutable, so subtrees that did not change are the same
+ * object in both versions and are skipped without being walked. Arrays are
+ * trimmed of their unchanged head and tail first, so adding or removing one
+ * room yields one operation rather than shifting every room after it.
+ */
+export function createPatch(prev: unknown, next: unknown): JsonPatchOperation[] {
+  const operations: JsonPatchOperation[] = []
+  diff(prev, next, '', operations)
+  return operations
+}
+
+function diff(prev: unknown, next: unknown, path: string, operations: JsonPatchOperation[]) {
+  if (prev === next) {
+    return
+  }
+  if (Array.isArray(prev) && Array.isArray(next)) {
+    diffArray(prev, next, path, operations)
+  } else if (isPlainObject(prev) && isPlainObject(next)) {
+    diffObject(prev, next, path, operations)
+  } else {
+    operations.push({ op: 'replace', path, value: next })
+  }
+}
+
+function diffObject(
+  prev: Record<string, unknown>,
+  next: Record<string, unknown>,
+  path: string,
+  operations: JsonPatchOperation[],
+) {
+  for (const key of Object.keys(prev)) {
+    if (prev[key] !== undefined && next[key] === undefined) {
+      operations.push({ op: 'remove', path: `${path}/${escapeToken(key)}` })
+    }
+  }
+  for (const [key, value] of Object.entries(next)) {
+    if (value === undefined) {
+      continue
+    }
+    const childPath = `${path}/${escapeToken(key)}`
+    if (prev[key] === undefined) {
+      operations.push({ op: 'add', path: childPath, value })
+    } else {
+      diff(prev[key], value, childPath, operations)
+    }
+  }
+}
+
+function diffArray(prev: unknown[], next: unknown[], path: string, operations: JsonPatchOperation[]) {
+  let start = 0
+  while (start < prev.length && start < next.length && prev[start] === next[start]) {
+    start += 1
+  }
+  let prevEnd = prev.length
+  let nextEnd = next.length
+  while (prevEnd > start && nextEnd > start && prev[prevEnd - 1] === next[nextEnd - 1]) {
+    prevEnd -= 1
+    nextEnd -= 1
+  }
+
+  const common = Math.min(prevEnd, nextEnd) - start
+  for (let index = start; index < start + common; index += 1) {
+    diff(prev[index], next[index], `${path}/${index}`, operations)
+  }
+  // Remove from the end so earlier indexes stay valid
+  for (let index = prevEnd - 1; index >= start + common; index -= 1) {
+    operations.push({ op: 'remove', path: `${path}/${index}` })
+  }
+  for (let index = start + common; index < nextEnd; index += 1) {
+    operations.push({ op: 'add', path: `${path}/${index}`, value: next[index] })
+  }
+}
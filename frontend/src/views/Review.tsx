@@ -1,8 +1,16 @@
 import { useMemo } from 'react'
+import { useSnapshots, type SnapshotChange } from '../hooks/useSnapshots'
 import { useWizard } from '../hooks/useWizard'
 
+const describeChange = (change: SnapshotChange) => {
+  const record = change.after ?? change.before
+  const name = typeof record?.name === 'string' ? record.name : change.id
+  return `${name} ${change.change}`
+}
+
 const Review = () => {
   const { state } = useWizard()
+  const { diff: drift, loading: driftLoading, diffSnapshots } = useSnapshots()
   const { profile, rooms, map, helpers, dashboards } = state
 
   const pendingItems = useMemo(() => {
@@ -99,6 +107,49 @@ const Review = () => {
         </div>
       </section>
 
+      {drift && (
+        <section className="card">
+          <header className="card-header">
+            <h3>Changes since last apply</h3>
+            <p>Floors, areas and Magic Composer helpers edited in Home Assistant after the last publish.</p>
+          </header>
+
+          <div className="card-body">
+            {drift.changed ? (
+              <div className="review-grid">
+                {(['floors', 'areas', 'helpers'] as const)
+                  .filter((kind) => drift[kind].length > 0)
+                  .map((kind) => (
+                    <div key={kind} className="review-item">
+                      <h4>
+                        {drift[kind].length} {kind} changed
+                      </h4>
+                      <p className="form-helper">
+                        {drift[kind].slice(0, 5).map(describeChange).join(', ')}
+                        {drift[kind].length > 5 ? ` +${drift[kind].length - 5} more` : ''}
+                      </p>
+                    </div>
+                  ))}
+              </div>
+            ) : (
+              <div className="empty-state">
+                <p>Nothing changed since the last publish.</p>
+              </div>
+            )}
+            <div className="cta-row">
+              <button
+                type="button"
+                className="secondary"
+                disabled={driftLoading}
+                onClick={() => diffSnapshots()}
+              >
+                Check again
+              </button>
+            </div>
+          </div>
+        </section>
+      )}
+
       <section className="card">
         <header className="card-header">
           <h3>Next actions</h3>
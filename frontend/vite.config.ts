@@ -1,10 +1,68 @@
-import { defineConfig } from 'vite'
+import { defineConfig, type Plugin } from 'vite'
 import react from '@vitejs/plugin-react'
 import { resolve } from 'path'
+import { brotliCompressSync, constants as zlibConstants, gzipSync } from 'zlib'
+
+const PANEL_MANIFEST = 'manifest.json'
+const COMPRESSIBLE = /\.(js|css|html|svg|json)$/
+// Below this size the compressed variant is not worth an extra file
+const MIN_COMPRESS_BYTES = 1024
+
+/**
+ * Emit gzip and brotli variants next to every compressible asset, plus a
+ * manifest naming the hashed entry bundle. The integration reads the manifest
+ * to build the panel's module_url, and Home Assistant's static file handler
+ * serves the precompressed variant when the browser accepts it.
+ */
+function precompressedAssets(): Plugin {
+  return {
+    name: 'nidia-precompressed-assets',
+    apply: 'build',
+    generateBundle(_options, bundle) {
+      let entry: string | undefined
+      const files: Record<string, { bytes: number; gzip: number; br: number }> = {}
+
+      for (const [fileName, output] of Object.entries(bundle)) {
+        if (output.type === 'chunk' && output.isEntry) {
+          entry = fileName
+        }
+        if (!COMPRESSIBLE.test(fileName)) {
+          continue
+        }
+        const source = Buffer.from(output.type === 'chunk' ? output.code : output.source)
+        if (source.length < MIN_COMPRESS_BYTES) {
+          continue
+        }
+        const gzip = gzipSync(source, { level: 9 })
+        const br = brotliCompressSync(source, {
+          params: {
+            [zlibConstants.BROTLI_PARAM_QUALITY]: zlibConstants.BROTLI_MAX_QUALITY,
+            [zlibConstants.BROTLI_PARAM_SIZE_HINT]: source.length,
+          },
+        })
+        this.emitFile({ type: 'asset', fileName: `${fileName}.gz`, source: gzip })
+        this.emitFile({ type: 'asset', fileName: `${fileName}.br`, source: br })
+        files[fileName] = { bytes: source.length, gzip: gzip.length, br: br.length }
+      }
+
+      if (!entry) {
+        this.error('No entry chunk found for the panel manifest')
+      }
+      this.emitFile({
+        type: 'asset',
+        fileName: PANEL_MANIFEST,
+        source: JSON.stringify({ entry, files }, null, 2),
+      })
+    },
+  }
+}
 
 // https://vitejs.dev/config/
 export default defineConfig({
-  plugins: [react()],
+  plugins: [react(), precompressedAssets()],
+  // Chunks and their CSS are fetched relative to the entry module, which Home
+  // Assistant serves from the integration's static path, not the site root
+  base: './',
   resolve: {
     alias: {
       '@': resolve(__dirname, './src'),
@@ -15,9 +73,14 @@ export default defineConfig({
     emptyOutDir: true,
     rollupOptions: {
       output: {
-        entryFileNames: 'index.js',
+        // Content-hashed names let every file be cached indefinitely
+        entryFileNames: 'index-[hash].js',
         chunkFileNames: 'chunks/[name]-[hash].js',
         assetFileNames: 'assets/[name]-[hash].[ext]',
+        // React changes less often than the app; keep it cached across releases
+        manualChunks: {
+          vendor: ['react', 'react-dom', 'react-router-dom'],
+        },
       },
     },
   },
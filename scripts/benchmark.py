@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""Benchmark the Nidia Magic Composer WebSocket handlers at scale.
+
+Builds synthetic area and floor registries of increasing size in a throwaway
+config directory and times the handlers the panel relies on. Handlers are
+called directly with a stand-in connection, so the numbers cover handler and
+registry cost only, not the network. Results are written as JSON so runs can
+be compared between releases.
+
+Requires Home Assistant in the active environment:
+
+    python scripts/benchmark.py --sizes 100 1000 --output bench.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any
+
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    floor_registry as fr,
+    label_registry as lr,
+)
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# pylint: disable=wrong-import-position
+from custom_components.nidia_magic_composer import websocket as wizard_ws  # noqa: E402
+from custom_components.nidia_magic_composer import websocket_api as ws  # noqa: E402
+from custom_components.nidia_magic_composer.const import (  # noqa: E402
+    VERSION,
+    WS_TYPE_AREAS_CREATE,
+    WS_TYPE_AREAS_LIST,
+    WS_TYPE_AREAS_UPDATE,
+    WS_TYPE_FLOORS_DELETE,
+    WS_TYPE_WIZARD_APPLY,
+    WS_TYPE_WIZARD_PREVIEW,
+)
+from custom_components.nidia_magic_composer.registry_index import (  # noqa: E402
+    async_setup_registry_index,
+)
+from custom_components.nidia_magic_composer.store import (  # noqa: E402
+    async_get_changeset_store,
+)
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 50_000)
+DEFAULT_ITERATIONS = 200
+FLOORS_PER_AREA = 25
+ROOMS_PER_APPLY = 20
+
+Handler = Callable[[HomeAssistant, Any, dict[str, Any]], Any]
+
+
+class BenchConnection:
+    """Stand-in for ``ActiveConnection`` that records what a handler sends."""
+
+    def __init__(self) -> None:
+        """Initialize the connection."""
+        self.subscriptions: dict[int, Callable[[], None]] = {}
+        self.bytes_sent = 0
+        self.errors: list[tuple[int, str, str]] = []
+
+    def send_message(self, message: bytes | str | dict[str, Any]) -> None:
+        """Count the size of a message."""
+        if isinstance(message, dict):
+            message = json.dumps(message, default=str)
+        self.bytes_sent += len(message)
+
+    def send_result(self, msg_id: int, result: Any | None = None) -> None:
+        """Record a result message."""
+        self.send_message({"id": msg_id, "type": "result", "result": result})
+
+    def send_error(self, msg_id: int, code: str, message: str) -> None:
+        """Record an error message."""
+        self.errors.append((msg_id, code, message))
+
+
+class HandlerCaller:
+    """Validate messages and run handlers the way the WebSocket API does."""
+
+    def __init__(self, hass: HomeAssistant, connection: BenchConnection) -> None:
+        """Initialize the caller."""
+        self.hass = hass
+        self.connection = connection
+        self._msg_id = 0
+
+    async def __call__(self, handler: Handler, message: dict[str, Any]) -> None:
+        """Run one command to completion."""
+        self._msg_id += 1
+        msg = handler._ws_schema({"id": self._msg_id, **message})  # noqa: SLF001
+        # Await ``async_response`` handlers instead of scheduling a task
+        result = getattr(handler, "__wrapped__", handler)(self.hass, self.connection, msg)
+        if asyncio.iscoroutine(result):
+            await result
+
+
+def _percentiles(samples: list[float]) -> dict[str, float]:
+    """Summarize latencies in milliseconds."""
+    ordered = sorted(samples)
+
+    def pick(fraction: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 4)
+
+    return {
+        "min": round(ordered[0], 4),
+        "p50": pick(0.50),
+        "p90": pick(0.90),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 4),
+        "mean": round(statistics.fmean(ordered), 4),
+    }
+
+
+async def _measure(
+    name: str,
+    iterations: int,
+    run: Callable[[int], Awaitable[None]],
+    connection: BenchConnection,
+) -> dict[str, Any]:
+    """Time ``run`` for each iteration, then measure its allocations."""
+    samples: list[float] = []
+    bytes_before = connection.bytes_sent
+    errors_before = len(connection.errors)
+    for iteration in range(iterations):
+        start = time.perf_counter_ns()
+        await run(iteration)
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+    bytes_sent = connection.bytes_sent - bytes_before
+
+    # Allocations are sampled on a separate, shorter pass; tracing skews timing
+    traced = max(1, iterations // 10)
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    for iteration in range(iterations, iterations + traced):
+        await run(iteration)
+    _, peak = tracemalloc.get_traced_memory()
+    snapshot_after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    growth = sum(
+        stat.size_diff for stat in snapshot_after.compare_to(snapshot_before, "filename")
+    )
+
+    return {
+        "command": name,
+        "iterations": iterations,
+        "latency_ms": _percentiles(samples),
+        "bytes_per_call": bytes_sent // iterations,
+        "errors": len(connection.errors) - errors_before,
+        "alloc_peak_bytes": peak,
+        "alloc_retained_bytes_per_call": growth // traced,
+    }
+
+
+async def _async_populate(hass: HomeAssistant, size: int) -> None:
+    """Fill the registries with ``size`` areas spread across floors."""
+    area_registry = ar.async_get(hass)
+    floor_registry = fr.async_get(hass)
+    floor_ids = [
+        floor_registry.async_create(f"Floor {number}", level=number).floor_id
+        for number in range(max(1, size // FLOORS_PER_AREA))
+    ]
+    for number in range(size):
+        area_registry.async_create(
+            f"Area {number:06d}", floor_id=floor_ids[number % len(floor_ids)]
+        )
+        if number % 1_000 == 0:
+            await asyncio.sleep(0)
+
+
+async def _async_setup(config_dir: str, size: int) -> HomeAssistant:
+    """Start a bare Home Assistant core with populated registries."""
+    hass = HomeAssistant(config_dir)
+    await asyncio.gather(
+        ar.async_load(hass),
+        dr.async_load(hass),
+        er.async_load(hass),
+        fr.async_load(hass),
+        lr.async_load(hass),
+    )
+    await _async_populate(hass, size)
+
+    async_setup_registry_index(hass)
+    await async_get_changeset_store(hass)
+    return hass
+
+
+async def _async_bench_size(size: int, iterations: int) -> dict[str, Any]:
+    """Run every benchmark against registries of one size."""
+    with tempfile.TemporaryDirectory(prefix="nmc-bench-") as config_dir:
+        hass = await _async_setup(config_dir, size)
+        connection = BenchConnection()
+        call = HandlerCaller(hass, connection)
+        area_ids = list(ar.async_get(hass).areas)
+        results = []
+
+        async def areas_list(_: int) -> None:
+            await call(ws.websocket_areas_list, {"type": WS_TYPE_AREAS_LIST})
+
+        async def areas_list_page(iteration: int) -> None:
+            await call(
+                ws.websocket_areas_list,
+                {
+                    "type": WS_TYPE_AREAS_LIST,
+                    "name_prefix": f"Area {iteration % 10}",
+                    "limit": 50,
+                },
+            )
+
+        async def areas_create(iteration: int) -> None:
+            await call(
+                ws.websocket_areas_create,
+                {"type": WS_TYPE_AREAS_CREATE, "name": f"Bench area {iteration}"},
+            )
+
+        async def areas_update(iteration: int) -> None:
+            await call(
+                ws.websocket_areas_update,
+                {
+                    "type": WS_TYPE_AREAS_UPDATE,
+                    "area_id": area_ids[iteration % len(area_ids)],
+                    "icon": f"mdi:numeric-{iteration % 10}",
+                },
+            )
+
+        # Each delete needs its own empty floor
+        floor_registry = fr.async_get(hass)
+        empty_floors = [
+            floor_registry.async_create(f"Empty floor {number}").floor_id
+            for number in range(iterations + iterations // 10 + 1)
+        ]
+
+        async def floors_delete(iteration: int) -> None:
+            await call(
+                ws.websocket_floors_delete,
+                {"type": WS_TYPE_FLOORS_DELETE, "floor_id": empty_floors[iteration]},
+            )
+
+        # Half the rooms already exist, half are new
+        preview_profile = {
+            "rooms": [
+                {"name": f"Area {number:06d}", "floor": "Floor 0"}
+                for number in range(0, min(size, 200), 2)
+            ]
+            + [{"name": f"Preview room {number}"} for number in range(100)]
+        }
+
+        async def wizard_preview(_: int) -> None:
+            await call(
+                wizard_ws.websocket_wizard_preview,
+                {"type": WS_TYPE_WIZARD_PREVIEW, "profile": preview_profile},
+            )
+
+        async def wizard_apply(iteration: int) -> None:
+            # Every apply needs a changeset with rooms that don't exist yet
+            store = await async_get_changeset_store(hass)
+            profile = {
+                "rooms": [
+                    {"name": f"Applied room {iteration}-{number}", "floor": "Floor 0"}
+                    for number in range(ROOMS_PER_APPLY)
+                ]
+            }
+            await call(
+                wizard_ws.websocket_wizard_preview,
+                {"type": WS_TYPE_WIZARD_PREVIEW, "profile": profile},
+            )
+            changeset_id = next(iter(store.pending()))["changeset_id"]
+            await call(
+                wizard_ws.websocket_wizard_apply,
+                {"type": WS_TYPE_WIZARD_APPLY, "changeset_id": changeset_id},
+            )
+
+        for name, run in (
+            ("areas/list", areas_list),
+            ("areas/list (page)", areas_list_page),
+            ("areas/create", areas_create),
+            ("areas/update", areas_update),
+            ("floors/delete", floors_delete),
+            ("wizard/preview", wizard_preview),
+            ("wizard/preview+apply", wizard_apply),
+        ):
+            results.append(await _measure(name, iterations, run, connection))
+
+        await hass.async_stop(force=True)
+
+    return {"size": size, "results": results}
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmarks for every requested size."""
+    report: dict[str, Any] = {
+        "integration_version": VERSION,
+        "homeassistant_version": HA_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "iterations": args.iterations,
+        "sizes": [],
+    }
+    for size in args.sizes:
+        print(f"Benchmarking {size} areas...", file=sys.stderr)
+        report["sizes"].append(await _async_bench_size(size, args.iterations))
+    return report
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and write the JSON report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS)
+    parser.add_argument("--output", type=Path, help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = asyncio.run(async_main(args))
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
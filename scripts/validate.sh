@@ -27,7 +27,8 @@ for file in "${BACKEND_FILES[@]}"; do
 done
 
 # Check frontend build exists
-if [ ! -f "custom_components/nidia_magic_composer/panel/index.js" ]; then
+if [ ! -f "custom_components/nidia_magic_composer/panel/manifest.json" ] \
+    && [ ! -f "custom_components/nidia_magic_composer/panel/index.js" ]; then
     echo "❌ Frontend build missing. Run: cd frontend && npm run build"
     exit 1
 fi
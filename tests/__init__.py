@@ -0,0 +1 @@
+"""Tests for the Nidia Magic Composer integration."""
@@ -0,0 +1,137 @@
+"""Tests for the area batch planner."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from custom_components.nidia_magic_composer.const import WS_TYPE_AREAS_BATCH
+from custom_components.nidia_magic_composer.registry_index import (
+    async_get_registry_index,
+)
+from custom_components.nidia_magic_composer.websocket_api import (
+    _plan_area_batch,
+    async_run_area_batch,
+)
+
+
+def _codes(failures: dict[int, dict]) -> dict[int, str]:
+    """Return the error code of each failed index."""
+    return {index: failure["error"]["code"] for index, failure in failures.items()}
+
+
+async def test_duplicate_names_are_caught_case_insensitively(hass: HomeAssistant) -> None:
+    """Test duplicates against the registry and within the batch."""
+    ar.async_get(hass).async_create("Kitchen")
+    async_get_registry_index(hass)
+
+    planned, failures = _plan_area_batch(
+        hass,
+        [
+            {"action": "create", "name": " kitchen "},
+            {"action": "create", "name": "Office"},
+            {"action": "create", "name": "OFFICE"},
+            {"action": "create", "name": "   "},
+        ],
+    )
+
+    assert [index for index, _ in planned] == [1]
+    assert _codes(failures) == {0: "duplicate_name", 2: "duplicate_name", 3: "invalid_name"}
+
+
+async def test_renames_and_deletes_free_names_for_later_operations(
+    hass: HomeAssistant,
+) -> None:
+    """Test that a batch sees the effect of its earlier operations."""
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    office = area_registry.async_create("Office")
+    async_get_registry_index(hass)
+
+    planned, failures = _plan_area_batch(
+        hass,
+        [
+            {"action": "update", "area_id": kitchen.id, "name": "Cooking"},
+            {"action": "create", "name": "Kitchen"},
+            {"action": "delete", "area_id": office.id},
+            {"action": "create", "name": "Office"},
+            {"action": "update", "area_id": office.id, "name": "Study"},
+        ],
+    )
+
+    assert [index for index, _ in planned] == [0, 1, 2, 3]
+    assert _codes(failures) == {4: "not_found"}
+
+
+async def test_unknown_floor_is_rejected(hass: HomeAssistant) -> None:
+    """Test that areas can only be placed on existing floors."""
+    floor = fr.async_get(hass).async_create("Ground")
+    async_get_registry_index(hass)
+
+    _, failures = _plan_area_batch(
+        hass,
+        [
+            {"action": "create", "name": "Hall", "floor_id": floor.floor_id},
+            {"action": "create", "name": "Attic", "floor_id": "missing"},
+        ],
+    )
+
+    assert _codes(failures) == {1: "invalid_floor"}
+
+
+async def test_atomic_batch_applies_nothing_on_failure(hass: HomeAssistant) -> None:
+    """Test that an atomic batch with one invalid operation changes nothing."""
+    area_registry = ar.async_get(hass)
+    area_registry.async_create("Kitchen")
+    async_get_registry_index(hass)
+    operations = [
+        {"action": "create", "name": "Office"},
+        {"action": "create", "name": "Kitchen"},
+    ]
+
+    result = async_run_area_batch(hass, [dict(op) for op in operations], True)
+    assert result["applied"] is False
+    assert [item["error"]["code"] for item in result["results"]] == [
+        "not_applied",
+        "duplicate_name",
+    ]
+    assert area_registry.async_get_area_by_name("Office") is None
+
+    result = async_run_area_batch(hass, [dict(op) for op in operations], False)
+    assert result["applied"] is True
+    assert [item["success"] for item in result["results"]] == [True, False]
+    assert area_registry.async_get_area_by_name("Office") is not None
+
+
+async def test_areas_batch_command(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test a mixed batch over the WebSocket API."""
+    area_registry = ar.async_get(hass)
+    office = area_registry.async_create("Office")
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {
+            "type": WS_TYPE_AREAS_BATCH,
+            "operations": [
+                {"action": "create", "name": "Kitchen", "icon": "mdi:stove"},
+                {"action": "update", "area_id": office.id, "name": "Study"},
+                {"action": "create", "name": "study"},
+            ],
+        }
+    )
+    response = await client.receive_json()
+
+    assert response["success"]
+    result = response["result"]
+    assert result["applied"] is True
+    assert [item["success"] for item in result["results"]] == [True, True, False]
+    assert result["results"][0]["area"]["icon"] == "mdi:stove"
+    assert result["results"][2]["error"]["code"] == "duplicate_name"
+    assert area_registry.async_get_area(office.id).name == "Study"
+    assert area_registry.async_get_area_by_name("Kitchen") is not None
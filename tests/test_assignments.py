@@ -0,0 +1,99 @@
+"""Tests for the device and entity area assignment planner."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+from custom_components.nidia_magic_composer.assignments import plan_assignments
+from custom_components.nidia_magic_composer.const import WS_TYPE_DEVICES_ASSIGN_BULK
+
+
+async def test_plan_assignments(hass: HomeAssistant) -> None:
+    """Test planned changes, unchanged items and per-item failures."""
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    office = area_registry.async_create("Office")
+
+    entry = MockConfigEntry(domain="test")
+    entry.add_to_hass(hass)
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={("test", "lamp")}
+    )
+    dr.async_get(hass).async_update_device(device.id, area_id=kitchen.id)
+    entity = er.async_get(hass).async_get_or_create("light", "test", "lamp")
+
+    planned, results = plan_assignments(
+        hass,
+        [
+            {"kind": "device", "id": device.id, "area_id": office.id},
+            {"kind": "device", "id": device.id, "area_id": kitchen.id},
+            {"kind": "entity", "id": entity.id, "area_id": kitchen.id},
+            {"kind": "entity", "id": entity.entity_id, "area_id": None},
+            {"kind": "entity", "id": "light.missing", "area_id": None},
+            {"kind": "device", "id": "other", "area_id": "missing"},
+        ],
+    )
+
+    assert planned == [
+        {
+            "index": 0,
+            "kind": "device",
+            "id": device.id,
+            "area_id": office.id,
+            "previous_area_id": kitchen.id,
+        },
+        {
+            "index": 2,
+            "kind": "entity",
+            "id": entity.entity_id,
+            "area_id": kitchen.id,
+            "previous_area_id": None,
+        },
+    ]
+    assert results[1]["error"]["code"] == "duplicate"
+    assert results[3] == {"index": 3, "success": True, "changed": False}
+    assert results[4]["error"]["code"] == "not_found"
+    assert results[5]["error"]["code"] == "area_not_found"
+
+
+async def test_assign_bulk_command(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test atomic rejection and a partial apply over the WebSocket API."""
+    kitchen = ar.async_get(hass).async_create("Kitchen")
+    entity_registry = er.async_get(hass)
+    lamp = entity_registry.async_get_or_create("light", "test", "lamp")
+    fan = entity_registry.async_get_or_create("fan", "test", "fan")
+    assignments = [
+        {"kind": "entity", "id": lamp.entity_id, "area_id": kitchen.id},
+        {"kind": "entity", "id": fan.entity_id, "area_id": "missing"},
+    ]
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_DEVICES_ASSIGN_BULK, "assignments": assignments, "atomic": True}
+    )
+    result = (await client.receive_json())["result"]
+    assert result["applied"] == 0
+    assert [item["error"]["code"] for item in result["results"]] == [
+        "not_applied",
+        "area_not_found",
+    ]
+    assert entity_registry.async_get(lamp.entity_id).area_id is None
+
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_DEVICES_ASSIGN_BULK, "assignments": assignments}
+    )
+    result = (await client.receive_json())["result"]
+    assert result["applied"] == 1
+    assert [item["success"] for item in result["results"]] == [True, False]
+    assert entity_registry.async_get(lamp.entity_id).area_id == kitchen.id
@@ -0,0 +1,29 @@
+"""Tests for the WebSocket handler benchmark."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import subprocess
+import sys
+
+BENCHMARK = Path(__file__).parent.parent / "scripts" / "benchmark.py"
+
+
+def test_benchmark_writes_a_report(tmp_path: Path) -> None:
+    """Test that a small run completes and writes a JSON report."""
+    output = tmp_path / "bench.json"
+    subprocess.run(
+        [
+            sys.executable,
+            str(BENCHMARK),
+            *("--sizes", "20", "--iterations", "2", "--output", str(output)),
+        ],
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+
+    report = json.loads(output.read_text("utf-8"))
+    assert [entry["size"] for entry in report["sizes"]] == [20]
+    results = report["sizes"][0]["results"]
+    assert {result["command"] for result in results} >= {"areas/list", "wizard/preview"}
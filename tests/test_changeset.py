@@ -0,0 +1,123 @@
+"""Tests for the wizard changeset planner."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    entity_registry as er,
+    floor_registry as fr,
+)
+
+from custom_components.nidia_magic_composer.changeset import compute_changeset_id
+from custom_components.nidia_magic_composer.const import (
+    FRONTEND_PANELS_KEY,
+    WS_TYPE_WIZARD_PREVIEW,
+)
+from custom_components.nidia_magic_composer.dashboard_generator import (
+    async_get_dashboard_store,
+)
+
+OPERATIONS = {"areas": [{"action": "create", "name": "Kitchen", "floor_id": None}]}
+
+
+def test_changeset_id_is_stable() -> None:
+    """Test that the id depends on the operations, not their key order."""
+    reordered = {"areas": [{"floor_id": None, "name": "Kitchen", "action": "create"}]}
+
+    changeset_id = compute_changeset_id(OPERATIONS)
+    assert changeset_id.startswith("changeset_")
+    assert len(changeset_id) == len("changeset_") + 16
+    assert compute_changeset_id(reordered) == changeset_id
+    assert compute_changeset_id({"areas": []}) != changeset_id
+
+
+async def test_preview_diffs_the_profile_against_the_registries(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that only missing or differing items are planned."""
+    ground = fr.async_get(hass).async_create("Ground")
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen", floor_id=ground.floor_id)
+    hall = area_registry.async_create("Hall")
+    lamp = er.async_get(hass).async_get_or_create("light", "test", "lamp")
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    profile = {
+        "rooms": [
+            {"name": "kitchen", "floor": "Ground", "devices": [lamp.entity_id]},
+            {"name": "Hall", "floor": "Ground"},
+            {"name": "Office", "floor": "First"},
+            {"name": "Lounge", "devices": ["Lights"]},
+        ]
+    }
+    await client.send_json_auto_id({"type": WS_TYPE_WIZARD_PREVIEW, "profile": profile})
+    response = await client.receive_json()
+    assert response["success"], response
+    preview = response["result"]["preview"]
+
+    assert [op["name"] for op in preview["floors_to_create"]] == ["First"]
+    assert [(op["name"], op["floor"]) for op in preview["areas_to_create"]] == [
+        ("Office", "First"),
+        ("Lounge", None),
+    ]
+    assert [op["area_id"] for op in preview["areas_to_update"]] == [hall.id]
+    assert [
+        (op["kind"], op["id"], op["area_id"]) for op in preview["entities_to_assign"]
+    ] == [("entity", lamp.entity_id, kitchen.id)]
+    assert preview["summary"]["areas"] == 3
+
+    # The same profile against the same registries plans the same changeset
+    await client.send_json_auto_id({"type": WS_TYPE_WIZARD_PREVIEW, "profile": profile})
+    again = (await client.receive_json())["result"]["preview"]
+    assert again["changeset_id"] == preview["changeset_id"]
+
+
+async def test_preview_only_updates_dashboards_it_published(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that a dashboard the composer did not publish is a conflict."""
+    client = await hass_ws_client(hass)
+    profile = {
+        "rooms": [{"name": "Kitchen"}],
+        "dashboards": {"publishTarget": "Home"},
+    }
+
+    async def preview() -> dict:
+        await client.send_json_auto_id(
+            {"type": WS_TYPE_WIZARD_PREVIEW, "profile": profile}
+        )
+        response = await client.receive_json()
+        assert response["success"], response
+        return response["result"]["preview"]
+
+    planned = await preview()
+    assert [op["url_path"] for op in planned["dashboards_to_create"]] == [
+        "home-dashboard"
+    ]
+    assert planned["dashboard_conflicts"] == []
+
+    # Another dashboard already uses the url path
+    hass.data.setdefault(FRONTEND_PANELS_KEY, {})["home-dashboard"] = object()
+    planned = await preview()
+    assert planned["dashboards_to_create"] == []
+    assert planned["dashboards_to_update"] == []
+    assert planned["dashboard_conflicts"] == [
+        {"url_path": "home-dashboard", "title": "Home", "reason": "taken"}
+    ]
+
+    # Once the composer has published it, it is brought up to date instead
+    store = await async_get_dashboard_store(hass)
+    store.async_set("home-dashboard", {})
+    planned = await preview()
+    assert [op["url_path"] for op in planned["dashboards_to_update"]] == [
+        "home-dashboard"
+    ]
+    assert planned["dashboard_conflicts"] == []
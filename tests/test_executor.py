@@ -0,0 +1,135 @@
+"""Tests for the wizard apply executor."""
+from __future__ import annotations
+
+from typing import Any
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import (
+    area_registry as ar,
+    entity_registry as er,
+    floor_registry as fr,
+)
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_WIZARD_APPLY,
+    WS_TYPE_WIZARD_PREVIEW,
+    WS_TYPE_WIZARD_ROLLBACK,
+)
+
+
+async def _send(client: MockHAClientWebSocket, msg: dict[str, Any]) -> dict[str, Any]:
+    """Send a command and return its response."""
+    await client.send_json_auto_id(msg)
+    return await client.receive_json()
+
+
+async def _preview(client: MockHAClientWebSocket, profile: dict[str, Any]) -> str:
+    """Preview a profile and return its changeset id."""
+    response = await _send(client, {"type": WS_TYPE_WIZARD_PREVIEW, "profile": profile})
+    return response["result"]["preview"]["changeset_id"]
+
+
+async def _apply(client: MockHAClientWebSocket, changeset_id: str) -> dict[str, Any]:
+    """Apply a changeset and return the response."""
+    return await _send(
+        client, {"type": WS_TYPE_WIZARD_APPLY, "changeset_id": changeset_id}
+    )
+
+
+async def _rollback(client: MockHAClientWebSocket, rollback_id: str) -> dict[str, Any]:
+    """Roll back a changeset and return the response."""
+    return await _send(
+        client, {"type": WS_TYPE_WIZARD_ROLLBACK, "rollback_id": rollback_id}
+    )
+
+
+async def test_apply_and_rollback(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that an applied changeset is idempotent and can be rolled back."""
+    lamp = er.async_get(hass).async_get_or_create("light", "test", "lamp")
+    client = await hass_ws_client(hass)
+    changeset_id = await _preview(
+        client,
+        {"rooms": [{"name": "Office", "floor": "First", "devices": [lamp.entity_id]}]},
+    )
+
+    applied = await _apply(client, changeset_id)
+    assert applied["success"], applied
+    assert applied["result"]["already_applied"] is False
+    office = ar.async_get(hass).async_get_area_by_name("Office")
+    assert fr.async_get(hass).async_get_floor(office.floor_id).name == "First"
+    assert er.async_get(hass).async_get(lamp.entity_id).area_id == office.id
+
+    again = await _apply(client, changeset_id)
+    assert again["result"]["already_applied"] is True
+    assert len(ar.async_get(hass).areas) == 1
+
+    rollback = await _rollback(client, applied["result"]["rollback_id"])
+    assert rollback["success"], rollback
+    assert ar.async_get(hass).async_get_area_by_name("Office") is None
+    assert not fr.async_get(hass).floors
+    assert er.async_get(hass).async_get(lamp.entity_id).area_id is None
+
+    # A rolled back changeset cannot be rolled back again
+    repeated = await _rollback(client, applied["result"]["rollback_id"])
+    assert repeated["error"]["code"] == "not_found"
+
+
+async def test_failed_apply_undoes_earlier_operations(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that a failing operation rolls back everything applied before it."""
+    entity_registry = er.async_get(hass)
+    lamp = entity_registry.async_get_or_create("light", "test", "lamp")
+    client = await hass_ws_client(hass)
+    changeset_id = await _preview(
+        client,
+        {"rooms": [{"name": "Office", "floor": "First", "devices": [lamp.entity_id]}]},
+    )
+    entity_registry.async_remove(lamp.entity_id)
+
+    response = await _apply(client, changeset_id)
+    assert response["error"]["code"] == "apply_failed"
+    assert not ar.async_get(hass).areas
+    assert not fr.async_get(hass).floors
+
+
+async def test_failed_rollback_is_reported_and_can_be_retried(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that undo failures surface as rollback_failed and stay journaled."""
+    client = await hass_ws_client(hass)
+    changeset_id = await _preview(
+        client, {"rooms": [{"name": "Office", "floor": "First"}]}
+    )
+    applied = await _apply(client, changeset_id)
+    rollback_id = applied["result"]["rollback_id"]
+    area_registry = ar.async_get(hass)
+
+    with patch.object(
+        area_registry, "async_delete", side_effect=HomeAssistantError("locked")
+    ):
+        response = await _rollback(client, rollback_id)
+    assert response["error"]["code"] == "rollback_failed"
+    assert area_registry.async_get_area_by_name("Office") is not None
+    # The floor could be removed and is not undone twice
+    assert not fr.async_get(hass).floors
+
+    response = await _rollback(client, rollback_id)
+    assert response["success"], response
+    assert area_registry.async_get_area_by_name("Office") is None
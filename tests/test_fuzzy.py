@@ -0,0 +1,89 @@
+"""Tests for the trigram similarity index."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+
+from custom_components.nidia_magic_composer.const import WS_TYPE_AREAS_MATCH
+from custom_components.nidia_magic_composer.fuzzy import TrigramIndex, trigrams
+
+
+def test_trigrams_are_padded_per_word() -> None:
+    """Test that words are casefolded and padded like pg_trgm."""
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("Ab ab") == trigrams("ab")
+    assert trigrams("  !! ") == frozenset()
+
+
+def test_search_ranks_by_dice_coefficient() -> None:
+    """Test that the closest phrase wins and scores are Dice coefficients."""
+    index = TrigramIndex()
+    index.set("kitchen", ["Kitchen"])
+    index.set("living", ["Living Room", "Lounge"])
+    index.set("bedroom", ["Bedroom"])
+
+    results = index.search("kitchn", limit=3, min_score=0.1)
+    assert results[0][:2] == ("kitchen", "Kitchen")
+
+    query, phrase = trigrams("kitchn"), trigrams("Kitchen")
+    expected = 2 * len(query & phrase) / (len(query) + len(phrase))
+    assert results[0][2] == round(expected, 3)
+
+
+def test_exact_alias_match_scores_one() -> None:
+    """Test that an exact casefolded alias match scores 1."""
+    index = TrigramIndex()
+    index.set("living", ["Living Room", "Lounge"])
+
+    assert index.search(" LOUNGE ", limit=1, min_score=0.5) == [
+        ("living", "Lounge", 1.0)
+    ]
+
+
+def test_limit_min_score_and_drop() -> None:
+    """Test result limits, the score threshold and removing items."""
+    index = TrigramIndex()
+    for number in range(5):
+        index.set(f"bath_{number}", [f"Bathroom {number}"])
+    index.set("garage", ["Garage"])
+
+    assert len(index.search("bathroom", limit=2, min_score=0.1)) == 2
+    assert index.search("bathroom", limit=10, min_score=0.99) == []
+
+    index.drop("garage")
+    assert index.search("garage", limit=1, min_score=0.1) == []
+    assert len(index) == 5
+
+
+async def test_areas_match_command(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that areas/match ranks areas by name and alias and follows renames."""
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    living = area_registry.async_create("Living Room", aliases={"Lounge"})
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_AREAS_MATCH, "rooms": ["kitchn", "lounge", "attic"]}
+    )
+    response = await client.receive_json()
+    assert response["success"], response
+    kitchn, lounge, attic = response["result"]["matches"]
+    assert kitchn["candidates"][0]["area_id"] == kitchen.id
+    assert lounge["candidates"] == [
+        {"area_id": living.id, "name": "Living Room", "matched": "Lounge", "score": 1.0}
+    ]
+    assert attic["candidates"] == []
+
+    area_registry.async_update(kitchen.id, name="Attic")
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_AREAS_MATCH, "rooms": ["attic"], "min_score": 0.9}
+    )
+    response = await client.receive_json()
+    assert response["result"]["matches"][0]["candidates"][0]["area_id"] == kitchen.id
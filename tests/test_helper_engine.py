@@ -0,0 +1,138 @@
+"""Tests for helper planning and storage collection access."""
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.components.websocket_api import DOMAIN as WEBSOCKET_DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_WIZARD_APPLY,
+    WS_TYPE_WIZARD_PREVIEW,
+    WS_TYPE_WIZARD_ROLLBACK,
+)
+from custom_components.nidia_magic_composer.helper_engine import (
+    CLAIM_DUPLICATE,
+    CLAIM_EXISTS,
+    CLAIM_TAKEN,
+    EntityIdIndex,
+)
+from custom_components.nidia_magic_composer.storage_collections import (
+    async_get_collection_items,
+)
+
+PROFILE = {
+    "rooms": [{"name": "Office"}],
+    "helpers": [
+        {"id": "guest", "name": "Guest mode"},
+        {"id": "occupied", "name": "Occupied", "perRoom": True},
+    ],
+}
+
+
+async def _send(client: MockHAClientWebSocket, msg: dict[str, Any]) -> dict[str, Any]:
+    """Send a command and return its response."""
+    await client.send_json_auto_id(msg)
+    return await client.receive_json()
+
+
+def _break_command(hass: HomeAssistant, command: str) -> None:
+    """Replace a registered command with one that cannot be run in-process."""
+
+    def broken(*args: Any) -> None:
+        raise TypeError("changed signature")
+
+    handlers = hass.data[WEBSOCKET_DOMAIN]
+    handlers[command] = (broken, handlers[command][1])
+
+
+def test_entity_id_claims() -> None:
+    """Test why an entity id cannot be claimed."""
+    index = EntityIdIndex(
+        {"input_boolean.other", "input_boolean.nmc_guest"}, {"input_boolean.nmc_guest"}
+    )
+
+    assert index.claim("input_boolean.nmc_away") is None
+    assert index.claim("input_boolean.nmc_away") == CLAIM_DUPLICATE
+    assert index.claim("input_boolean.nmc_guest") == CLAIM_EXISTS
+    assert index.claim("input_boolean.other") == CLAIM_TAKEN
+
+
+async def test_helpers_created_through_collection_commands(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that helpers are created and removed through their own commands."""
+    assert await async_setup_component(hass, "input_boolean", {})
+    client = await hass_ws_client(hass)
+
+    preview = await _send(client, {"type": WS_TYPE_WIZARD_PREVIEW, "profile": PROFILE})
+    changeset_id = preview["result"]["preview"]["changeset_id"]
+    applied = await _send(
+        client, {"type": WS_TYPE_WIZARD_APPLY, "changeset_id": changeset_id}
+    )
+    assert applied["success"], applied
+    await hass.async_block_till_done()
+
+    items = async_get_collection_items(hass, "input_boolean")
+    assert {item_id: item["name"] for item_id, item in items.items()} == {
+        "magic_composer_guest": "Guest mode",
+        "magic_composer_office_occupied": "Office Occupied",
+    }
+    assert hass.states.get("input_boolean.magic_composer_guest") is not None
+
+    rollback = await _send(
+        client,
+        {"type": WS_TYPE_WIZARD_ROLLBACK, "rollback_id": applied["result"]["rollback_id"]},
+    )
+    assert rollback["success"], rollback
+    assert async_get_collection_items(hass, "input_boolean") == {}
+
+
+async def test_collection_lookup_fallback(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that the collection lookup is used when the commands cannot run."""
+    assert await async_setup_component(hass, "input_boolean", {})
+    _break_command(hass, "input_boolean/create")
+    _break_command(hass, "input_boolean/update")
+    client = await hass_ws_client(hass)
+
+    preview = await _send(client, {"type": WS_TYPE_WIZARD_PREVIEW, "profile": PROFILE})
+    changeset_id = preview["result"]["preview"]["changeset_id"]
+    applied = await _send(
+        client, {"type": WS_TYPE_WIZARD_APPLY, "changeset_id": changeset_id}
+    )
+    assert applied["success"], applied
+    assert async_get_collection_items(hass, "input_boolean")["magic_composer_guest"][
+        "name"
+    ] == "Guest mode"
+
+
+async def test_preview_fails_without_collection(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that the preview fails cleanly when helpers cannot be reached."""
+    client = await hass_ws_client(hass)
+
+    # input_boolean is not loaded
+    response = await _send(client, {"type": WS_TYPE_WIZARD_PREVIEW, "profile": PROFILE})
+    assert response["error"]["code"] == "collection_unavailable"
+
+    # Neither the list command nor the lookup behind it works
+    assert await async_setup_component(hass, "input_boolean", {})
+    _break_command(hass, "input_boolean/list")
+    response = await _send(client, {"type": WS_TYPE_WIZARD_PREVIEW, "profile": PROFILE})
+    assert response["error"]["code"] == "collection_unavailable"
@@ -0,0 +1,53 @@
+"""Tests for the integration setup."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from custom_components.nidia_magic_composer.const import (
+    DATA_CHANGESETS,
+    DATA_DASHBOARDS,
+    DOMAIN,
+    FRONTEND_PANELS_KEY,
+    PANEL_NAME,
+)
+from custom_components.nidia_magic_composer.executor import async_get_apply_lock
+from custom_components.nidia_magic_composer.metrics import async_get_metrics
+from custom_components.nidia_magic_composer.progress import async_start_progress
+
+
+async def test_setup_defers_the_panel_and_the_stores(hass: HomeAssistant) -> None:
+    """Test that setup loads no stores and registers the panel once started."""
+    hass.set_state(CoreState.starting)
+    await async_setup_component(hass, "websocket_api", {})
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    assert entry.state is ConfigEntryState.LOADED
+    assert PANEL_NAME not in hass.data.get(FRONTEND_PANELS_KEY, {})
+    assert DATA_CHANGESETS not in hass.data[DOMAIN]
+    assert DATA_DASHBOARDS not in hass.data[DOMAIN]
+
+    await hass.async_start()
+    await hass.async_block_till_done()
+    assert PANEL_NAME in hass.data[FRONTEND_PANELS_KEY]
+
+
+async def test_unload_drops_the_runtime_data(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Test that unloading leaves no per-run state behind."""
+    async_get_apply_lock(hass)
+    async_start_progress(hass, "changeset_0", 1)
+    async_get_metrics(hass)
+
+    assert await hass.config_entries.async_unload(init_integration.entry_id)
+    await hass.async_block_till_done()
+
+    # Static routes cannot be unregistered, so their paths outlive a reload
+    assert list(hass.data[DOMAIN]) == ["static_paths"]
@@ -0,0 +1,158 @@
+"""Tests for the JSON patch engine."""
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_DRAFT_GET,
+    WS_TYPE_DRAFT_PATCH,
+)
+from custom_components.nidia_magic_composer.draft import STORAGE_KEY
+from custom_components.nidia_magic_composer.json_patch import (
+    JsonPatchError,
+    apply_patch,
+    parse_pointer,
+)
+
+
+def test_parse_pointer_unescapes_tokens() -> None:
+    """Test that ~1 and ~0 unescape to / and ~."""
+    assert parse_pointer("") == []
+    assert parse_pointer("/a~1b/c~0d/0") == ["a/b", "c~d", "0"]
+    with pytest.raises(JsonPatchError):
+        parse_pointer("a/b")
+
+
+@pytest.mark.parametrize(
+    ("patch", "expected"),
+    [
+        ([{"op": "add", "path": "/rooms/-", "value": "c"}], {"rooms": ["a", "b", "c"]}),
+        ([{"op": "add", "path": "/rooms/0", "value": "z"}], {"rooms": ["z", "a", "b"]}),
+        ([{"op": "remove", "path": "/rooms/0"}], {"rooms": ["b"]}),
+        ([{"op": "replace", "path": "/rooms/1", "value": "x"}], {"rooms": ["a", "x"]}),
+        (
+            [{"op": "copy", "from": "/rooms/0", "path": "/first"}],
+            {"rooms": ["a", "b"], "first": "a"},
+        ),
+        (
+            [{"op": "move", "from": "/rooms/1", "path": "/last"}],
+            {"rooms": ["a"], "last": "b"},
+        ),
+        ([{"op": "test", "path": "/rooms/0", "value": "a"}], {"rooms": ["a", "b"]}),
+        ([{"op": "replace", "path": "", "value": {}}], {}),
+    ],
+)
+def test_operations(patch: list, expected: dict) -> None:
+    """Test each RFC 6902 operation."""
+    assert apply_patch({"rooms": ["a", "b"]}, patch) == expected
+
+
+def test_input_is_never_modified_and_untouched_subtrees_are_shared() -> None:
+    """Test that only containers on the patched path are copied."""
+    document = {"profile": {"name": "Home"}, "rooms": [{"name": "Kitchen"}]}
+    patched = apply_patch(
+        document, [{"op": "replace", "path": "/profile/name", "value": "Flat"}]
+    )
+
+    assert document == {"profile": {"name": "Home"}, "rooms": [{"name": "Kitchen"}]}
+    assert patched["profile"] == {"name": "Flat"}
+    assert patched["profile"] is not document["profile"]
+    assert patched["rooms"] is document["rooms"]
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        {"op": "remove", "path": "/missing"},
+        {"op": "replace", "path": "/rooms/2", "value": "x"},
+        {"op": "add", "path": "/rooms/01", "value": "x"},
+        {"op": "test", "path": "/rooms/0", "value": "b"},
+        {"op": "move", "from": "/rooms", "path": "/rooms/0"},
+        {"op": "remove", "path": ""},
+    ],
+)
+def test_invalid_operations_raise(operation: dict) -> None:
+    """Test that invalid operations raise with their position."""
+    with pytest.raises(JsonPatchError, match="Operation 1"):
+        apply_patch(
+            {"rooms": ["a", "b"]},
+            [{"op": "add", "path": "/extra", "value": 1}, operation],
+        )
+
+
+async def _send(client: MockHAClientWebSocket, msg: dict[str, Any]) -> dict[str, Any]:
+    """Send a command and return its response."""
+    await client.send_json_auto_id(msg)
+    return await client.receive_json()
+
+
+async def test_draft_get_and_patch(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+    hass_storage: dict[str, Any],
+) -> None:
+    """Test patching the draft by revision and saving it."""
+    client = await hass_ws_client(hass)
+
+    response = await _send(client, {"type": WS_TYPE_DRAFT_GET})
+    assert response["result"]["draft"] is None
+    assert response["result"]["revision"] == 0
+
+    response = await _send(
+        client,
+        {
+            "type": WS_TYPE_DRAFT_PATCH,
+            "revision": 0,
+            "patch": [{"op": "add", "path": "", "value": {"rooms": ["Kitchen"]}}],
+        },
+    )
+    assert response["result"] == {"revision": 1}
+    response = await _send(
+        client,
+        {
+            "type": WS_TYPE_DRAFT_PATCH,
+            "revision": 1,
+            "patch": [{"op": "add", "path": "/rooms/-", "value": "Hall"}],
+        },
+    )
+    assert response["result"] == {"revision": 2}
+
+    # A patch against an older revision is rejected, not applied over newer edits
+    response = await _send(
+        client,
+        {
+            "type": WS_TYPE_DRAFT_PATCH,
+            "revision": 1,
+            "patch": [{"op": "remove", "path": "/rooms/0"}],
+        },
+    )
+    assert response["error"]["code"] == "revision_mismatch"
+
+    response = await _send(
+        client,
+        {
+            "type": WS_TYPE_DRAFT_PATCH,
+            "revision": 2,
+            "patch": [{"op": "remove", "path": "/missing"}],
+        },
+    )
+    assert response["error"]["code"] == "invalid_patch"
+
+    response = await _send(client, {"type": WS_TYPE_DRAFT_GET})
+    assert response["result"]["draft"] == {"rooms": ["Kitchen", "Hall"]}
+    assert response["result"]["revision"] == 2
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert hass_storage[STORAGE_KEY]["data"]["draft"] == {"rooms": ["Kitchen", "Hall"]}
@@ -0,0 +1,165 @@
+"""Tests for the layout export and import commands."""
+from __future__ import annotations
+
+import json
+from typing import Any
+from unittest.mock import patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_LAYOUT_EXPORT,
+    WS_TYPE_LAYOUT_IMPORT,
+)
+from custom_components.nidia_magic_composer.layout import LAYOUT_FORMAT, LAYOUT_VERSION
+
+HEADER = json.dumps({"type": "header", "format": LAYOUT_FORMAT, "version": LAYOUT_VERSION})
+
+
+async def _send(client: MockHAClientWebSocket, msg: dict[str, Any]) -> dict[str, Any]:
+    """Send a command and return its response."""
+    await client.send_json_auto_id(msg)
+    return await client.receive_json()
+
+
+async def _export(client: MockHAClientWebSocket) -> tuple[int, str, dict[str, Any]]:
+    """Export the layout and return the subscription id, the text and done event."""
+    response = await _send(client, {"type": WS_TYPE_LAYOUT_EXPORT})
+    assert response["success"], response
+    text = ""
+    while "data" in (event := (await client.receive_json())["event"]):
+        text += event["data"]
+    return response["id"], text, event
+
+
+async def test_export_and_import_round_trip(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that an exported layout imports back in chunks split mid-line."""
+    floor_registry = fr.async_get(hass)
+    area_registry = ar.async_get(hass)
+    ground = floor_registry.async_create("Ground", level=0)
+    area_registry.async_create("Kitchen", floor_id=ground.floor_id)
+    area_registry.async_create("Garden")
+    client = await hass_ws_client(hass)
+
+    subscription, text, done = await _export(client)
+    assert done == {"done": True, "chunks": 1, "records": 4}
+    assert [json.loads(line)["type"] for line in text.splitlines()] == [
+        "header",
+        "floor",
+        "area",
+        "area",
+    ]
+
+    # The subscription ends with the done event
+    response = await _send(
+        client, {"type": "unsubscribe_events", "subscription": subscription}
+    )
+    assert response["error"]["code"] == "not_found"
+
+    area_registry.async_delete(area_registry.async_get_area_by_name("Kitchen").id)
+    floor_registry.async_delete(ground.floor_id)
+
+    middle = len(text) // 2
+    first = await _send(
+        client, {"type": WS_TYPE_LAYOUT_IMPORT, "seq": 0, "data": text[:middle]}
+    )
+    assert first["success"], first
+    last = await _send(
+        client,
+        {
+            "type": WS_TYPE_LAYOUT_IMPORT,
+            "import_id": first["result"]["import_id"],
+            "seq": 1,
+            "data": text[middle:],
+            "final": True,
+        },
+    )
+    result = last["result"]
+    assert result["done"] is True
+    assert (result["floors_created"], result["areas_created"]) == (1, 1)
+    assert (result["areas_updated"], result["failed"]) == (1, 0)
+
+    ground = floor_registry.async_get_floor_by_name("Ground")
+    assert area_registry.async_get_area_by_name("Kitchen").floor_id == ground.floor_id
+
+
+async def test_import_keeps_floor_that_was_not_imported(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that only a null floor_id clears an area's floor."""
+    ground = fr.async_get(hass).async_create("Ground")
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen", floor_id=ground.floor_id)
+    hall = area_registry.async_create("Hall", floor_id=ground.floor_id)
+    client = await hass_ws_client(hass)
+
+    records = [
+        {"type": "area", "name": "Kitchen", "floor_id": "exported_floor"},
+        {"type": "area", "name": "Hall", "floor_id": None},
+    ]
+    data = "\n".join([HEADER, *map(json.dumps, records)])
+    response = await _send(
+        client, {"type": WS_TYPE_LAYOUT_IMPORT, "seq": 0, "data": data, "final": True}
+    )
+    assert response["result"]["areas_updated"] == 2
+
+    assert area_registry.async_get_area(kitchen.id).floor_id == ground.floor_id
+    assert area_registry.async_get_area(hall.id).floor_id is None
+
+
+async def test_import_rejects_overlong_lines(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that a line carried over past the line limit fails the import."""
+    client = await hass_ws_client(hass)
+
+    with patch("custom_components.nidia_magic_composer.layout.MAX_LAYOUT_LINE_SIZE", 100):
+        response = await _send(
+            client,
+            {
+                "type": WS_TYPE_LAYOUT_IMPORT,
+                "seq": 0,
+                "data": f"{HEADER}\n{'x' * 150}\n{'y' * 50}",
+            },
+        )
+        assert response["result"]["failed"] == 1
+        assert response["result"]["errors"][0]["code"] == "line_too_long"
+
+        import_id = response["result"]["import_id"]
+        response = await _send(
+            client,
+            {
+                "type": WS_TYPE_LAYOUT_IMPORT,
+                "import_id": import_id,
+                "seq": 1,
+                "data": "y" * 60,
+            },
+        )
+        assert response["error"]["code"] == "invalid_format"
+
+        # The failed import is closed
+        response = await _send(
+            client,
+            {
+                "type": WS_TYPE_LAYOUT_IMPORT,
+                "import_id": import_id,
+                "seq": 2,
+                "data": "",
+            },
+        )
+        assert response["error"]["code"] == "not_found"
@@ -0,0 +1,74 @@
+"""Tests for the command metrics and diagnostics."""
+from __future__ import annotations
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar
+
+from custom_components.nidia_magic_composer.const import (
+    DATA_INDEX,
+    DATA_METRICS,
+    DOMAIN,
+    WS_TYPE_AREAS_LIST,
+    WS_TYPE_AREAS_UPDATE,
+    WS_TYPE_METRICS,
+)
+from custom_components.nidia_magic_composer.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+
+
+async def test_commands_are_metered_per_outcome(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that replies are counted and sized per command and outcome."""
+    client = await hass_ws_client(hass)
+    for msg in (
+        {"type": WS_TYPE_AREAS_LIST},
+        {"type": WS_TYPE_AREAS_LIST},
+        {"type": WS_TYPE_AREAS_UPDATE, "area_id": "missing", "name": "Attic"},
+    ):
+        await client.send_json_auto_id(msg)
+        await client.receive_json()
+
+    await client.send_json_auto_id({"type": WS_TYPE_METRICS})
+    commands = (await client.receive_json())["result"]["commands"]
+
+    listed = commands[WS_TYPE_AREAS_LIST]["success"]
+    assert (listed["count"], listed["window"]) == (2, 2)
+    assert listed["bytes"]["p50"] > 0
+    assert commands[WS_TYPE_AREAS_UPDATE]["not_found"]["count"] == 1
+
+
+async def test_diagnostics_only_read_existing_state(hass: HomeAssistant) -> None:
+    """Test that diagnostics do not build the index or start the metrics."""
+    ar.async_get(hass).async_create("Kitchen")
+    entry = MockConfigEntry(domain=DOMAIN)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert diagnostics["registries"] == {"areas": 1, "floors": 0}
+    assert diagnostics["index"] is None
+    assert diagnostics["metrics"] is None
+    assert DATA_INDEX not in hass.data.get(DOMAIN, {})
+    assert DATA_METRICS not in hass.data.get(DOMAIN, {})
+
+
+async def test_diagnostics_of_a_loaded_entry(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test diagnostics once the integration has served a command."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": WS_TYPE_AREAS_LIST})
+    await client.receive_json()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, init_integration)
+
+    assert diagnostics["caches"]["areas"]["misses"] == 1
+    assert WS_TYPE_AREAS_LIST in diagnostics["metrics"]["commands"]
@@ -0,0 +1,83 @@
+"""Tests for wizard apply progress reporting."""
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.nidia_magic_composer.const import (
+    SIGNAL_APPLY_PROGRESS,
+    WS_TYPE_WIZARD_APPLY,
+    WS_TYPE_WIZARD_PREVIEW,
+    WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS,
+)
+from custom_components.nidia_magic_composer.progress import async_start_progress
+
+
+async def test_progress_is_throttled_between_steps(hass: HomeAssistant) -> None:
+    """Test that per-item updates are coalesced but steps and the end are not."""
+    events: list[dict[str, Any]] = []
+
+    @callback
+    def _async_record(progress: dict[str, Any]) -> None:
+        events.append(progress)
+
+    async_dispatcher_connect(hass, SIGNAL_APPLY_PROGRESS, _async_record)
+    progress = async_start_progress(hass, "changeset_0", 1000)
+    for step in ("floors", "areas"):
+        for number in range(500):
+            progress.async_start_operation(step, f"create {number}")
+            progress.async_finish_operation()
+    progress.async_finish("applied")
+
+    assert [event["step"] for event in events] == ["floors", "areas", "areas"]
+    assert events[-1] | {"elapsed": 0} == {
+        "changeset_id": "changeset_0",
+        "state": "applied",
+        "step": "areas",
+        "done": 1000,
+        "total": 1000,
+        "current": None,
+        "errors": [],
+        "elapsed": 0,
+        "eta": None,
+    }
+
+
+async def test_subscribers_follow_an_apply(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that subscribers get the step events and the final state."""
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id({"type": WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS})
+    assert (await client.receive_json())["success"]
+
+    await client.send_json_auto_id(
+        {
+            "type": WS_TYPE_WIZARD_PREVIEW,
+            "profile": {"rooms": [{"name": "Office", "floor": "First"}]},
+        }
+    )
+    changeset_id = (await client.receive_json())["result"]["preview"]["changeset_id"]
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_WIZARD_APPLY, "changeset_id": changeset_id}
+    )
+
+    events: list[dict[str, Any]] = []
+    while (message := await client.receive_json())["type"] == "event":
+        events.append(message["event"])
+    assert message["success"]
+    assert [event["step"] for event in events] == ["floors", "areas", "areas"]
+    assert events[-1]["state"] == "applied"
+    assert (events[-1]["done"], events[-1]["total"]) == (2, 2)
+
+    # A late subscriber starts from the state of the last apply
+    await client.send_json_auto_id({"type": WS_TYPE_WIZARD_SUBSCRIBE_PROGRESS})
+    assert (await client.receive_json())["success"]
+    assert (await client.receive_json())["event"]["state"] == "applied"
@@ -0,0 +1,41 @@
+"""Tests for the registry index."""
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from custom_components.nidia_magic_composer.registry_index import (
+    async_get_registry_index,
+)
+
+
+async def test_index_follows_registry_updates(hass: HomeAssistant) -> None:
+    """Test that creates, renames and removes reach the name index."""
+    area_registry = ar.async_get(hass)
+    index = async_get_registry_index(hass)
+
+    area = area_registry.async_create("Kitchen")
+    await hass.async_block_till_done()
+    assert index.area_name_taken("KITCHEN")
+
+    area_registry.async_update(area.id, name="Cooking")
+    await hass.async_block_till_done()
+    assert not index.area_name_taken("Kitchen")
+    assert index.areas_by_name("coo") == [area.id]
+
+    area_registry.async_delete(area.id)
+    await hass.async_block_till_done()
+    assert index.areas_by_name() == []
+
+
+async def test_reorder_events_only_bump_the_revision(hass: HomeAssistant) -> None:
+    """Test that id-less reorder events are handled."""
+    index = async_get_registry_index(hass)
+    area_revision, floor_revision = index.area_revision, index.floor_revision
+
+    hass.bus.async_fire(ar.EVENT_AREA_REGISTRY_UPDATED, {"action": "reorder"})
+    hass.bus.async_fire(fr.EVENT_FLOOR_REGISTRY_UPDATED, {"action": "reorder"})
+    await hass.async_block_till_done()
+
+    assert index.area_revision == area_revision + 1
+    assert index.floor_revision == floor_revision + 1
@@ -0,0 +1,74 @@
+"""Tests for the integration services."""
+from __future__ import annotations
+
+import logging
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import area_registry as ar
+
+from custom_components.nidia_magic_composer.const import DOMAIN, SERVICE_CREATE_AREA
+
+
+async def test_create_area_returns_per_item_results(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Test that a partial batch is reported per item as response data."""
+    ar.async_get(hass).async_create("Kitchen")
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_CREATE_AREA,
+        {"areas": ["Kitchen", {"name": "Office", "icon": "mdi:desk"}]},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["applied"] is True
+    assert [item["success"] for item in response["results"]] == [False, True]
+    assert ar.async_get(hass).async_get_area_by_name("Office").icon == "mdi:desk"
+
+
+async def test_create_area_fails_listing_failed_areas(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test that failures are not dropped when no response is requested."""
+    ar.async_get(hass).async_create("Kitchen")
+
+    with caplog.at_level(logging.WARNING), pytest.raises(
+        ServiceValidationError, match="Created 1 of 3 area"
+    ) as err:
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CREATE_AREA,
+            {"areas": ["Kitchen", "Office", "office"]},
+            blocking=True,
+        )
+
+    assert "'Kitchen'" in str(err.value)
+    assert "'office'" in str(err.value)
+    assert "Area 'Kitchen' was not created" in caplog.text
+    assert ar.async_get(hass).async_get_area_by_name("Office") is not None
+
+
+async def test_create_area_atomic_creates_nothing(
+    hass: HomeAssistant, init_integration: MockConfigEntry
+) -> None:
+    """Test that an atomic batch with a failure creates no area."""
+    ar.async_get(hass).async_create("Kitchen")
+
+    with pytest.raises(ServiceValidationError, match="Created 0 of 2 area"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_CREATE_AREA,
+            {"areas": ["Office", "Kitchen"], "atomic": True},
+            blocking=True,
+            return_response=True,
+        )
+
+    assert ar.async_get(hass).async_get_area_by_name("Office") is None
@@ -0,0 +1,160 @@
+"""Tests for the snapshot Merkle trees."""
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_SNAPSHOT_CREATE,
+    WS_TYPE_SNAPSHOT_DELETE,
+    WS_TYPE_SNAPSHOT_DIFF,
+    WS_TYPE_SNAPSHOT_LIST,
+)
+from custom_components.nidia_magic_composer.snapshot import (
+    KIND_AREA,
+    KIND_FLOOR,
+    KIND_HELPER,
+    build_floor_nodes,
+    build_tree,
+    diff_trees,
+    record_hash,
+)
+
+
+def _tree(
+    floors: dict[str, str],
+    areas: dict[str, tuple[str | None, str]],
+    helpers: dict[str, str] | None = None,
+) -> dict[str, Any]:
+    """Build a tree from leaf maps."""
+    return build_tree(build_floor_nodes(floors, areas), helpers or {})
+
+
+def test_record_hash_ignores_key_order() -> None:
+    """Test that leaf hashes depend on content only."""
+    assert record_hash({"a": 1, "b": [1, 2]}) == record_hash({"b": [1, 2], "a": 1})
+    assert record_hash({"a": 1}) != record_hash({"a": 2})
+
+
+def test_identical_trees_compare_only_the_root() -> None:
+    """Test that equal roots short-circuit the diff."""
+    leaves = ({"ground": "f1"}, {"kitchen": ("ground", "a1")}, {"input_boolean.x": "h1"})
+    assert diff_trees(_tree(*leaves), _tree(*leaves)) == ({}, 1)
+
+
+def test_diff_reports_added_removed_and_modified_leaves() -> None:
+    """Test the changes found between two trees."""
+    old = _tree(
+        {"ground": "f1", "first": "f2"},
+        {"kitchen": ("ground", "a1"), "bedroom": ("first", "a2"), "hall": (None, "a3")},
+        {"input_boolean.x": "h1"},
+    )
+    new = _tree(
+        {"ground": "f1", "first": "f2b"},
+        {"kitchen": ("ground", "a1"), "bedroom": ("first", "a2"), "attic": (None, "a4")},
+        {"input_boolean.x": "h1", "input_number.y": "h2"},
+    )
+
+    changes, _ = diff_trees(old, new)
+    assert changes == {
+        (KIND_FLOOR, "first"): "modified",
+        (KIND_AREA, "hall"): "removed",
+        (KIND_AREA, "attic"): "added",
+        (KIND_HELPER, "input_number.y"): "added",
+    }
+
+
+def test_area_moved_between_floors_is_modified() -> None:
+    """Test that a moved area is not reported as removed and added."""
+    old = _tree({"ground": "f1", "first": "f2"}, {"kitchen": ("ground", "a1")})
+    new = _tree({"ground": "f1", "first": "f2"}, {"kitchen": ("first", "a1b")})
+
+    changes, _ = diff_trees(old, new)
+    assert changes == {(KIND_AREA, "kitchen"): "modified"}
+
+
+def test_areas_on_unknown_floors_are_grouped_without_floor() -> None:
+    """Test that areas whose floor is gone land in the no-floor node."""
+    nodes = build_floor_nodes({}, {"kitchen": ("gone", "a1"), "hall": (None, "a2")})
+    assert list(nodes) == [""]
+    assert nodes[""]["areas"] == {"kitchen": "a1", "hall": "a2"}
+
+
+async def _result(client: MockHAClientWebSocket, msg: dict[str, Any]) -> Any:
+    """Send a command and return its successful result."""
+    await client.send_json_auto_id(msg)
+    response = await client.receive_json()
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_snapshot_commands(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test creating, diffing, listing and deleting snapshots."""
+    ground = fr.async_get(hass).async_create("Ground")
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen", floor_id=ground.floor_id)
+    client = await hass_ws_client(hass)
+
+    first = (await _result(client, {"type": WS_TYPE_SNAPSHOT_CREATE, "label": "one"}))[
+        "snapshot"
+    ]
+    diff = await _result(
+        client,
+        {"type": WS_TYPE_SNAPSHOT_DIFF, "from_snapshot_id": first["snapshot_id"]},
+    )
+    assert diff["changed"] is False
+    assert diff["compared"] == 1
+
+    area_registry.async_update(kitchen.id, name="Cuisine")
+    hall = area_registry.async_create("Hall")
+    diff = await _result(
+        client,
+        {"type": WS_TYPE_SNAPSHOT_DIFF, "from_snapshot_id": first["snapshot_id"]},
+    )
+    assert diff["changed"] is True
+    assert {(area["id"], area["change"]) for area in diff["areas"]} == {
+        (kitchen.id, "modified"),
+        (hall.id, "added"),
+    }
+    modified = next(area for area in diff["areas"] if area["id"] == kitchen.id)
+    assert (modified["before"]["name"], modified["after"]["name"]) == (
+        "Kitchen",
+        "Cuisine",
+    )
+
+    second = (await _result(client, {"type": WS_TYPE_SNAPSHOT_CREATE}))["snapshot"]
+    between = await _result(
+        client,
+        {
+            "type": WS_TYPE_SNAPSHOT_DIFF,
+            "from_snapshot_id": first["snapshot_id"],
+            "to_snapshot_id": second["snapshot_id"],
+        },
+    )
+    assert between["areas"] == diff["areas"]
+
+    listed = await _result(client, {"type": WS_TYPE_SNAPSHOT_LIST})
+    assert {meta["snapshot_id"] for meta in listed["snapshots"]} == {
+        first["snapshot_id"],
+        second["snapshot_id"],
+    }
+
+    await _result(
+        client, {"type": WS_TYPE_SNAPSHOT_DELETE, "snapshot_id": first["snapshot_id"]}
+    )
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_SNAPSHOT_DIFF, "from_snapshot_id": first["snapshot_id"]}
+    )
+    assert (await client.receive_json())["error"]["code"] == "not_found"
@@ -0,0 +1,77 @@
+"""Tests for the changeset store."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+from homeassistant.core import HomeAssistant
+
+from custom_components.nidia_magic_composer.changeset import compute_changeset_id
+from custom_components.nidia_magic_composer.const import MAX_CACHED_CHANGESETS
+from custom_components.nidia_magic_composer.store import ChangesetStore
+
+OPERATIONS = {"areas": [{"op": "create", "name": "Kitchen", "floor": None}]}
+
+
+def _changeset(
+    changeset_id: str, created_at: str = "2024-01-01T00:00:00+00:00"
+) -> dict[str, Any]:
+    """Return a minimal pending changeset."""
+    return {
+        "changeset_id": changeset_id,
+        "created_at": created_at,
+        "operations": OPERATIONS,
+        "summary": {},
+        "applied_at": None,
+        "rollback_id": None,
+    }
+
+
+async def test_pending_changeset_is_reused(hass: HomeAssistant) -> None:
+    """Test that adding the same operations twice returns the pending one."""
+    store = ChangesetStore(hass)
+    await store.async_load()
+    changeset_id = compute_changeset_id(OPERATIONS)
+
+    first = await store.async_add(_changeset(changeset_id))
+    assert await store.async_add(_changeset(changeset_id)) is first
+
+
+async def test_applied_changeset_keeps_its_id(hass: HomeAssistant) -> None:
+    """Test that replanning applied operations moves on to a successor id."""
+    store = ChangesetStore(hass)
+    await store.async_load()
+    changeset_id = compute_changeset_id(OPERATIONS)
+
+    applied = await store.async_add(_changeset(changeset_id))
+    applied["applied_at"] = "2024-01-01T00:01:00+00:00"
+    store.async_changed(applied)
+
+    replanned = await store.async_add(_changeset(changeset_id))
+    assert replanned["changeset_id"] != changeset_id
+    assert (await store.async_get(changeset_id))["applied_at"] is not None
+    assert [meta["changeset_id"] for meta in store.pending()] == [
+        replanned["changeset_id"]
+    ]
+
+
+async def test_changesets_survive_a_restart_outside_the_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test that changesets evicted from memory are loaded back from disk."""
+    store = ChangesetStore(hass)
+    await store.async_load()
+    for number in range(MAX_CACHED_CHANGESETS + 1):
+        await store.async_add(
+            _changeset(f"changeset_{number}", f"2024-01-01T00:00:{number:02d}+00:00")
+        )
+    # Delayed writes are flushed when Home Assistant shuts down
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+    await hass.async_block_till_done()
+    assert "nidia_magic_composer.changeset.changeset_0" in hass_storage
+
+    reloaded = ChangesetStore(hass)
+    await reloaded.async_load()
+    assert len(reloaded.pending()) == MAX_CACHED_CHANGESETS + 1
+    oldest = await reloaded.async_get("changeset_0")
+    assert oldest["operations"] == OPERATIONS
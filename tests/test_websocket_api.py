@@ -0,0 +1,236 @@
+"""Tests for the area and floor WebSocket API."""
+from __future__ import annotations
+
+from typing import Any
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import (
+    MockHAClientWebSocket,
+    WebSocketGenerator,
+)
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import area_registry as ar, floor_registry as fr
+
+from custom_components.nidia_magic_composer.const import (
+    WS_TYPE_AREAS_LIST,
+    WS_TYPE_AREAS_SUBSCRIBE,
+    WS_TYPE_CACHE_STATS,
+    WS_TYPE_FLOORS_LIST,
+    WS_TYPE_FLOORS_SUBSCRIBE,
+    WS_TYPE_TOPOLOGY_GET,
+)
+
+
+async def _result(client: MockHAClientWebSocket, msg: dict[str, Any]) -> Any:
+    """Send a command and return its successful result."""
+    await client.send_json_auto_id(msg)
+    response = await client.receive_json()
+    assert response["success"], response
+    return response["result"]
+
+
+async def test_areas_subscribe_streams_deltas(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test the snapshot, coalesced deltas and a resumed subscription."""
+    area_registry = ar.async_get(hass)
+    kitchen = area_registry.async_create("Kitchen")
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": WS_TYPE_AREAS_SUBSCRIBE})
+    assert (await client.receive_json())["success"]
+    snapshot = (await client.receive_json())["event"]
+    assert [area["name"] for area in snapshot["areas"]] == ["Kitchen"]
+
+    # Changes made in the same loop iteration arrive as one delta
+    office = area_registry.async_create("Office")
+    area_registry.async_update(kitchen.id, icon="mdi:stove")
+    await hass.async_block_till_done()
+    delta = (await client.receive_json())["event"]
+    assert [area["id"] for area in delta["added"]] == [office.id]
+    assert [area["icon"] for area in delta["updated"]] == ["mdi:stove"]
+    assert delta["removed"] == []
+    assert delta["revision"] > snapshot["revision"]
+
+    # An entry created and removed before the flush is never reported
+    area_registry.async_delete(office.id)
+    area_registry.async_delete(area_registry.async_create("Temp").id)
+    await hass.async_block_till_done()
+    delta = (await client.receive_json())["event"]
+    assert delta == {
+        "added": [],
+        "updated": [],
+        "removed": [office.id],
+        "revision": delta["revision"],
+    }
+
+    await client.send_json_auto_id(
+        {"type": WS_TYPE_AREAS_SUBSCRIBE, "known_revision": delta["revision"]}
+    )
+    assert (await client.receive_json())["success"]
+    assert (await client.receive_json())["event"] == {
+        "not_modified": True,
+        "revision": delta["revision"],
+    }
+
+
+async def test_floors_reorder_sends_a_new_snapshot(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that a reorder, which has no floor id, resends the floor list."""
+    floor_registry = fr.async_get(hass)
+    ground = floor_registry.async_create("Ground", level=0)
+    first = floor_registry.async_create("First", level=1)
+    client = await hass_ws_client(hass)
+
+    await client.send_json_auto_id({"type": WS_TYPE_FLOORS_SUBSCRIBE})
+    assert (await client.receive_json())["success"]
+    await client.receive_json()
+
+    hass.bus.async_fire(fr.EVENT_FLOOR_REGISTRY_UPDATED, {"action": "reorder"})
+    await hass.async_block_till_done()
+    snapshot = (await client.receive_json())["event"]
+    assert {floor["floor_id"] for floor in snapshot["floors"]} == {
+        ground.floor_id,
+        first.floor_id,
+    }
+
+
+async def test_lists_are_conditional_on_the_known_revision(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that an unchanged list is not resent."""
+    client = await hass_ws_client(hass)
+    areas = await _result(client, {"type": WS_TYPE_AREAS_LIST})
+    floors = await _result(client, {"type": WS_TYPE_FLOORS_LIST})
+
+    assert await _result(
+        client, {"type": WS_TYPE_AREAS_LIST, "known_revision": areas["revision"]}
+    ) == {"not_modified": True, "revision": areas["revision"]}
+    assert await _result(
+        client, {"type": WS_TYPE_FLOORS_LIST, "known_revision": floors["revision"]}
+    ) == {"not_modified": True, "revision": floors["revision"]}
+
+    ar.async_get(hass).async_create("Kitchen")
+    await hass.async_block_till_done()
+    changed = await _result(
+        client, {"type": WS_TYPE_AREAS_LIST, "known_revision": areas["revision"]}
+    )
+    assert changed["revision"] > areas["revision"]
+    assert [area["name"] for area in changed["areas"]] == ["Kitchen"]
+    assert await _result(
+        client, {"type": WS_TYPE_FLOORS_LIST, "known_revision": floors["revision"]}
+    ) == {"not_modified": True, "revision": floors["revision"]}
+
+
+async def test_list_payloads_are_encoded_once_per_revision(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test that the payload cache serves repeated lists until a change."""
+    ar.async_get(hass).async_create("Kitchen")
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    first = await _result(client, {"type": WS_TYPE_AREAS_LIST})
+    assert await _result(client, {"type": WS_TYPE_AREAS_LIST}) == first
+    stats = (await _result(client, {"type": WS_TYPE_CACHE_STATS}))["areas"]
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+    assert stats["revision"] == first["revision"]
+
+    ar.async_get(hass).async_create("Office")
+    await hass.async_block_till_done()
+    second = await _result(client, {"type": WS_TYPE_AREAS_LIST})
+    assert len(second["areas"]) == 2
+    stats = (await _result(client, {"type": WS_TYPE_CACHE_STATS}))["areas"]
+    assert (stats["hits"], stats["misses"]) == (1, 2)
+    assert stats["revision"] == second["revision"]
+
+
+async def test_areas_list_filters_pages_and_projects(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test floor and prefix filters, cursors and field projection."""
+    area_registry = ar.async_get(hass)
+    ground = fr.async_get(hass).async_create("Ground")
+    for name in ("Bedroom", "bathroom", "Attic", "Bar", "Cellar"):
+        area_registry.async_create(name)
+    hall = area_registry.async_create("Hall", floor_id=ground.floor_id)
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    page = await _result(
+        client,
+        {"type": WS_TYPE_AREAS_LIST, "name_prefix": "ba", "limit": 1, "fields": ["name"]},
+    )
+    assert page["areas"] == [{"id": "bar", "name": "Bar"}]
+    assert (page["total"], page["next_cursor"]) == (2, "1")
+    page = await _result(
+        client,
+        {
+            "type": WS_TYPE_AREAS_LIST,
+            "name_prefix": "ba",
+            "limit": 1,
+            "cursor": page["next_cursor"],
+            "fields": ["name"],
+        },
+    )
+    assert page["areas"] == [{"id": "bathroom", "name": "bathroom"}]
+    assert page["next_cursor"] is None
+
+    by_floor = await _result(
+        client, {"type": WS_TYPE_AREAS_LIST, "floor_id": ground.floor_id}
+    )
+    assert [area["id"] for area in by_floor["areas"]] == [hall.id]
+    unassigned = await _result(client, {"type": WS_TYPE_AREAS_LIST, "floor_id": None})
+    assert unassigned["total"] == 5
+
+    reverse = await _result(client, {"type": WS_TYPE_AREAS_LIST, "sort": "-name"})
+    assert [area["name"] for area in reverse["areas"]][:2] == ["Hall", "Cellar"]
+
+
+async def test_topology_groups_areas_under_floors(
+    hass: HomeAssistant,
+    init_integration: MockConfigEntry,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test floors sorted by level with their areas and counts."""
+    floor_registry = fr.async_get(hass)
+    first = floor_registry.async_create("First", level=1)
+    ground = floor_registry.async_create("Ground", level=0)
+    area_registry = ar.async_get(hass)
+    area_registry.async_create("Kitchen", floor_id=ground.floor_id)
+    area_registry.async_create("Bedroom", floor_id=first.floor_id)
+    area_registry.async_create("Attic", floor_id=first.floor_id)
+    area_registry.async_create("Garden")
+    await hass.async_block_till_done()
+    client = await hass_ws_client(hass)
+
+    topology = await _result(client, {"type": WS_TYPE_TOPOLOGY_GET})
+    assert [
+        (floor["name"], [area["name"] for area in floor["areas"]], floor["area_count"])
+        for floor in topology["floors"]
+    ] == [("Ground", ["Kitchen"], 1), ("First", ["Attic", "Bedroom"], 2)]
+    assert [area["name"] for area in topology["unassigned"]] == ["Garden"]
+    assert topology["counts"] == {"floors": 2, "areas": 4, "unassigned": 1}
+
+    assert await _result(
+        client, {"type": WS_TYPE_TOPOLOGY_GET, "known_revision": topology["revision"]}
+    ) == {"not_modified": True, "revision": topology["revision"]}
+
+    floor_registry.async_update(first.floor_id, name="Upstairs")
+    await hass.async_block_till_done()
+    updated = await _result(
+        client, {"type": WS_TYPE_TOPOLOGY_GET, "known_revision": topology["revision"]}
+    )
+    assert updated["floors"][1]["name"] == "Upstairs"